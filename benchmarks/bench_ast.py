@@ -0,0 +1,76 @@
+"""Mide los bytes por nodo del AST de objetos frente a FlatAST.
+
+Uso: python -m benchmarks.bench_ast [sentencias]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+
+from src.flat_ast import FlatAST
+from src.lexer import TokenStream
+from src.parser import IterativeParser
+from src.semantic import SemanticAnalyzer
+from .corpus import generate_program
+
+
+def count_nodes(ast):
+    """Cuenta los nodos de un AST de objetos."""
+    count = 0
+    stack = list(ast)
+    while stack:
+        node = stack.pop()
+        count += 1
+        for field in ('left', 'right', 'expr', 'var_node'):
+            child = getattr(node, field, None)
+            if child is not None:
+                stack.append(child)
+    return count
+
+
+def measure(label, parse, stream):
+    """Devuelve el resultado de `parse` y reporta la memoria que retiene."""
+    stream.pos = 0
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result, nodes = parse(stream)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{label:<16} {nodes:>9} nodos  {elapsed:7.3f} s  {size / 1e6:8.2f} MB  {size / nodes:6.1f} B/nodo')
+    return result
+
+
+def parse_objects(stream):
+    ast = IterativeParser(stream).program()
+    return ast, count_nodes(ast)
+
+
+def parse_flat(stream):
+    tree = FlatAST()
+    statements = IterativeParser(stream, tree).program()
+    # Sólo se conservan los índices de las sentencias, no las vistas
+    roots = [view.index for view in statements]
+    return (tree, roots), len(tree)
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    stream = TokenStream(generate_program(statements))
+    print(f'Programa de {statements} sentencias, {len(stream)} tokens')
+
+    ast = measure('AST de objetos', parse_objects, stream)
+    tree, roots = measure('FlatAST', parse_flat, stream)
+
+    start = time.perf_counter()
+    SemanticAnalyzer().analyze(ast)
+    print(f'Análisis semántico sobre objetos: {time.perf_counter() - start:.3f} s')
+    start = time.perf_counter()
+    SemanticAnalyzer().analyze([tree.node(index) for index in roots])
+    print(f'Análisis semántico sobre vistas:  {time.perf_counter() - start:.3f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Compara los tres motores de ejecución: Interpreter, VM de bytecode y código de Python.
+
+Para cada motor se mide la preparación (compilar a bytecode o a un objeto
+código; la segunda compilación con la misma clave sale de la caché) y la
+ejecución.
+
+Uso: python -m benchmarks.bench_backends [sentencias]
+"""
+import io
+import sys
+import time
+
+from src.lexer import TokenStream
+from src.parser import IterativeParser
+from src.semantic import SemanticAnalyzer
+from src.interpreter import Interpreter
+from src.bytecode import VM, compile_ast
+from src.pybackend import compile_program
+from .bench_interpreter import arithmetic_program
+
+
+def best_time(function, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    source = arithmetic_program(statements)
+    ast = IterativeParser(TokenStream(source)).program()
+    SemanticAnalyzer().analyze(ast)
+    print(f'Programa de {len(ast)} sentencias')
+
+    start = time.perf_counter()
+    program = compile_program(ast, key=source)
+    python_compile = time.perf_counter() - start
+    python_cached = best_time(lambda: compile_program(ast, key=source))
+    bytecode_compile = best_time(lambda: compile_ast(ast), repeat=1)
+    bytecode = compile_ast(ast)
+
+    results = [
+        ('ast', 0.0, best_time(lambda: Interpreter(io.StringIO()).run(ast))),
+        ('vm', bytecode_compile, best_time(lambda: VM(io.StringIO()).run(bytecode))),
+        ('python', python_compile, best_time(lambda: program.run(io.StringIO()))),
+    ]
+    print(f'{"motor":<8} {"preparación":>12} {"ejecución":>11} {"sentencias/s":>14}')
+    for name, prepare, run in results:
+        print(f'{name:<8} {prepare * 1e3:9.1f} ms {run * 1e3:8.1f} ms {len(ast) / run:14,.0f}')
+    print(f'Compilación a Python desde la caché: {python_cached * 1e6:.1f} µs')
+
+
+if __name__ == '__main__':
+    main()
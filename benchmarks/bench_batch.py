@@ -0,0 +1,70 @@
+"""Compara ejecutar una fórmula VLS una vez por fila con la ejecución por lotes de src/batch.py.
+
+Uso: python -m benchmarks.bench_batch [filas]
+"""
+import io
+import sys
+import time
+
+import numpy as np
+
+from src.lexer import TokenStream
+from src.parser import IterativeParser
+from src.semantic import SemanticAnalyzer
+from src.interpreter import Interpreter
+from src.batch import BatchEvaluator
+
+FORMULA = """
+var x;
+var y;
+var z;
+var r;
+r = x potencia 2 sumar y multiplicar 3 restar z dividir 7;
+print(r);
+print(r dividir (y sumar 1) restar x multiplicar z);
+print((x sumar y sumar z) potencia 3);
+"""
+
+
+class RowInterpreter(Interpreter):
+    """Interpreter cuyas variables declaradas empiezan con los valores de una fila."""
+
+    def __init__(self, row, output):
+        super().__init__(output)
+        self.row = row
+
+    def visit_VarDecl(self, node):
+        super().visit_VarDecl(node)
+        self.values[node.var_node.slot] = self.row.get(node.var_node.value)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    ast = IterativeParser(TokenStream(FORMULA)).program()
+    SemanticAnalyzer().analyze(ast)
+    rng = np.random.default_rng(0)
+    inputs = {name: rng.integers(0, 1000, rows) for name in ('x', 'y', 'z')}
+
+    sample = min(rows, 20_000)
+    start = time.perf_counter()
+    output = io.StringIO()
+    columns = {name: values[:sample].tolist() for name, values in inputs.items()}
+    for index in range(sample):
+        RowInterpreter({name: values[index] for name, values in columns.items()}, output).run(ast)
+    per_row = (time.perf_counter() - start) / sample
+
+    start = time.perf_counter()
+    outputs = BatchEvaluator(inputs, rows).run(ast)
+    batch = time.perf_counter() - start
+
+    expected = output.getvalue().split()
+    got = [str(values[index]) for index in range(sample) for values in outputs]
+    assert got == expected, 'la ejecución por lotes no coincide con Interpreter'
+
+    print(f'{rows:,} filas')
+    print(f'Interpreter por fila   {per_row * rows:8.2f} s  (estimado con {sample:,} filas)')
+    print(f'Por lotes (NumPy)      {batch:8.2f} s  ({per_row * rows / batch:.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Compara la ejecución con Interpreter (recorriendo el AST) y con la VM de bytecode.
+
+La compilación a bytecode se mide aparte: se paga una vez y el bytecode
+puede ejecutarse (o guardarse y cargarse) muchas veces.
+
+Uso: python -m benchmarks.bench_bytecode [sentencias]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+
+from src.lexer import TokenStream
+from src.parser import IterativeParser
+from src.semantic import SemanticAnalyzer
+from src.interpreter import Interpreter
+from src.bytecode import VM, compile_ast, save, load
+from .bench_interpreter import arithmetic_program
+
+
+def best_time(function, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    ast = IterativeParser(TokenStream(arithmetic_program(statements))).program()
+    SemanticAnalyzer().analyze(ast)
+    bytecode = compile_ast(ast)
+    print(f'Programa de {len(ast)} sentencias, {len(bytecode)} instrucciones')
+
+    interpreter = best_time(lambda: Interpreter(io.StringIO()).run(ast))
+    vm = best_time(lambda: VM(io.StringIO()).run(bytecode))
+    compile_time = best_time(lambda: compile_ast(ast))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'programa.vlsb')
+        save_time = best_time(lambda: save(bytecode, path))
+        load_time = best_time(lambda: load(path))
+        size = os.path.getsize(path)
+
+    print(f'Interpreter (AST)       {interpreter * 1e3:8.1f} ms  {len(ast) / interpreter:12,.0f} sentencias/s')
+    print(f'VM (bytecode)           {vm * 1e3:8.1f} ms  {len(ast) / vm:12,.0f} sentencias/s  '
+          f'({interpreter / vm:.1f}x)')
+    print(f'Compilación a bytecode  {compile_time * 1e3:8.1f} ms')
+    print(f'Guardar / cargar        {save_time * 1e3:8.1f} ms / {load_time * 1e3:.1f} ms  ({size / 1024:.0f} KiB)')
+
+
+if __name__ == '__main__':
+    main()
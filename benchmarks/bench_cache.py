@@ -0,0 +1,52 @@
+"""Mide la caché de compilación en disco sobre un corpus de archivos .vls.
+
+Compila el corpus tres veces con compile_file: sin caché, con la caché
+vacía (analiza y guarda) y con la caché llena (no analiza nada).
+
+Uso: python -m benchmarks.bench_cache [archivos] [sentencias por archivo]
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from src.main import compile_file
+from src.cache import CompilationCache
+from .bench_interpreter import arithmetic_program
+
+
+def compile_corpus(paths, cache):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for path in paths:
+            compile_file(path, cache=cache)
+    return time.perf_counter() - start
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    statements = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for index in range(files):
+            path = os.path.join(directory, f'programa{index}.vls')
+            with open(path, 'w') as file:
+                file.write(arithmetic_program(statements, seed=index))
+            paths.append(path)
+        cache = CompilationCache(os.path.join(directory, 'cache'))
+
+        uncached = compile_corpus(paths, None)
+        cold = compile_corpus(paths, cache)
+        warm = compile_corpus(paths, cache)
+        size = sum(size for _, size, _ in cache.entries())
+
+    print(f'{files} archivos de {statements:,} sentencias')
+    print(f'Sin caché         {uncached:8.2f} s')
+    print(f'Caché vacía       {cold:8.2f} s')
+    print(f'Caché llena       {warm:8.2f} s  ({uncached / warm:.0f}x, {cache.hits} aciertos, {size / 2**20:.1f} MiB)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Latencia (p50/p99) del demonio de compilación frente a llamadas en frío a la línea de comandos.
+
+Compara, para un programa chico:
+- python -m src.main archivo.vls --run (arranca Python y carga todo el compilador)
+- python -m src.client archivo.vls --run (arranca Python, el compilador ya está cargado)
+- una solicitud por una conexión abierta (sólo el demonio)
+
+Uso: python -m benchmarks.bench_daemon [solicitudes]
+"""
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.client import Client
+
+SNIPPET = """var x;
+var y;
+x = 5;
+y = x potencia 2 sumar 3;
+{ var x; x = y dividir 4; print(x); }
+print(x multiplicar y);
+"""
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda fraction: samples[min(len(samples) - 1, int(fraction * len(samples)))]
+    return pick(0.50) * 1e3, pick(0.99) * 1e3
+
+
+def measure(function, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'snippet.vls')
+        with open(path, 'w') as file:
+            file.write(SNIPPET)
+        socket_path = os.path.join(directory, 'vls.sock')
+        daemon = subprocess.Popen([sys.executable, '-m', 'src.main', '--daemon', f'--socket={socket_path}'],
+                                  stdout=subprocess.PIPE, text=True)
+        try:
+            daemon.stdout.readline()    # "Demonio escuchando en ..."
+            command = lambda *args: subprocess.run([sys.executable, '-m', *args], check=True,
+                                                   stdout=subprocess.DEVNULL)
+            cold = measure(lambda: command('src.main', path, '--run', '--no-cache'), max(requests // 20, 10))
+            thin = measure(lambda: command('src.client', path, '--run', f'--socket={socket_path}'),
+                           max(requests // 10, 10))
+            client = Client(socket_path)
+            warm = measure(lambda: client.request('run', SNIPPET), requests)
+            client.close()
+        finally:
+            daemon.send_signal(signal.SIGTERM)
+            daemon.wait()
+
+    print(f'{"":<34} {"p50":>9} {"p99":>9}')
+    for label, (p50, p99) in (('CLI en frío (src.main --run)', cold),
+                              ('Cliente liviano (src.client)', thin),
+                              ('Solicitud al demonio', warm)):
+        print(f'{label:<34} {p50:6.2f} ms {p99:6.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
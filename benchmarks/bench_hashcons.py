@@ -0,0 +1,65 @@
+"""Compara NodeFactory con HashConsingFactory en un corpus repetitivo.
+
+Uso: python -m benchmarks.bench_hashcons [sentencias]
+"""
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+from src.lexer import TokenStream
+from src.parser import IterativeParser, NodeFactory, HashConsingFactory
+from src.semantic import SemanticAnalyzer
+
+
+def repetitive_program(statements, seed=0):
+    """Programa que repite pocas subexpresiones en muchas sentencias."""
+    rng = random.Random(seed)
+    names = ['x', 'y', 'z', 'w']
+    subexpressions = ['(x sumar y)', '(z multiplicar w)', '(x potencia 2)', '(y restar 1)']
+    lines = [f'var {name};' for name in names] + [f'{name} = {i + 1};' for i, name in enumerate(names)]
+    for _ in range(statements):
+        a, b = rng.choice(subexpressions), rng.choice(subexpressions)
+        if rng.random() < 0.5:
+            lines.append(f'print({a} multiplicar {b} sumar {rng.choice(subexpressions)});')
+        else:
+            lines.append(f'{rng.choice(names)} = {a} sumar {b};')
+    return '\n'.join(lines) + '\n'
+
+
+def measure(label, factory_class, stream):
+    """Mide el tiempo de parseo y, en una segunda pasada, la memoria retenida."""
+    stream.pos = 0
+    start = time.perf_counter()
+    IterativeParser(stream, factory_class()).program()
+    elapsed = time.perf_counter() - start
+
+    stream.pos = 0
+    gc.collect()
+    tracemalloc.start()
+    factory = factory_class()
+    ast = IterativeParser(stream, factory).program()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{label:<20} parseo {elapsed:7.3f} s  {size / 1e6:8.2f} MB')
+    return ast, factory
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    stream = TokenStream(repetitive_program(statements))
+    print(f'Programa repetitivo de {statements} sentencias, {len(stream)} tokens')
+
+    measure('NodeFactory', NodeFactory, stream)
+    ast, factory = measure('HashConsingFactory', HashConsingFactory, stream)
+    print(f'Nodos compartidos: {factory.shared}, nodos únicos: {len(factory.table)}')
+
+    start = time.perf_counter()
+    SemanticAnalyzer().analyze(ast)
+    print(f'Análisis semántico del AST compartido: {time.perf_counter() - start:.3f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Mide IncrementalParser al editar una sentencia de un programa grande.
+
+Compara un análisis completo con IterativeParser contra re-analizar tras
+editar un carácter: el TokenStream se conserva entre llamadas, sólo se
+re-analiza léxicamente el tramo editado y las sentencias de antes y de
+después de la edición se conservan sin recorrerlas. Antes de medir
+verifica que el resultado coincida con el del análisis completo.
+
+Uso: python -m benchmarks.bench_incremental [sentencias]
+"""
+import sys
+import time
+
+from src.lexer import Lexer
+from src.parser import IncrementalParser, IterativeParser
+from src.walker import walk
+from .corpus import generate_program
+
+
+def dump(statements):
+    return [(type(node).__name__, getattr(node, 'value', None)) for _, node, _, _ in walk(statements)]
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    source = generate_program(statements)
+
+    start = time.perf_counter()
+    IterativeParser(Lexer(source)).program()
+    full = time.perf_counter() - start
+    print(f'Análisis completo:               {full * 1e3:9.3f} ms')
+
+    parser = IncrementalParser()
+    start = time.perf_counter()
+    parser.parse(source)
+    print(f'Primer análisis incremental:     {(time.perf_counter() - start) * 1e3:9.3f} ms')
+
+    # Se cambia la constante de una asignación del medio, y se vuelve atrás
+    offset = source.index(';', source.index(' = ', len(source) // 2)) - 1
+    edited = source[:offset] + '7' + source[offset + 1:]
+    if dump(parser.parse(edited)) != dump(IterativeParser(Lexer(edited)).program()):
+        raise AssertionError('IncrementalParser difiere del análisis completo')
+
+    edits = 20
+    start = time.perf_counter()
+    for index in range(edits):
+        parser.parse(source if index % 2 else edited)
+    edit = (time.perf_counter() - start) / edits
+    print(f'Re-análisis tras una edición:    {edit * 1e3:9.3f} ms  ({full / edit:.1f}x), '
+          f'{parser.parsed} sentencia(s) analizada(s), {parser.reused} reutilizadas')
+
+
+if __name__ == '__main__':
+    main()
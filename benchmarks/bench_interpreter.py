@@ -0,0 +1,57 @@
+"""Mide cuántas sentencias por segundo ejecuta Interpreter.
+
+El programa se analiza sin optimizar (el optimizador plegaría todo a
+constantes). Se compara la salida acumulada por bloques con una escritura
+por cada print.
+
+Uso: python -m benchmarks.bench_interpreter [sentencias]
+"""
+import io
+import random
+import sys
+import time
+
+from src.lexer import TokenStream
+from src.parser import IterativeParser
+from src.semantic import SemanticAnalyzer
+from src.interpreter import Interpreter, BUFFER_LINES
+
+
+def arithmetic_program(statements, variables=20, seed=0):
+    """Programa válido cuyos valores no crecen sin límite y que sólo divide por constantes."""
+    rng = random.Random(seed)
+    names = [f'v{i}' for i in range(variables)]
+    lines = [f'var {name};' for name in names]
+    lines.extend(f'{name} = {rng.randint(1, 9)};' for name in names)
+    for _ in range(max(statements - len(lines), 0)):
+        left, right = rng.choice(names), rng.choice(names)
+        if rng.random() < 0.5:
+            op = rng.choice(('sumar', 'restar', 'multiplicar'))
+            lines.append(f'print(({left} {op} {right}) dividir {rng.randint(1, 9)} sumar {rng.randint(1, 99)});')
+        else:
+            op = rng.choice(('sumar', 'restar'))
+            lines.append(f'{rng.choice(names)} = ({left} {op} {right}) dividir {rng.randint(2, 9)};')
+    return '\n'.join(lines) + '\n'
+
+
+def measure(label, ast, statements, buffer_lines, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        output = io.StringIO()
+        start = time.perf_counter()
+        Interpreter(output, buffer_lines).run(ast)
+        best = min(best, time.perf_counter() - start)
+    print(f'{label:<28} {best * 1e3:8.1f} ms  {statements / best:12,.0f} sentencias/s')
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    ast = IterativeParser(TokenStream(arithmetic_program(statements))).program()
+    SemanticAnalyzer().analyze(ast)
+    print(f'Programa de {len(ast)} sentencias')
+    measure(f'Salida por bloques ({BUFFER_LINES})', ast, len(ast), BUFFER_LINES)
+    measure('Salida línea por línea', ast, len(ast), 1)
+
+
+if __name__ == '__main__':
+    main()
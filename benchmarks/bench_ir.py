@@ -0,0 +1,86 @@
+"""Mide lo que ahorran las pasadas de la representación intermedia (src/ir.py).
+
+Se usan dos programas sin optimizar: el de bench_interpreter y uno con
+asignaciones que nunca se imprimen, `potencia 2` y multiplicaciones por 2,
+como los que producen los generadores de código. Para cada motor se
+compara la ejecución del AST original con la del programa optimizado.
+
+Uso: python -m benchmarks.bench_ir [sentencias]
+"""
+import io
+import random
+import sys
+import time
+
+from src.lexer import TokenStream
+from src.parser import IterativeParser
+from src.semantic import SemanticAnalyzer
+from src.interpreter import Interpreter
+from src.bytecode import VM, compile_ast
+from src.pybackend import compile_program
+from src import ir
+from .bench_interpreter import arithmetic_program
+
+
+def generated_program(statements, variables=20, seed=0):
+    """Programa con asignaciones muertas y operaciones que admiten reducción de fuerza."""
+    rng = random.Random(seed)
+    names = [f'v{i}' for i in range(variables)]
+    lines = [f'var {name};' for name in names]
+    lines.extend(f'{name} = {rng.randint(1, 9)};' for name in names)
+    for _ in range(max(statements - len(lines), 0)):
+        left, right = rng.choice(names), rng.choice(names)
+        choice = rng.random()
+        if choice < 0.2:
+            lines.append(f'print({left} restar {right});')
+        elif choice < 0.5:
+            # Se sobrescribe antes de leerse casi siempre
+            lines.append(f'{rng.choice(names)} = {left} potencia 2 dividir {rng.randint(2, 9)};')
+        elif choice < 0.8:
+            lines.append(f'{rng.choice(names)} = ({left} sumar {right}) multiplicar 2 dividir {rng.randint(3, 9)};')
+        else:
+            lines.append(f'{rng.choice(names)} = {left} multiplicar 1 sumar 0 restar {right} dividir 1;')
+    return '\n'.join(lines) + '\n'
+
+
+def best_time(function, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compare(label, source):
+    ast = IterativeParser(TokenStream(source)).program()
+    SemanticAnalyzer().analyze(ast)
+    start = time.perf_counter()
+    program = ir.build_ir(ast)
+    build = time.perf_counter() - start
+    print(f'{label}: {len(ast)} sentencias, {len(program)} instrucciones de IR ({build * 1e3:.1f} ms)')
+    for stats in ir.optimize(program):
+        print(f'  {stats}')
+    lowered = ir.lower(program)
+
+    # La preparación (compilar a bytecode o a Python) se hace antes de medir
+    engines = [
+        ('ast', lambda tree: tree, lambda tree: Interpreter(io.StringIO()).run(tree)),
+        ('vm', compile_ast, lambda bytecode: VM(io.StringIO()).run(bytecode)),
+        ('python', compile_program, lambda code: code.run(io.StringIO())),
+    ]
+    print(f'  {"motor":<8} {"original":>11} {"con IR":>11} {"ahorro":>8}')
+    for name, prepare, run in engines:
+        original, optimized = prepare(ast), prepare(lowered)
+        before = best_time(lambda: run(original))
+        after = best_time(lambda: run(optimized))
+        print(f'  {name:<8} {before * 1e3:8.1f} ms {after * 1e3:8.1f} ms {1 - after / before:8.0%}')
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    compare('Programa aritmético', arithmetic_program(statements))
+    compare('Programa generado', generated_program(statements))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Compara el rendimiento (MB/s) del lexer basado en expresiones regulares con el original.
+
+Uso: python -m benchmarks.bench_lexer [sentencias]
+"""
+import sys
+import time
+
+from src.lexer import Lexer, TokenStream, TokenType
+from .corpus import generate_program
+from .legacy_lexer import LegacyLexer
+
+
+def drain(lexer):
+    """Consume todos los tokens usando get_next_token()."""
+    count = 0
+    while lexer.get_next_token().type != TokenType.EOF:
+        count += 1
+    return count
+
+
+def measure(label, func, source, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = func(source)
+        best = min(best, time.perf_counter() - start)
+    megabytes = len(source.encode('utf-8')) / 1e6
+    print(f'{label:<28} {count:>9} tokens  {best:8.3f} s  {megabytes / best:8.2f} MB/s')
+    return best
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    source = generate_program(statements)
+    print(f'Programa de {statements} sentencias ({len(source) / 1e6:.2f} MB)')
+
+    legacy = measure('Lexer original', lambda s: drain(LegacyLexer(s)), source)
+    measure('Lexer.get_next_token()', lambda s: drain(Lexer(s)), source)
+    fast = measure('Lexer.tokenize()', lambda s: len(Lexer(s).tokenize()) - 1, source)
+    measure('TokenStream', lambda s: len(TokenStream(s)) - 1, source)
+    print(f'Aceleración de tokenize(): {legacy / fast:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
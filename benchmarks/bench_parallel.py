@@ -0,0 +1,44 @@
+"""Mide cómo escala la compilación en paralelo (src/parallel.py) con la cantidad de procesos.
+
+Compila sin caché un corpus generado de archivos chicos con 1, 2, 4, ...
+procesos, hasta los núcleos disponibles.
+
+Uso: python -m benchmarks.bench_parallel [archivos] [sentencias por archivo]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from src.parallel import available_cores, compile_many
+from .bench_interpreter import arithmetic_program
+
+
+def main():
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    statements = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    cores = available_cores()
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for index in range(files):
+            path = os.path.join(directory, f'programa{index:05d}.vls')
+            with open(path, 'w') as file:
+                file.write(arithmetic_program(statements, seed=index))
+            paths.append(path)
+
+        print(f'{files:,} archivos de {statements} sentencias, {cores} núcleos disponibles')
+        jobs, base = 1, None
+        while True:
+            start = time.perf_counter()
+            results = compile_many(paths, jobs, use_cache=False)
+            seconds = time.perf_counter() - start
+            assert [result['file'] for result in results] == paths
+            base = base or seconds
+            print(f'{jobs:3d} procesos  {seconds:7.2f} s  {files / seconds:9,.0f} archivos/s  ({base / seconds:.1f}x)')
+            if jobs >= cores:
+                break
+            jobs = min(jobs * 2, cores)
+
+
+if __name__ == '__main__':
+    main()
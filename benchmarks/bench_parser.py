@@ -0,0 +1,44 @@
+"""Compara el parser recursivo con IterativeParser.
+
+Uso: python -m benchmarks.bench_parser [sentencias]
+"""
+import sys
+import time
+
+from src.lexer import TokenStream
+from src.parser import Parser, IterativeParser
+from .corpus import generate_program
+
+
+def measure(label, parser_class, source, repeat=3):
+    stream = TokenStream(source)
+    best = float('inf')
+    for _ in range(repeat):
+        stream.pos = 0
+        start = time.perf_counter()
+        try:
+            parser_class(stream).program()
+        except RecursionError:
+            print(f'{label:<36} RecursionError')
+            return None
+        best = min(best, time.perf_counter() - start)
+    print(f'{label:<36} {best * 1e3:10.1f} ms')
+    return best
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    cases = {
+        f'Programa de {statements} sentencias': generate_program(statements),
+        'Cadena de 100k operandos': 'var x; print(x' + ' sumar x' * 100_000 + ');',
+        'Anidamiento de 200 paréntesis': 'var x; print(' + '(' * 200 + 'x' + ')' * 200 + ');',
+        'Anidamiento de 100k paréntesis': 'var x; print(' + '(' * 100_000 + 'x' + ')' * 100_000 + ');',
+    }
+    for name, source in cases.items():
+        print(name)
+        measure('  Parser (recursivo)', Parser, source)
+        measure('  IterativeParser', IterativeParser, source)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Compara el re-análisis incremental (TokenStream.edit) con un análisis completo.
+
+Antes de medir verifica que edit() dé los mismos tokens que analizar el
+texto de nuevo, con ediciones al azar que incluyen comentarios.
+
+Uso: python -m benchmarks.bench_relex [lineas]
+"""
+import random
+import sys
+import time
+
+from src.lexer import TokenStream
+from .corpus import generate_program
+
+# Fragmentos que insertan las ediciones al azar de check_consistency
+FRAGMENTS = ('x', '9', ' ', '\n', ';', '#', '# hola ', 'var y; ', 'sumar', '(')
+
+
+def tokens(stream):
+    return [(token.type, token.value, token.line, token.column) for token in stream]
+
+
+def check_consistency(edits=3000, seed=0):
+    """Compara edit() con un análisis completo tras cada edición al azar (también dentro de comentarios)."""
+    rng = random.Random(seed)
+    text = '# comentario\nvar x; # fin de línea\nx = 1 sumar 2;\n{ var y; # bloque\n  print(x); }\n'
+    stream = TokenStream(text)
+    for _ in range(edits):
+        offset = rng.randrange(len(stream.text) + 1)
+        deleted = rng.randrange(min(3, len(stream.text) - offset) + 1)
+        inserted = rng.choice(FRAGMENTS)
+        stream.edit(offset, deleted, inserted)
+        if tokens(stream) != tokens(TokenStream(stream.text)):
+            raise AssertionError(f'edit({offset}, {deleted}, {inserted!r}) difiere del análisis completo')
+        if len(stream.text) > 400:
+            stream = TokenStream(text)
+
+
+def main():
+    check_consistency()
+    print('edit() coincide con el análisis completo en 3000 ediciones al azar')
+
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    source = generate_program(lines)
+    stream = TokenStream(source)
+    print(f'Buffer de {lines} líneas, {len(stream)} tokens')
+
+    start = time.perf_counter()
+    TokenStream(source)
+    full = time.perf_counter() - start
+    print(f'Análisis completo:            {full * 1e3:9.3f} ms')
+
+    # Ediciones de un carácter escribiendo en una misma zona del buffer
+    rng = random.Random(0)
+    offset = stream.start(len(stream) // 2)
+    edits = 1000
+    start = time.perf_counter()
+    for _ in range(edits):
+        stream.edit(offset, 0, rng.choice('xyz'))
+        offset += 1
+    local = (time.perf_counter() - start) / edits
+    print(f'Edición local (promedio):     {local * 1e3:9.3f} ms  ({full / local:.0f}x)')
+
+    # Ediciones dispersas: el desplazamiento diferido se mueve entre zonas
+    edits = 50
+    start = time.perf_counter()
+    for _ in range(edits):
+        index = rng.randrange(len(stream) - 1)
+        stream.edit(stream.start(index), 0, ' ')
+    scattered = (time.perf_counter() - start) / edits
+    print(f'Edición dispersa (promedio):  {scattered * 1e3:9.3f} ms  ({full / scattered:.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
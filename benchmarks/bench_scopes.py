@@ -0,0 +1,95 @@
+"""Mide la búsqueda de símbolos con muchos ámbitos anidados y nombres ocultos.
+
+Compara SymbolTable (pila de declaraciones por nombre) con una tabla que
+guarda un diccionario por ámbito y recorre la cadena de ámbitos al buscar.
+
+Uso: python -m benchmarks.bench_scopes [profundidad máxima]
+"""
+import sys
+import time
+
+from src.lexer import TokenStream
+from src.parser import IterativeParser
+from src.semantic import Symbol, SymbolTable, SemanticAnalyzer
+
+SHADOWED = 10       # Nombres redeclarados en cada ámbito
+LOOKUPS = 20_000    # Búsquedas medidas en el ámbito más interno
+
+
+class ChainSymbolTable:
+    """Tabla con un diccionario por ámbito: buscar recorre la cadena desde el más interno."""
+
+    def __init__(self):
+        self.scopes = [{}]
+
+    def enter_scope(self):
+        self.scopes.append({})
+
+    def exit_scope(self):
+        self.scopes.pop()
+
+    def define(self, symbol):
+        self.scopes[-1][symbol.name] = symbol
+
+    def lookup(self, name):
+        for scope in reversed(self.scopes):
+            symbol = scope.get(name)
+            if symbol is not None:
+                return symbol
+        return None
+
+
+def fill(table, depth):
+    """Declara `outer` en el ámbito global y SHADOWED nombres en cada uno de `depth` ámbitos."""
+    table.define(Symbol('outer', int))
+    for level in range(depth + 1):
+        if level:
+            table.enter_scope()
+        for i in range(SHADOWED):
+            table.define(Symbol(f'g{i}', int))
+    return table
+
+
+def lookup_time(table, name):
+    """Tiempo por búsqueda de `name` en ns."""
+    lookup = table.lookup
+    start = time.perf_counter()
+    for _ in range(LOOKUPS):
+        lookup(name)
+    return (time.perf_counter() - start) / LOOKUPS * 1e9
+
+
+def nested_program(depth):
+    """Programa con `depth` bloques anidados; el más interno usa una variable global."""
+    lines = [f'var g{i};' for i in range(SHADOWED)] + ['var outer;']
+    declarations = ' '.join(f'var g{i};' for i in range(SHADOWED))
+    lines += ['{ ' + declarations] * depth
+    lines += ['outer = outer sumar g0;'] * 1000
+    lines.append('}' * depth)
+    return '\n'.join(lines) + '\n'
+
+
+def analyze_time(depth):
+    """Tiempo de análisis semántico del programa anidado, en ms."""
+    ast = IterativeParser(TokenStream(nested_program(depth))).program()
+    analyzer = SemanticAnalyzer()
+    start = time.perf_counter()
+    analyzer.analyze(ast)
+    return (time.perf_counter() - start) * 1e3
+
+
+def main():
+    max_depth = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    depths = [depth for depth in (1, 10, 100, 1000, 5000, 20000) if depth <= max_depth]
+    print(f'{SHADOWED} nombres ocultos por ámbito, {LOOKUPS} búsquedas en el ámbito más interno')
+    print(f'{"profundidad":>11}  {"pila (outer)":>13}  {"cadena (outer)":>15}  {"pila (g0)":>10}  {"análisis":>10}')
+    for depth in depths:
+        stack_outer = lookup_time(fill(SymbolTable(), depth), 'outer')
+        chain_outer = lookup_time(fill(ChainSymbolTable(), depth), 'outer')
+        stack_inner = lookup_time(fill(SymbolTable(), depth), 'g0')
+        print(f'{depth:>11}  {stack_outer:>10.1f} ns  {chain_outer:>12.1f} ns  '
+              f'{stack_inner:>7.1f} ns  {analyze_time(depth):>7.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
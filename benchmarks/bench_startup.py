@@ -0,0 +1,85 @@
+"""Tiempo de arranque de la línea de comandos, con un presupuesto.
+
+Mide con python -X importtime lo que tarda en importarse src.main (mediana
+de varias corridas) y el tiempo total de `python -m src.main archivo.vls`
+sobre un archivo chico. Falla (código de salida 1) si la importación
+supera el presupuesto o si una compilación simple carga alguno de los
+módulos pesados que sólo deben cargarse con su opción (--visualize,
+--debug, --inputs, --ir, --run, la GUI).
+
+Uso: python -m benchmarks.bench_startup [presupuesto en ms] [corridas]
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Presupuesto de la importación de src.main (el intérprete de Python no se cuenta)
+IMPORT_BUDGET_MS = 60
+
+# Módulos que una compilación simple no debe importar
+HEAVY_MODULES = ('graphviz', 'numpy', 'tkinter', 'src.tools', 'src.gui', 'src.batch', 'src.ir',
+                 'src.interpreter', 'src.bytecode', 'src.pybackend')
+
+SNIPPET = """var x;
+x = 5 sumar 3;
+print(x);
+"""
+
+
+def import_times(arguments):
+    """Tiempo acumulado (µs) de cada módulo importado al ejecutar `python -X importtime arguments`."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', *arguments],
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r'import time:\s+\d+ \|\s+(\d+) \| ( *)(\S+)', line)
+        if match:
+            times[match.group(3)] = int(match.group(1))
+    return times
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else IMPORT_BUDGET_MS
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    samples = [import_times(['-c', 'import src.main'])['src.main'] / 1e3 for _ in range(runs)]
+    import_ms = statistics.median(samples)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'snippet.vls')
+        with open(path, 'w') as file:
+            file.write(SNIPPET)
+        command = [sys.executable, '-m', 'src.main', path, '--no-cache']
+        loaded = import_times(command[1:])
+        wall = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+            wall.append(time.perf_counter() - start)
+        baseline = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-c', 'pass'], check=True)
+            baseline.append(time.perf_counter() - start)
+
+    print(f"Importar src.main:            {import_ms:7.2f} ms (mediana, presupuesto {budget:g} ms)")
+    print(f"python -m src.main archivo:   {statistics.median(wall) * 1e3:7.2f} ms")
+    print(f"python -c pass (referencia):  {statistics.median(baseline) * 1e3:7.2f} ms")
+
+    failures = []
+    if import_ms > budget:
+        failures.append(f"la importación de src.main ({import_ms:.2f} ms) supera el presupuesto de {budget:g} ms")
+    for name in HEAVY_MODULES:
+        if name in loaded:
+            failures.append(f"una compilación simple importa {name} ({loaded[name] / 1e3:.2f} ms)")
+    for failure in failures:
+        print(f"Error: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Comprueba que la compilación con --stream usa memoria acotada.
+
+Genera un archivo VLS grande, lo compila en modo streaming bajo
+tracemalloc y termina con código 1 si el pico supera el límite.
+También compila una variante con un error en la primera línea y
+reporta cuánto tarda en aparecer el primer diagnóstico.
+
+Uso: python -m benchmarks.bench_stream [megabytes] [limite_mb]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from src.main import compile_stream
+from .corpus import generate_program
+
+
+def write_corpus(path, megabytes, prefix=''):
+    """Escribe un programa válido de aproximadamente `megabytes` MB precedido por `prefix`."""
+    block = generate_program(20_000)
+    declarations = ''.join(line + '\n' for line in block.splitlines() if line.startswith('var '))
+    body = ''.join(line + '\n' for line in block.splitlines() if not line.startswith('var '))
+    with open(path, 'w') as file:
+        file.write(prefix)
+        file.write(declarations)
+        written = len(declarations)
+        while written < megabytes * 1e6:
+            file.write(body)
+            written += len(body)
+    return written
+
+
+def main():
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    limit = float(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    fd, path = tempfile.mkstemp(suffix='.vls')
+    os.close(fd)
+    try:
+        size = write_corpus(path, megabytes)
+        tracemalloc.start()
+        start = time.perf_counter()
+        with open(path, 'r') as file:
+            errors = compile_stream(file)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        os.remove(path)
+
+    fd, path = tempfile.mkstemp(suffix='.vls')
+    os.close(fd)
+    try:
+        write_corpus(path, megabytes, prefix='print(indefinida);\n')
+        first_error = []
+        start = time.perf_counter()
+        with open(path, 'r') as file:
+            compile_stream(file, on_error=lambda error: first_error.append(time.perf_counter() - start))
+        total = time.perf_counter() - start
+    finally:
+        os.remove(path)
+    print(f'Primer diagnóstico a los {first_error[0] * 1e3:.1f} ms (compilación completa: {total:.2f} s)')
+
+    if errors:
+        print(f'ERROR: el programa generado tiene {len(errors)} errores')
+        sys.exit(1)
+    print(f'Archivo de {size / 1e6:.1f} MB compilado en {elapsed:.2f} s, pico de memoria {peak / 1e6:.2f} MB')
+    if peak > limit * 1e6:
+        print(f'ERROR: el pico supera el límite de {limit} MB')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
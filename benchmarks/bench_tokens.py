@@ -0,0 +1,34 @@
+"""Mide la memoria por token de una lista de Token frente a un TokenStream.
+
+Uso: python -m benchmarks.bench_tokens [sentencias]
+"""
+import sys
+import time
+import tracemalloc
+
+from src.lexer import Lexer, TokenStream
+from .corpus import generate_program
+
+
+def measure(label, build, source):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build(source)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = len(result)
+    print(f'{label:<20} {count:>9} tokens  {elapsed:7.3f} s  {size / 1e6:8.2f} MB  {size / count:6.1f} B/token')
+    return result
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 120_000
+    source = generate_program(statements)
+    print(f'Programa de {statements} sentencias ({len(source) / 1e6:.2f} MB)')
+    measure('Lexer.tokenize()', lambda s: Lexer(s).tokenize(), source)
+    measure('TokenStream', TokenStream, source)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Mide el costo de despacho por nodo del NodeVisitor frente al SemanticAnalyzer original.
+
+Uso: python -m benchmarks.bench_walker [sentencias]
+"""
+import sys
+import time
+
+from src.lexer import TokenStream
+from src.parser import IterativeParser
+from src.semantic import SemanticAnalyzer
+from src.walker import walk
+from .corpus import generate_program
+from .legacy_semantic import LegacySemanticAnalyzer
+
+
+def measure(label, analyzer_class, ast, nodes, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        analyzer_class().analyze(ast)
+        best = min(best, time.perf_counter() - start)
+    print(f'{label:<36} {best * 1e3:8.1f} ms  {best / nodes * 1e9:7.1f} ns/nodo')
+
+
+def main():
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    ast = IterativeParser(TokenStream(generate_program(statements))).program()
+    nodes = sum(1 for _ in walk(ast))
+    print(f'Programa de {statements} sentencias, {nodes} nodos')
+    measure('SemanticAnalyzer original', LegacySemanticAnalyzer, ast, nodes)
+    measure('SemanticAnalyzer (NodeVisitor)', SemanticAnalyzer, ast, nodes)
+
+    depth = 100_000
+    deep = IterativeParser(TokenStream('var x; print(x' + ' sumar x' * depth + ');')).program()
+    for label, analyzer_class in (('original', LegacySemanticAnalyzer), ('NodeVisitor', SemanticAnalyzer)):
+        try:
+            analyzer_class().analyze(deep)
+            print(f'Árbol de profundidad {depth}, {label}: correcto')
+        except RecursionError:
+            print(f'Árbol de profundidad {depth}, {label}: RecursionError')
+
+
+if __name__ == '__main__':
+    main()
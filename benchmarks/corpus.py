@@ -0,0 +1,23 @@
+"""Generadores de programas VLS sintéticos para los benchmarks."""
+import random
+
+OPERATORS = ('sumar', 'restar', 'multiplicar', 'dividir', 'potencia')
+
+
+def generate_program(statements, variables=20, seed=0):
+    """Genera un programa VLS válido con aproximadamente `statements` sentencias."""
+    rng = random.Random(seed)
+    names = [f'v{i}' for i in range(variables)]
+    lines = [f'var {name};' for name in names]
+    lines.extend(f'{name} = {rng.randint(1, 9)};' for name in names)
+
+    for _ in range(max(statements - len(lines), 0)):
+        left = rng.choice(names)
+        right = rng.choice(names)
+        op = rng.choice(OPERATORS[:3])
+        if rng.random() < 0.5:
+            lines.append(f'print(({left} {op} {right}) sumar {rng.randint(1, 99)});')
+        else:
+            lines.append(f'{rng.choice(names)} = {left} {op} {rng.randint(1, 99)};')
+
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,226 @@
+import csv
+import sys
+from .lexer import TokenType
+from .parser import Assign, VarDecl
+from .runtime import ExecutionError, apply, format_value
+from .walker import NodeVisitor
+
+# NumPy es opcional: sólo lo necesita la ejecución por lotes
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INT64_MAX = 2 ** 63 - 1
+
+# Qué hacer cuando un resultado puede no entrar en int64:
+# - 'python': la columna pasa a enteros de Python (exacto, más lento)
+# - 'error':  ExecutionError indicando la primera fila que desborda
+OVERFLOW_POLICIES = ('python', 'error')
+
+def require_numpy():
+    if np is None:
+        raise ExecutionError('La ejecución por lotes necesita NumPy (pip install numpy)')
+
+def max_abs(value):
+    """Mayor valor absoluto de una columna o escalar, como entero de Python."""
+    if not isinstance(value, np.ndarray):
+        return abs(value)
+    if value.size == 0:
+        return 0
+    # abs() de int64 desborda en el mínimo: se comparan los extremos
+    return max(int(value.max()), -int(value.min()))
+
+def fits_int64(op, left, right):
+    """Indica si el resultado de `op` entra con seguridad en int64, acotando por los extremos de los operandos."""
+    left_abs, right_abs = max_abs(left), max_abs(right)
+    if left_abs > INT64_MAX or right_abs > INT64_MAX:
+        return False
+    if op in (TokenType.SUMAR, TokenType.RESTAR):
+        return left_abs + right_abs <= INT64_MAX
+    if op == TokenType.MULTIPLICAR:
+        return left_abs * right_abs <= INT64_MAX
+    if op == TokenType.DIVIDIR:
+        return True
+    # Potencia: |base| ** exponente ocupa a lo sumo bit_length * exponente bits
+    return left_abs <= 1 or left_abs.bit_length() * right_abs <= 63
+
+def to_python(value):
+    """Columna con enteros de Python (dtype object)."""
+    return value.astype(object) if isinstance(value, np.ndarray) and value.dtype != object else value
+
+def narrow(value):
+    """Vuelve a int64 una columna de enteros de Python cuando todos sus valores entran."""
+    if isinstance(value, np.ndarray) and value.dtype == object and max_abs(value) <= INT64_MAX:
+        return value.astype(np.int64)
+    return value
+
+def first_row(mask):
+    """Número de la primera fila (desde 1) donde `mask` es verdadero."""
+    return int(np.argmax(mask)) + 1
+
+class BatchEvaluator(NodeVisitor):
+    """
+    Ejecuta un programa VLS sobre muchas filas de entrada a la vez.
+
+    Cada variable es una columna de NumPy (int64, o enteros de Python si
+    los valores no entran) y cada BinOp se evalúa como una sola operación
+    vectorizada sobre todas las filas. Las variables declaradas fuera de
+    los bloques cuyo nombre coincide con una columna de entrada empiezan
+    con esos valores. Cada print agrega una columna a `outputs`.
+    """
+
+    # Las asignaciones no evalúan su variable destino; las declaraciones no evalúan nada
+    child_fields = {Assign: ('right',), VarDecl: ()}
+
+    def __init__(self, inputs, rows, overflow='python'):
+        require_numpy()
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Política de desbordamiento desconocida: {overflow} "
+                             f"(opciones: {', '.join(OVERFLOW_POLICIES)})")
+        self.inputs = inputs        # Nombre -> columna de entrada
+        self.rows = rows
+        self.overflow = overflow
+        self.values = []            # Columna (o escalar) de cada slot; None: sin inicializar
+        self.outputs = []           # Una columna por cada print ejecutado
+        self.depth = 0              # Bloques abiertos
+
+    def visit_Num(self, node):
+        return node.value
+
+    def visit_Var(self, node):
+        value = self.values[node.slot]
+        if value is None:
+            raise ExecutionError(f'Variable no inicializada: {node.value}', node.token)
+        return value
+
+    def visit_BinOp(self, node, left, right):
+        op = node.op
+        if not isinstance(left, np.ndarray) and not isinstance(right, np.ndarray):
+            # Dos escalares: mismo cálculo que los demás motores
+            try:
+                return apply(op.type, left, right)
+            except ExecutionError as error:
+                raise ExecutionError(str(error), op) from None
+
+        if op.type == TokenType.DIVIDIR and np.any(right == 0):
+            row = first_row(right == 0) if isinstance(right, np.ndarray) else 1
+            raise ExecutionError(f'División por cero en la fila {row}', op)
+        if op.type == TokenType.POTENCIA and np.any(right < 0):
+            row = first_row(right < 0) if isinstance(right, np.ndarray) else 1
+            raise ExecutionError(f'Exponente negativo en potencia en la fila {row}', op)
+
+        if fits_int64(op.type, left, right):
+            return self.compute(op.type, left, right)
+        # Puede desbordar: se calcula con enteros de Python y se vuelve a int64 si se puede
+        result = narrow(self.compute(op.type, to_python(left), to_python(right)))
+        if self.overflow == 'error' and result.dtype == object:
+            too_large = np.array([abs(value) > INT64_MAX for value in result], dtype=bool)
+            raise ExecutionError(f'Desbordamiento de int64 en la fila {first_row(too_large)}', op)
+        return result
+
+    def compute(self, op_type, left, right):
+        """Aplica un operador elemento a elemento (sin desbordamiento posible)."""
+        if op_type == TokenType.SUMAR:
+            return left + right
+        if op_type == TokenType.RESTAR:
+            return left - right
+        if op_type == TokenType.MULTIPLICAR:
+            return left * right
+        if op_type == TokenType.POTENCIA:
+            return left ** right
+        # Igual que runtime.dividir: truncamiento hacia cero (// redondea hacia abajo)
+        quotient = left // right
+        return quotient + ((quotient * right != left) & ((left < 0) != (right < 0)))
+
+    def visit_Assign(self, node, value):
+        self.values[node.slot] = value
+
+    def visit_Print(self, node, value):
+        if not isinstance(value, np.ndarray):
+            dtype = np.int64 if abs(value) <= INT64_MAX else object
+            value = np.full(self.rows, value, dtype=dtype)
+        self.outputs.append(value)
+
+    def visit_VarDecl(self, node):
+        var_node = node.var_node
+        values = self.values
+        if var_node.slot >= len(values):
+            values.extend([None] * (var_node.slot + 1 - len(values)))
+        values[var_node.slot] = self.inputs.get(var_node.value) if self.depth == 0 else None
+
+    def enter_Block(self, node):
+        self.depth += 1
+
+    def visit_Block(self, node, *statements):
+        self.depth -= 1
+
+    def run(self, ast):
+        """Ejecuta un nodo o una lista de sentencias y devuelve la lista de columnas impresas."""
+        for node in (ast if isinstance(ast, list) else [ast]):
+            self.visit(node)
+        return self.outputs
+
+def column(values):
+    """Columna de NumPy a partir de una lista de enteros (int64 si todos entran)."""
+    try:
+        return np.array(values, dtype=np.int64)
+    except OverflowError:
+        return np.array(values, dtype=object)
+
+def load_inputs(path):
+    """
+    Lee las filas de entrada de un CSV (con encabezado) o de un .npy con
+    campos con nombre. Devuelve (nombre -> columna, cantidad de filas).
+    """
+    require_numpy()
+    if path.endswith('.npy'):
+        data = np.load(path, allow_pickle=False)
+        if data.dtype.names is None:
+            raise ValueError(f'{path}: se esperaba un arreglo con campos con nombre (uno por variable)')
+        inputs = {}
+        for name in data.dtype.names:
+            if data[name].dtype.kind not in 'iub':
+                raise ValueError(f'{path}: la columna {name} no es entera')
+            inputs[name] = data[name].astype(np.int64)
+        return inputs, len(data)
+
+    with open(path, newline='') as file:
+        reader = csv.reader(file)
+        header = [name.strip() for name in next(reader, [])]
+        rows = [row for row in reader if row]
+    inputs = {}
+    for index, name in enumerate(header):
+        try:
+            values = [int(row[index]) for row in rows]
+        except (ValueError, IndexError):
+            raise ValueError(f'{path}: la columna {name} tiene valores no enteros o faltantes') from None
+        inputs[name] = column(values)
+    return inputs, len(rows)
+
+def write_outputs(outputs, rows, path=None):
+    """
+    Escribe las columnas impresas: en un .npy (filas x prints) o como CSV
+    en `path` o, si no se indica, en la salida estándar.
+    """
+    if path is not None and path.endswith('.npy'):
+        table = np.column_stack(outputs) if outputs else np.empty((rows, 0), dtype=np.int64)
+        np.save(path, table, allow_pickle=table.dtype == object)
+        return
+    file = open(path, 'w', newline='') if path is not None else sys.stdout
+    try:
+        writer = csv.writer(file, lineterminator='\n')
+        writer.writerow([f'print{index + 1}' for index in range(len(outputs))])
+        lists = [values.tolist() for values in outputs]
+        for row in range(rows):
+            writer.writerow([format_value(values[row]) for values in lists])
+    finally:
+        if path is not None:
+            file.close()
+
+def run_batch(ast, inputs_path, overflow='python', output_path=None):
+    """Ejecuta un AST analizado sobre las filas de `inputs_path` y escribe lo impreso."""
+    inputs, rows = load_inputs(inputs_path)
+    outputs = BatchEvaluator(inputs, rows, overflow).run(ast)
+    write_outputs(outputs, rows, output_path)
+    return outputs
@@ -0,0 +1,333 @@
+import struct
+import sys
+from array import array
+from itertools import count
+from .lexer import Token, TokenType
+from .parser import Assign, VarDecl
+from .runtime import ExecutionError, potencia, format_value
+from .walker import NodeVisitor
+from .interpreter import BUFFER_LINES
+
+# Códigos de operación. Cada instrucción ocupa dos enteros: código y operando
+# (0 si no lo usa).
+LOAD_CONST = 0   # Apila constants[operando]
+LOAD_SLOT = 1    # Apila el valor del slot
+STORE_SLOT = 2   # Desapila y guarda en el slot
+CLEAR_SLOT = 3   # Marca el slot como no inicializado (declaración)
+SUMAR = 4
+RESTAR = 5
+MULTIPLICAR = 6
+DIVIDIR = 7
+POTENCIA = 8
+PRINT = 9        # Desapila e imprime
+
+OPCODE_NAMES = ('LOAD_CONST', 'LOAD_SLOT', 'STORE_SLOT', 'CLEAR_SLOT', 'SUMAR', 'RESTAR',
+                'MULTIPLICAR', 'DIVIDIR', 'POTENCIA', 'PRINT')
+
+# Código de operación de cada operador binario
+BINARY_OPCODES = {
+    TokenType.SUMAR: SUMAR,
+    TokenType.RESTAR: RESTAR,
+    TokenType.MULTIPLICAR: MULTIPLICAR,
+    TokenType.DIVIDIR: DIVIDIR,
+    TokenType.POTENCIA: POTENCIA,
+}
+BINARY_OPERATORS = {opcode: op_type for op_type, opcode in BINARY_OPCODES.items()}
+
+class Bytecode:
+    """
+    Programa compilado.
+
+    - code:      array('q') con pares (código de operación, operando)
+    - lines, columns: posición en el código fuente de cada instrucción (0 si no tiene)
+    - constants: valores numéricos sin repetir
+    - names:     nombre de la variable de cada slot (para los mensajes de error)
+    """
+
+    def __init__(self, code=None, lines=None, columns=None, constants=None, names=None):
+        self.code = code if code is not None else array('q')
+        self.lines = lines if lines is not None else array('i')
+        self.columns = columns if columns is not None else array('i')
+        self.constants = constants if constants is not None else []
+        self.names = names if names is not None else []
+
+    def __len__(self):
+        """Cantidad de instrucciones."""
+        return len(self.code) // 2
+
+    def position(self, instruction):
+        """Token vacío con la posición de una instrucción, para ExecutionError."""
+        line = self.lines[instruction]
+        return Token(None, None, line, self.columns[instruction]) if line else None
+
+class BytecodeCompiler(NodeVisitor):
+    """
+    Traduce un AST ya analizado por SemanticAnalyzer a Bytecode.
+
+    El recorrido en postorden de NodeVisitor genera directamente el código
+    de la máquina de pila: los operandos se apilan antes que su operador.
+    """
+
+    # Las asignaciones no cargan su variable destino; las declaraciones no tienen hijos
+    child_fields = {Assign: ('right',), VarDecl: ()}
+
+    def __init__(self):
+        # Se acumula en listas (más rápidas de extender) y se convierte a arreglos al final
+        self.code = []
+        self.lines = []
+        self.columns = []
+        self.constants = []
+        self.constant_index = {}
+        self.names = []
+
+    def emit(self, opcode, operand, token):
+        self.code += (opcode, operand)
+        if token is not None and token.line is not None:
+            self.lines.append(token.line)
+            self.columns.append(token.column)
+        else:
+            self.lines.append(0)
+            self.columns.append(0)
+
+    def visit_Num(self, node):
+        value = node.value
+        index = self.constant_index.get(value)
+        if index is None:
+            index = self.constant_index[value] = len(self.constants)
+            self.constants.append(value)
+        self.emit(LOAD_CONST, index, node.token)
+
+    def visit_Var(self, node):
+        self.emit(LOAD_SLOT, node.slot, node.token)
+
+    def visit_BinOp(self, node, left, right):
+        self.emit(BINARY_OPCODES[node.op.type], 0, node.op)
+
+    def visit_Assign(self, node, value):
+        self.emit(STORE_SLOT, node.slot, node.op)
+
+    def visit_Print(self, node, value):
+        self.emit(PRINT, 0, None)
+
+    def visit_VarDecl(self, node):
+        var_node = node.var_node
+        # Cada slot se declara una vez: ahí se registra su nombre
+        names = self.names
+        if var_node.slot >= len(names):
+            names.extend([None] * (var_node.slot + 1 - len(names)))
+        names[var_node.slot] = var_node.value
+        self.emit(CLEAR_SLOT, var_node.slot, var_node.token)
+
+    def visit_Block(self, node, *statements):
+        pass
+
+    def compile(self, ast):
+        """Compila un nodo o una lista de sentencias y devuelve el Bytecode."""
+        for node in (ast if isinstance(ast, list) else [ast]):
+            self.visit(node)
+        return Bytecode(array('q', self.code), array('i', self.lines), array('i', self.columns),
+                        self.constants, self.names)
+
+def compile_ast(ast):
+    """Compila un AST analizado a Bytecode."""
+    return BytecodeCompiler().compile(ast)
+
+class VM:
+    """
+    Máquina de pila que ejecuta Bytecode con la semántica de src/runtime.py.
+
+    Con `limits` (un runtime.Limits) se usa un ciclo más lento que cuenta
+    cada sentencia y controla el tamaño de cada operación.
+    """
+
+    def __init__(self, output=None, buffer_lines=BUFFER_LINES, limits=None):
+        self.output = output if output is not None else sys.stdout
+        self.buffer_lines = buffer_lines
+        self.limits = limits
+
+    def run(self, bytecode):
+        """Ejecuta el programa; lo impreso se escribe por bloques y al terminar."""
+        if self.limits is not None:
+            return self.run_limited(bytecode)
+        # VLS no tiene saltos: las instrucciones se recorren una sola vez, en orden
+        code = bytecode.code
+        opcodes = code[0::2].tolist()   # Leer de listas evita crear un int por acceso
+        operands = code[1::2].tolist()
+        constants = bytecode.constants
+        values = [None] * len(bytecode.names)
+        stack = []
+        push, pop = stack.append, stack.pop
+        buffer = []
+        buffer_lines = self.buffer_lines
+        output = self.output
+        try:
+            for instruction, opcode, operand in zip(count(), opcodes, operands):
+                if opcode == LOAD_SLOT:
+                    value = values[operand]
+                    if value is None:
+                        raise ExecutionError(f'Variable no inicializada: {bytecode.names[operand]}',
+                                             bytecode.position(instruction))
+                    push(value)
+                elif opcode == LOAD_CONST:
+                    push(constants[operand])
+                elif opcode == SUMAR:
+                    right = pop()
+                    stack[-1] += right
+                elif opcode == RESTAR:
+                    right = pop()
+                    stack[-1] -= right
+                elif opcode == MULTIPLICAR:
+                    right = pop()
+                    stack[-1] *= right
+                elif opcode == STORE_SLOT:
+                    values[operand] = pop()
+                elif opcode == PRINT:
+                    buffer.append(format_value(pop()))
+                    if len(buffer) >= buffer_lines:
+                        buffer.append('')
+                        output.write('\n'.join(buffer))
+                        buffer = []
+                elif opcode == DIVIDIR:
+                    right = pop()
+                    if right == 0:
+                        raise ExecutionError('División por cero', bytecode.position(instruction))
+                    left = stack[-1]
+                    # Igual que runtime.dividir: truncamiento hacia cero
+                    stack[-1] = left // right if (left < 0) == (right < 0) else -(-left // right)
+                elif opcode == POTENCIA:
+                    right = pop()
+                    try:
+                        stack[-1] = potencia(stack[-1], right)
+                    except ExecutionError as error:
+                        raise ExecutionError(str(error), bytecode.position(instruction)) from None
+                elif opcode == CLEAR_SLOT:
+                    values[operand] = None
+                else:
+                    raise ValueError(f'Código de operación desconocido: {opcode}')
+        finally:
+            # Lo impreso antes de un error de ejecución también se muestra
+            if buffer:
+                buffer.append('')
+                output.write('\n'.join(buffer))
+
+    def run_limited(self, bytecode):
+        """Como run(), pero respetando self.limits."""
+        limits = self.limits
+        limits.start()
+        code = bytecode.code
+        constants = bytecode.constants
+        values = [None] * len(bytecode.names)
+        stack = []
+        buffer = []
+        try:
+            for instruction, opcode, operand in zip(count(), code[0::2].tolist(), code[1::2].tolist()):
+                if opcode == LOAD_SLOT:
+                    value = values[operand]
+                    if value is None:
+                        raise ExecutionError(f'Variable no inicializada: {bytecode.names[operand]}',
+                                             bytecode.position(instruction))
+                    stack.append(value)
+                elif opcode == LOAD_CONST:
+                    stack.append(constants[operand])
+                elif opcode in BINARY_OPERATORS:
+                    right = stack.pop()
+                    stack[-1] = limits.apply(BINARY_OPERATORS[opcode], stack[-1], right,
+                                             bytecode.position(instruction))
+                elif opcode == STORE_SLOT:
+                    limits.step(bytecode.position(instruction))
+                    values[operand] = stack.pop()
+                elif opcode == PRINT:
+                    limits.step()
+                    buffer.append(limits.format(stack.pop()))
+                    if len(buffer) >= self.buffer_lines:
+                        buffer.append('')
+                        self.output.write('\n'.join(buffer))
+                        buffer = []
+                elif opcode == CLEAR_SLOT:
+                    limits.step(bytecode.position(instruction))
+                    values[operand] = None
+                else:
+                    raise ValueError(f'Código de operación desconocido: {opcode}')
+        finally:
+            if buffer:
+                buffer.append('')
+                self.output.write('\n'.join(buffer))
+
+def disassemble(bytecode):
+    """Devuelve el listado legible de las instrucciones."""
+    lines = []
+    code = bytecode.code
+    for instruction in range(len(bytecode)):
+        opcode, operand = code[2 * instruction], code[2 * instruction + 1]
+        name = OPCODE_NAMES[opcode]
+        if opcode == LOAD_CONST:
+            argument = f'{operand} ({format_value(bytecode.constants[operand])})'
+        elif opcode in (LOAD_SLOT, STORE_SLOT, CLEAR_SLOT):
+            argument = f'{operand} ({bytecode.names[operand]})'
+        else:
+            argument = ''
+        line = bytecode.lines[instruction]
+        position = f'{line}:{bytecode.columns[instruction]}' if line else ''
+        lines.append(f'{instruction:6d}  {position:>9}  {name:<12}{argument}'.rstrip())
+    return '\n'.join(lines)
+
+# Formato de archivo: encabezado, arreglos en little-endian y luego las
+# constantes y nombres, cada uno precedido por su longitud en bytes.
+MAGIC = b'VLSB'
+VERSION = 1
+HEADER = struct.Struct('<4sHIII')   # magia, versión, instrucciones, constantes, nombres
+LENGTH = struct.Struct('<I')
+
+def little_endian(values):
+    """Copia de un array en orden little-endian."""
+    values = array(values.typecode, values)
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values
+
+def save(bytecode, path):
+    """Guarda el Bytecode en `path`."""
+    with open(path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(bytecode), len(bytecode.constants), len(bytecode.names)))
+        for values in (bytecode.code, bytecode.lines, bytecode.columns):
+            file.write(little_endian(values).tobytes())
+        for value in bytecode.constants:
+            data = value.to_bytes((value.bit_length() + 8) // 8, 'little', signed=True)
+            file.write(LENGTH.pack(len(data)) + data)
+        for name in bytecode.names:
+            data = (name or '').encode('utf-8')
+            file.write(LENGTH.pack(len(data)) + data)
+
+def load(path):
+    """Carga un Bytecode guardado con save()."""
+    with open(path, 'rb') as file:
+        data = file.read()
+    magic, version, instructions, constant_count, name_count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f'{path} no es un archivo de bytecode VLS compatible')
+    offset = HEADER.size
+
+    def read_array(typecode, count):
+        nonlocal offset
+        values = array(typecode)
+        size = values.itemsize * count
+        values.frombytes(data[offset:offset + size])
+        offset += size
+        if sys.byteorder != 'little':
+            values.byteswap()
+        return values
+
+    def read_bytes():
+        nonlocal offset
+        (size,) = LENGTH.unpack_from(data, offset)
+        offset += LENGTH.size
+        chunk = data[offset:offset + size]
+        offset += size
+        return chunk
+
+    code = read_array('q', 2 * instructions)
+    lines = read_array('i', instructions)
+    columns = read_array('i', instructions)
+    constants = [int.from_bytes(read_bytes(), 'little', signed=True) for _ in range(constant_count)]
+    names = [read_bytes().decode('utf-8') for _ in range(name_count)]
+    return Bytecode(code, lines, columns, constants, names)
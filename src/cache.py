@@ -0,0 +1,253 @@
+import hashlib
+import os
+import pickle
+import stat
+import sys
+from collections import OrderedDict
+
+# Tamaño máximo de la caché en disco; al superarlo se borran las entradas menos usadas
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+# Cada cuántas escrituras (por proceso) se controla el tamaño total
+EVICTION_INTERVAL = 64
+
+# Directorio por defecto (VLS_CACHE_DIR lo reemplaza)
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser('~'), '.cache', 'vls')
+
+_fingerprint = None
+
+def compiler_fingerprint():
+    """
+    Huella de la versión del compilador: hash de los fuentes de src/ y de
+    la versión de Python (que fija los formatos de pickle y marshal).
+    Cualquier cambio en el compilador invalida las entradas anteriores.
+    """
+    global _fingerprint
+    if _fingerprint is None:
+        digest = hashlib.sha256(sys.version.encode())
+        directory = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(directory)):
+            if name.endswith('.py'):
+                with open(os.path.join(directory, name), 'rb') as file:
+                    digest.update(name.encode() + b'\0' + file.read())
+        _fingerprint = digest.hexdigest()
+    return _fingerprint
+
+class Diagnostic:
+    """Error de compilación serializable: clase, mensaje completo y posición."""
+    __slots__ = ('kind', 'message', 'line', 'column')
+
+    def __init__(self, kind, message, line=None, column=None):
+        self.kind = kind        # Nombre de la clase del error original (LexerError, ...)
+        self.message = message  # Texto del error, con su posición
+        self.line = line
+        self.column = column
+
+    @classmethod
+    def from_error(cls, error):
+        return cls(type(error).__name__, str(error), getattr(error, 'line', None), getattr(error, 'column', None))
+
+    def __str__(self):
+        return self.message
+
+    def to_dict(self):
+        return {'kind': self.kind, 'message': self.message, 'line': self.line, 'column': self.column}
+
+class CheckedProgram:
+    """
+    Resultado de compilar un código fuente, tal como se guarda en la caché:
+    el AST ya optimizado y analizado en forma plana (FlatAST, con los
+    slots resueltos), los errores de todas las fases como Diagnostic y las
+    estadísticas del optimizador.
+    """
+
+    def __init__(self, tree, statements, errors, stats):
+        self.tree = tree                # FlatAST
+        self.statements = statements    # Índices de las sentencias del programa
+        self.errors = errors            # Diagnostic de cada error, ordenados por posición
+        self.stats = stats              # (plegadas, propagadas, eliminados)
+
+    def ast(self):
+        """Lista de sentencias (vistas de FlatAST) lista para ejecutar."""
+        return [self.tree.node(index) for index in self.statements]
+
+class CompilationCache:
+    """
+    Caché persistente de resultados de compilación, direccionada por contenido.
+
+    La clave es el sha256 del código fuente junto con la huella del
+    compilador y las opciones que cambian el resultado, así que una entrada
+    nunca queda desactualizada: sólo deja de usarse. Cada entrada es un
+    archivo con el objeto serializado con pickle.
+
+    Las escrituras son atómicas (archivo temporal y os.replace), de modo que
+    varios procesos pueden compartir el directorio: un lector ve la entrada
+    completa o no la ve. Una lectura actualiza la fecha de modificación del
+    archivo, y al superar `max_bytes` se borran las entradas más antiguas
+    (LRU). Una entrada ilegible se trata como ausente y se borra.
+
+    Cargar un pickle puede ejecutar código, así que el directorio debe ser
+    privado: se crea con permisos 0700 y, si es de otro usuario o otros
+    pueden escribir en él, la caché no se usa. Tampoco se usa si no se
+    puede crear o escribir: la compilación sigue sin caché.
+    """
+
+    def __init__(self, directory=None, max_bytes=MAX_CACHE_BYTES):
+        self.directory = directory or os.environ.get('VLS_CACHE_DIR') or DEFAULT_DIRECTORY
+        self.max_bytes = max_bytes
+        self.writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.trusted = None     # Resultado de usable(), calculado una vez
+
+    def usable(self):
+        """Crea el directorio si falta; False si no se puede o no es privado del usuario actual."""
+        if self.trusted is None:
+            try:
+                os.makedirs(self.directory, mode=0o700, exist_ok=True)
+                status = os.stat(self.directory)
+            except OSError:
+                self.trusted = False
+            else:
+                owner = os.getuid() if hasattr(os, 'getuid') else status.st_uid
+                self.trusted = (stat.S_ISDIR(status.st_mode) and status.st_uid == owner
+                                and not status.st_mode & (stat.S_IWGRP | stat.S_IWOTH))
+        return self.trusted
+
+    def key(self, source, options=''):
+        """Clave de un código fuente compilado con `options`."""
+        digest = hashlib.sha256(compiler_fingerprint().encode())
+        digest.update(b'\0' + options.encode() + b'\0')
+        digest.update(source.encode('utf-8'))
+        return digest.hexdigest()
+
+    def path(self, key):
+        # Subdirectorios por los dos primeros caracteres, para no acumular todo en uno
+        return os.path.join(self.directory, key[:2], key)
+
+    def get(self, key):
+        """Devuelve el objeto guardado con `key`, o None si no está."""
+        if not self.usable():
+            self.misses += 1
+            return None
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as file:
+                value = pickle.load(file)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, IndexError, TypeError,
+                ValueError, MemoryError):
+            # Entrada truncada o de un formato incompatible
+            self.discard(path)
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """Guarda `value` con `key` de forma atómica; si no se puede escribir, no se guarda."""
+        if not self.usable():
+            return
+        path = self.path(key)
+        directory = os.path.dirname(path)
+        import tempfile  # Sólo hace falta al escribir (un acierto no lo carga)
+        try:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+        except OSError:
+            return
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, path)
+        except OSError:
+            # Disco lleno, permisos, ...: la compilación no depende de la caché
+            self.discard(temporary)
+            return
+        except BaseException:
+            self.discard(temporary)
+            raise
+        if self.writes % EVICTION_INTERVAL == 0:
+            self.evict()
+        self.writes += 1
+
+    def discard(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def entries(self):
+        """Lista de (fecha de modificación, tamaño, ruta) de las entradas."""
+        entries = []
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.startswith('.tmp-'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    status = os.stat(path)
+                except OSError:
+                    continue    # Otro proceso la borró
+                entries.append((status.st_mtime, status.st_size, path))
+        return entries
+
+    def evict(self):
+        """Borra las entradas menos usadas hasta dejar la caché en el 90% de `max_bytes`."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        target = self.max_bytes * 9 // 10
+        for _, size, path in entries:
+            if total <= target:
+                break
+            self.discard(path)
+            total -= size
+
+    def clear(self):
+        """Borra todas las entradas."""
+        for _, _, path in self.entries():
+            self.discard(path)
+
+class MemoryCache(CompilationCache):
+    """
+    Caché en memoria con la misma interfaz que CompilationCache, para
+    procesos de larga vida (src/daemon.py): las entradas no se serializan
+    y se conservan las `max_entries` usadas más recientemente.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.values = OrderedDict()
+        self.writes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.values.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.values.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.values[key] = value
+        if len(self.values) > self.max_entries:
+            self.values.popitem(last=False)
+        self.writes += 1
+
+    def entries(self):
+        return []
+
+    def clear(self):
+        self.values.clear()
@@ -0,0 +1,108 @@
+"""
+Cliente liviano del demonio de compilación (src/daemon.py).
+
+Sólo importa la biblioteca estándar, así que arranca en lo que tarda
+Python en iniciar: el compilador ya está cargado en el demonio.
+
+Uso: python -m src.client <archivo.vls> [--check|--compile|--run] [--backend=ast|vm|python] [--socket=ruta]
+"""
+import errno
+import json
+import os
+import socket
+import sys
+
+def default_socket():
+    """
+    Ruta del socket por defecto: en XDG_RUNTIME_DIR (privado del usuario)
+    o, si no está definido, en un directorio vls-<uid> de TMPDIR (o /tmp)
+    que el demonio crea con permisos 0700. No se usa tempfile para no
+    alargar el arranque del cliente.
+    """
+    temporary = os.environ.get('TMPDIR') or '/tmp'
+    directory = os.environ.get('XDG_RUNTIME_DIR') or os.path.join(temporary, f'vls-{os.getuid()}')
+    return os.path.join(directory, 'vls.sock')
+
+# Ruta del socket por defecto (VLS_SOCKET la reemplaza)
+DEFAULT_SOCKET = os.environ.get('VLS_SOCKET') or default_socket()
+
+class Client:
+    """
+    Conexión a un demonio: envía solicitudes JSON y espera la respuesta de cada una.
+
+    Sólo se conecta a un socket del mismo usuario: otro podría crear antes
+    la ruta y recibir el código fuente de las solicitudes.
+    """
+
+    def __init__(self, path=DEFAULT_SOCKET):
+        if os.stat(path).st_uid != os.getuid():
+            raise PermissionError(errno.EPERM, 'el socket es de otro usuario', path)
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(path)
+        self.file = self.socket.makefile('rwb')
+        self.next_id = 0
+
+    def request(self, op, source, **options):
+        """Envía una solicitud ('check', 'compile' o 'run') y devuelve la respuesta como dict."""
+        self.next_id += 1
+        message = dict(options, id=self.next_id, op=op, source=source)
+        self.file.write(json.dumps(message).encode() + b'\n')
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            raise ConnectionError('El demonio cerró la conexión')
+        return json.loads(line)
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
+
+def main():
+    paths = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if len(paths) != 1:
+        print(__doc__.strip().splitlines()[-1])
+        sys.exit(1)
+    op = 'check'
+    options = {}
+    path = DEFAULT_SOCKET
+    for arg in sys.argv[1:]:
+        if arg in ('--check', '--compile', '--run'):
+            op = arg[2:]
+        elif arg.startswith('--backend='):
+            options['backend'] = arg[len('--backend='):]
+            op = 'run'
+        elif arg.startswith('--socket='):
+            path = arg[len('--socket='):]
+    try:
+        with open(paths[0], 'r') as file:
+            source = file.read()
+    except FileNotFoundError:
+        print(f"Error: No se pudo encontrar el archivo {paths[0]}")
+        sys.exit(1)
+    try:
+        client = Client(path)
+    except OSError as error:
+        print(f"Error: No se pudo conectar con el demonio en {path} ({error.strerror})")
+        sys.exit(1)
+    try:
+        response = client.request(op, source, **options)
+    finally:
+        client.close()
+
+    # La salida imita a la de python -m src.main
+    if response.get('warning'):
+        print(f"Aviso: {response['warning']}")
+    for diagnostic in response.get('diagnostics', []):
+        print(f"Error: {diagnostic['message']}")
+    if 'output' in response:
+        print(response['output'], end='')
+    if 'bytecode' in response:
+        print(response['bytecode'])
+    if response.get('error'):
+        print(f"Error: {response['error']}")
+    if response['ok'] and op == 'check':
+        print("Compilación exitosa!")
+    sys.exit(0 if response['ok'] else 1)
+
+if __name__ == '__main__':
+    main()
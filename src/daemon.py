@@ -0,0 +1,206 @@
+import asyncio
+import io
+import json
+import os
+import signal
+import socket
+import stat
+import time
+from concurrent.futures import ProcessPoolExecutor
+from .main import compile_source, run_program, BACKENDS
+from .optimizer import MAX_FOLD_BITS
+from .bytecode import compile_ast, disassemble
+from .pybackend import compile_program
+from .runtime import ExecutionError, Limits, DEFAULT_MAX_BITS
+from .cache import MemoryCache
+from .parallel import available_cores
+from .client import DEFAULT_SOCKET
+
+# Operaciones que acepta el demonio
+OPERATIONS = ('check', 'compile', 'run')
+
+# Límites de toda ejecución del demonio (argumentos de runtime.Limits): una
+# solicitud puede pedir valores menores, pero no quitarlos ni agrandarlos,
+# así ningún cliente ocupa un proceso del pool indefinidamente
+DEFAULT_LIMITS = {'max_steps': 10_000_000, 'max_bits': DEFAULT_MAX_BITS, 'timeout': 10.0}
+LIMIT_NAMES = tuple(DEFAULT_LIMITS)
+
+# Tamaño máximo de una línea de solicitud
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+# Caché de cada proceso del pool: dura mientras vive el demonio
+_cache = None
+
+def handle(request):
+    """
+    Atiende una solicitud en un proceso del pool y devuelve la respuesta.
+
+    - check:   análisis completo; devuelve los errores
+    - compile: además compila para el motor pedido ('vm' devuelve el bytecode desensamblado)
+    - run:     además ejecuta, siempre con límites (DEFAULT_LIMITS o los menores que pida la
+               solicitud), y devuelve lo impreso (`output`) y el error de ejecución si lo hubo
+    """
+    global _cache
+    if _cache is None:
+        _cache = MemoryCache()
+    start = time.perf_counter()
+    response = {'id': request.get('id')}
+    op = request.get('op')
+    source = request.get('source')
+    backend = request.get('backend', 'vm')
+    limit_values = request.get('limits') or {}
+    if op not in OPERATIONS or not isinstance(source, str) or backend not in BACKENDS:
+        response.update(ok=False, error=f"Solicitud inválida: se esperaba op ({', '.join(OPERATIONS)}), "
+                                        f"source y opcionalmente backend ({', '.join(BACKENDS)})")
+        return response
+    if (not isinstance(limit_values, dict) or set(limit_values) - set(LIMIT_NAMES)
+            or not all(value is None or isinstance(value, (int, float)) for value in limit_values.values())):
+        response.update(ok=False, error=f"Solicitud inválida: límites admitidos (números): {', '.join(LIMIT_NAMES)}")
+        return response
+    limits = None
+    if op == 'run':
+        limits = Limits(**{name: default if limit_values.get(name) is None else min(limit_values[name], default)
+                           for name, default in DEFAULT_LIMITS.items()})
+        if backend == 'python':
+            # El motor python no admite límites: se ejecuta con la VM
+            response['warning'] = "el motor python no admite límites de ejecución; se usa vm"
+            backend = 'vm'
+
+    fold_bits = MAX_FOLD_BITS
+    if limits is not None and limits.max_bits is not None:
+        fold_bits = min(fold_bits, limits.max_bits)
+    options = f'fold_bits={fold_bits}'
+    result = compile_source(source, fold_bits, _cache)
+    response.update(ok=result.ok, cached=result.cached,
+                    diagnostics=[diagnostic.to_dict() for diagnostic in result.diagnostics])
+
+    try:
+        if result.ok and op == 'compile' and backend == 'vm':
+            response['bytecode'] = disassemble(compile_ast(result.ast))
+        elif result.ok and op == 'compile' and backend == 'python':
+            # El objeto código queda en la caché en memoria de src/pybackend.py
+            compile_program(result.ast, key=(options, source))
+        elif result.ok and op == 'run':
+            output = io.StringIO()
+            try:
+                run_program(result.ast, backend, (options, source), output, limits)
+            except ExecutionError as error:
+                response.update(ok=False, error=str(error))
+            response['output'] = output.getvalue()
+    except ValueError as error:
+        response.update(ok=False, error=str(error))
+    response['seconds'] = round(time.perf_counter() - start, 6)
+    return response
+
+class Daemon:
+    """
+    Servidor asyncio en un socket Unix que recibe solicitudes en JSON Lines.
+
+    Cada línea es un objeto {"id", "op", "source", "backend", "limits"} y
+    cada respuesta, otra línea con el mismo "id". Las solicitudes de una
+    misma conexión se atienden en paralelo (las respuestas pueden llegar
+    en otro orden) y el trabajo se reparte en un ProcessPoolExecutor cuyos
+    procesos conservan sus cachés entre solicitudes.
+    """
+
+    def __init__(self, path=DEFAULT_SOCKET, jobs=None):
+        self.path = path
+        self.jobs = jobs or available_cores()
+        self.executor = None
+        self.requests = 0
+
+    async def respond(self, request, writer):
+        loop = asyncio.get_running_loop()
+        try:
+            response = await loop.run_in_executor(self.executor, handle, request)
+        except Exception as error:
+            response = {'id': request.get('id'), 'ok': False, 'error': f'{type(error).__name__}: {error}'}
+        self.requests += 1
+        writer.write(json.dumps(response, ensure_ascii=False).encode() + b'\n')
+        await writer.drain()
+
+    async def connection(self, reader, writer):
+        """Atiende una conexión hasta que el cliente la cierra."""
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError('se esperaba un objeto')
+                except ValueError as error:
+                    writer.write(json.dumps({'id': None, 'ok': False, 'error': f'JSON inválido: {error}'}).encode() + b'\n')
+                    continue
+                task = asyncio.create_task(self.respond(request, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass    # Cliente desconectado o línea demasiado larga
+        finally:
+            writer.close()
+
+    def prepare_directory(self):
+        """
+        Crea el directorio del socket con permisos 0700 si no existe. Si ya
+        existe, debe ser del usuario (o de root) y, si otros pueden escribir
+        en él, tener el bit sticky (como /tmp), para que nadie más pueda
+        reemplazar el socket.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        status = os.stat(directory)
+        if status.st_uid not in (os.getuid(), 0):
+            raise RuntimeError(f'El directorio {directory} es de otro usuario')
+        if status.st_mode & (stat.S_IWGRP | stat.S_IWOTH) and not status.st_mode & stat.S_ISVTX:
+            raise RuntimeError(f'Otros usuarios pueden escribir en {directory}')
+
+    def remove_stale_socket(self):
+        """Borra el socket de un demonio anterior que terminó sin limpiarlo."""
+        try:
+            status = os.lstat(self.path)
+        except FileNotFoundError:
+            return
+        if status.st_uid != os.getuid():
+            raise RuntimeError(f'{self.path} es de otro usuario')
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            os.remove(self.path)
+        else:
+            raise RuntimeError(f'Ya hay un demonio escuchando en {self.path}')
+        finally:
+            probe.close()
+
+    async def serve(self, ready=None):
+        """Escucha hasta recibir SIGINT o SIGTERM. `ready`, si se indica, se llama al empezar a escuchar."""
+        self.prepare_directory()
+        self.remove_stale_socket()
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for signal_number in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signal_number, stop.set)
+        self.executor = ProcessPoolExecutor(max_workers=self.jobs)
+        # El socket se crea ya con permisos 0600 (sólo el usuario que lo inició)
+        umask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(self.connection, self.path, limit=MAX_REQUEST_BYTES)
+        finally:
+            os.umask(umask)
+        try:
+            if ready is not None:
+                ready()
+            async with server:
+                await stop.wait()
+        finally:
+            server.close()
+            self.executor.shutdown(cancel_futures=True)
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+def serve(path=DEFAULT_SOCKET, jobs=None):
+    """Inicia el demonio en `path` con `jobs` procesos (bloquea hasta que se detiene)."""
+    daemon = Daemon(path, jobs)
+    asyncio.run(daemon.serve(ready=lambda: print(f"Demonio escuchando en {path} ({daemon.jobs} procesos)", flush=True)))
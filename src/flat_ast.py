@@ -0,0 +1,235 @@
+from array import array
+from .lexer import Token, TokenType, TOKEN_TYPES
+from .parser import BinOp, Num, Var, Assign, Print, VarDecl, Block
+from .walker import NodeVisitor
+
+# Códigos de tipo de nodo
+NUM, VAR, BINOP, ASSIGN, PRINT, VARDECL, BLOCK = range(7)
+
+class FlatAST:
+    """
+    AST plano almacenado en columnas paralelas.
+
+    Cada nodo es un índice entero. Para cada uno se guardan su tipo, el
+    código del operador (TokenType.value, 0 si no aplica), dos campos
+    enteros y su posición en el código fuente:
+
+    - Num:     first = índice en `constants`
+    - Var:     first = índice en `names`
+    - BinOp:   first = hijo izquierdo, second = hijo derecho
+    - Assign:  first = variable, second = expresión
+    - Print:   first = expresión
+    - VarDecl: first = variable
+    - Block:   first = inicio en `children`, second = cantidad de sentencias
+
+    La columna `slots` guarda el slot que el análisis semántico asigna a
+    los nodos Var y Assign (-1 mientras no se resolvió).
+
+    Implementa la interfaz de NodeFactory, así que puede pasarse a Parser
+    para construir el árbol directamente en forma plana. Los métodos de
+    construcción y node() devuelven vistas livianas que se comportan como
+    los nodos de src/parser.py, por lo que SemanticAnalyzer y
+    DevelopmentTools pueden recorrerlas sin cambios.
+    """
+
+    def __init__(self):
+        self.kinds = array('B')     # Tipo de nodo
+        self.ops = array('B')       # Código del operador
+        self.first = array('i')     # Primer campo
+        self.second = array('i')    # Segundo campo
+        self.lines = array('i')     # Línea del token principal del nodo
+        self.columns = array('i')   # Columna del token principal del nodo
+        self.slots = array('i')     # Slot de la variable (Var, Assign) o -1
+        self.children = array('i')  # Índices de las sentencias de cada bloque, contiguos
+        self.constants = []         # Valores numéricos sin repetir
+        self.constant_index = {}
+        self.names = []             # Nombres de variables sin repetir
+        self.name_index = {}
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def add(self, kind, op, first, second, token):
+        """Agrega un nodo y devuelve su vista."""
+        index = len(self.kinds)
+        self.kinds.append(kind)
+        self.ops.append(op)
+        self.first.append(first)
+        self.second.append(second)
+        self.slots.append(-1)
+        # Los nodos sin token (Print, VarDecl) o sin posición guardan 0
+        has_position = token is not None and token.line is not None
+        self.lines.append(token.line if has_position else 0)
+        self.columns.append(token.column if has_position else 0)
+        return self.node(index)
+
+    def node(self, index):
+        """Devuelve la vista del nodo `index`."""
+        return VIEW_CLASSES[self.kinds[index]](self, index)
+
+    def token(self, index, type, value):
+        """Reconstruye el token principal del nodo `index`."""
+        line, column = self.lines[index], self.columns[index]
+        return Token(type, value, line or None, column or None)
+
+    # Interfaz de NodeFactory
+
+    def bin_op(self, left, op, right):
+        return self.add(BINOP, op.type.value, left.index, right.index, op)
+
+    def num(self, token):
+        value = int(token.value)
+        index = self.constant_index.get(value)
+        if index is None:
+            index = self.constant_index[value] = len(self.constants)
+            self.constants.append(value)
+        return self.add(NUM, 0, index, 0, token)
+
+    def var(self, token):
+        index = self.name_index.get(token.value)
+        if index is None:
+            index = self.name_index[token.value] = len(self.names)
+            self.names.append(token.value)
+        return self.add(VAR, 0, index, 0, token)
+
+    def assign(self, left, op, right):
+        return self.add(ASSIGN, op.type.value, left.index, right.index, op)
+
+    def print(self, expr):
+        return self.add(PRINT, 0, expr.index, 0, None)
+
+    def var_decl(self, var_node):
+        return self.add(VARDECL, 0, var_node.index, 0, None)
+
+    def block(self, token, statements):
+        start = len(self.children)
+        self.children.extend(statement.index for statement in statements)
+        return self.add(BLOCK, 0, start, len(statements), token)
+
+    @classmethod
+    def from_nodes(cls, ast):
+        """Convierte un AST de objetos (un nodo o una lista de sentencias) a forma plana."""
+        tree = cls()
+        builder = FlatBuilder(tree)
+        nodes = ast if isinstance(ast, list) else [ast]
+        return tree, [builder.visit(node) for node in nodes]
+
+class FlatBuilder(NodeVisitor):
+    """Copia un AST de objetos en un FlatAST (con sus slots); los hijos se crean antes que el padre."""
+
+    def __init__(self, tree):
+        self.tree = tree
+
+    def visit_Num(self, node):
+        return self.tree.num(node.token)
+
+    def visit_Var(self, node):
+        view = self.tree.var(node.token)
+        view.slot = node.slot   # Se conserva el slot si el AST ya fue analizado
+        return view
+
+    def visit_BinOp(self, node, left, right):
+        return self.tree.bin_op(left, node.op, right)
+
+    def visit_Assign(self, node, left, right):
+        view = self.tree.assign(left, node.op, right)
+        view.slot = node.slot
+        return view
+
+    def visit_Print(self, node, expr):
+        return self.tree.print(expr)
+
+    def visit_VarDecl(self, node, var_node):
+        return self.tree.var_decl(var_node)
+
+    def visit_Block(self, node, *statements):
+        return self.tree.block(node.token, statements)
+
+class NodeView:
+    """Base de las vistas: un nodo de FlatAST identificado por su índice."""
+
+    def __init__(self, tree, index):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def slot(self):
+        slot = self.tree.slots[self.index]
+        return None if slot < 0 else slot
+
+    @slot.setter
+    def slot(self, value):
+        self.tree.slots[self.index] = -1 if value is None else value
+
+class NumView(NodeView, Num):
+    @property
+    def value(self):
+        return self.tree.constants[self.tree.first[self.index]]
+
+    @property
+    def token(self):
+        return self.tree.token(self.index, TokenType.NUMBER, self.value)
+
+class VarView(NodeView, Var):
+    @property
+    def value(self):
+        return self.tree.names[self.tree.first[self.index]]
+
+    @property
+    def token(self):
+        return self.tree.token(self.index, TokenType.IDENTIFIER, self.value)
+
+class BinOpView(NodeView, BinOp):
+    @property
+    def left(self):
+        return self.tree.node(self.tree.first[self.index])
+
+    @property
+    def right(self):
+        return self.tree.node(self.tree.second[self.index])
+
+    @property
+    def op(self):
+        type = TOKEN_TYPES[self.tree.ops[self.index]]
+        return self.tree.token(self.index, type, type.name.lower())
+
+    token = op
+
+class AssignView(NodeView, Assign):
+    @property
+    def left(self):
+        return self.tree.node(self.tree.first[self.index])
+
+    @property
+    def right(self):
+        return self.tree.node(self.tree.second[self.index])
+
+    @property
+    def op(self):
+        return self.tree.token(self.index, TokenType.ASSIGN, '=')
+
+    token = op
+
+class PrintView(NodeView, Print):
+    @property
+    def expr(self):
+        return self.tree.node(self.tree.first[self.index])
+
+class VarDeclView(NodeView, VarDecl):
+    @property
+    def var_node(self):
+        return self.tree.node(self.tree.first[self.index])
+
+class BlockView(NodeView, Block):
+    @property
+    def statements(self):
+        tree = self.tree
+        start = tree.first[self.index]
+        return [tree.node(child) for child in tree.children[start:start + tree.second[self.index]]]
+
+    @property
+    def token(self):
+        return self.tree.token(self.index, TokenType.LBRACE, '{')
+
+# Clase de vista para cada código de tipo de nodo
+VIEW_CLASSES = (NumView, VarView, BinOpView, AssignView, PrintView, VarDeclView, BlockView)
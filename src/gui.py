@@ -3,8 +3,9 @@ from tkinter import ttk, scrolledtext
 import time
 from typing import List, Dict
 from .lexer import Lexer, Token
-from .parser import Parser, AST, BinOp, Num, Var, Assign, Print, VarDecl
+from .parser import Parser, IncrementalParser, AST, BinOp, Num, Var, Assign, Print, VarDecl, Block
 from .semantic import SemanticAnalyzer
+from .walker import walk
 import threading
 
 class CompilerGUI:
@@ -19,6 +20,7 @@ class CompilerGUI:
         self.ast = None
         self.current_phase = 0
         self.is_running = False
+        self.incremental_parser = IncrementalParser()
         
         self.setup_gui()
         
@@ -102,17 +104,15 @@ print(x + y);""")
             # Fase 1: Análisis Léxico
             self.update_progress(0)
             self.lex_output.delete("1.0", tk.END)
-            lexer = Lexer(self.source_code)
+            # El TokenStream del parser incremental sólo re-analiza el tramo editado
+            stream = self.incremental_parser.update(self.source_code)
             tokens = []
-            while True:
-                token = lexer.get_next_token()
+            for token in stream:
                 tokens.append(token)
                 self.lex_output.insert(tk.END, f"{token}\n")
                 self.lex_output.see(tk.END)
                 self.root.update()
                 time.sleep(0.1)
-                if token.type.name == 'EOF':
-                    break
 
             # Fase 2: Análisis Sintáctico
             self.update_progress(33)
@@ -122,75 +122,28 @@ print(x + y);""")
             for t in tokens:
                 self.parse_output.insert(tk.END, f"{t}\n")
             self.parse_output.insert(tk.END, "\n")
-            # Volver a crear el lexer para el parser
-            lexer_for_parser = Lexer(self.source_code)
+            # El parser incremental sólo vuelve a analizar las sentencias modificadas
             try:
-                parser = Parser(lexer_for_parser)
-                self.ast = parser.program()
+                self.ast = self.incremental_parser.parse(self.source_code)
                 self.parse_output.insert(tk.END, f"AST generado (estructura):\n")
+                self.parse_output.insert(tk.END, f"Sentencias reutilizadas: {self.incremental_parser.reused}, "
+                                                 f"analizadas: {self.incremental_parser.parsed}\n")
             except Exception as e:
                 self.parse_output.insert(tk.END, f"Error en el parser: {str(e)}\n")
                 self.is_running = False
                 return
-            def print_ast(node, level=0):
-                if isinstance(node, list):
-                    for child in node:
-                        print_ast(child, level)
-                    return
+            for _, node, _, level in walk(self.ast):
                 indent = "  " * level
                 if isinstance(node, BinOp):
                     info = f"{type(node).__name__}: {node.op.type}"
-                    self.parse_output.insert(tk.END, f"{indent}{info}\n")
-                    self.parse_output.see(tk.END)
-                    self.root.update()
-                    time.sleep(0.1)
-                    print_ast(node.left, level + 1)
-                    print_ast(node.right, level + 1)
-                elif isinstance(node, Num):
+                elif isinstance(node, (Num, Var)):
                     info = f"{type(node).__name__}: {node.value}"
-                    self.parse_output.insert(tk.END, f"{indent}{info}\n")
-                    self.parse_output.see(tk.END)
-                    self.root.update()
-                    time.sleep(0.1)
-                elif isinstance(node, Var):
-                    info = f"{type(node).__name__}: {node.value}"
-                    self.parse_output.insert(tk.END, f"{indent}{info}\n")
-                    self.parse_output.see(tk.END)
-                    self.root.update()
-                    time.sleep(0.1)
-                elif isinstance(node, Assign):
-                    info = f"{type(node).__name__}"
-                    self.parse_output.insert(tk.END, f"{indent}{info}\n")
-                    self.parse_output.see(tk.END)
-                    self.root.update()
-                    time.sleep(0.1)
-                    print_ast(node.left, level + 1)
-                    print_ast(node.right, level + 1)
-                elif isinstance(node, Print):
-                    info = f"{type(node).__name__}"
-                    self.parse_output.insert(tk.END, f"{indent}{info}\n")
-                    self.parse_output.see(tk.END)
-                    self.root.update()
-                    time.sleep(0.1)
-                    print_ast(node.expr, level + 1)
-                elif isinstance(node, VarDecl):
-                    info = f"{type(node).__name__}"
-                    self.parse_output.insert(tk.END, f"{indent}{info}\n")
-                    self.parse_output.see(tk.END)
-                    self.root.update()
-                    time.sleep(0.1)
-                    print_ast(node.var_node, level + 1)
                 else:
                     info = f"{type(node).__name__}"
-                    self.parse_output.insert(tk.END, f"{indent}{info}\n")
-                    self.parse_output.see(tk.END)
-                    self.root.update()
-                    time.sleep(0.1)
-            if isinstance(self.ast, list):
-                for node in self.ast:
-                    print_ast(node)
-            else:
-                print_ast(self.ast)
+                self.parse_output.insert(tk.END, f"{indent}{info}\n")
+                self.parse_output.see(tk.END)
+                self.root.update()
+                time.sleep(0.1)
             
             # Fase 3: Análisis Semántico
             self.update_progress(66)
@@ -208,7 +161,7 @@ print(x + y);""")
                 self.root.update()
                 time.sleep(0.1)
                 
-                if isinstance(node, (BinOp, Num, Var, Assign, Print, VarDecl)):
+                if isinstance(node, (BinOp, Num, Var, Assign, Print, VarDecl, Block)):
                     semantic_analyzer.visit(node)
             
             analyze_node(self.ast)
@@ -256,11 +209,7 @@ print(x + y);""")
             parser = Parser(lexer)
             self.ast = parser.program()
             
-            def print_ast_step(node, level=0):
-                if isinstance(node, list):
-                    for child in node:
-                        print_ast_step(child, level)
-                    return
+            for _, node, _, level in walk(self.ast):
                 indent = "  " * level
                 # Mostrar tipo y contenido relevante
                 if hasattr(node, 'token') and hasattr(node.token, 'value'):
@@ -275,20 +224,6 @@ print(x + y);""")
                 self.parse_output.see(tk.END)
                 self.root.update()
                 time.sleep(0.5)
-                # Recorrer hijos
-                if hasattr(node, 'left') and hasattr(node, 'right'):
-                    print_ast_step(node.left, level + 1)
-                    print_ast_step(node.right, level + 1)
-                elif hasattr(node, 'expr'):
-                    print_ast_step(node.expr, level + 1)
-                elif hasattr(node, 'var_node'):
-                    print_ast_step(node.var_node, level + 1)
-            
-            if isinstance(self.ast, list):
-                for node in self.ast:
-                    print_ast_step(node)
-            else:
-                print_ast_step(self.ast)
             
             # Fase 3: Análisis Semántico
             self.update_progress(66)
@@ -306,7 +241,7 @@ print(x + y);""")
                 self.root.update()
                 time.sleep(0.5)  # Más lento para paso a paso
                 
-                if isinstance(node, (BinOp, Num, Var, Assign, Print, VarDecl)):
+                if isinstance(node, (BinOp, Num, Var, Assign, Print, VarDecl, Block)):
                     semantic_analyzer.visit(node)
             
             analyze_node_step(self.ast)
@@ -0,0 +1,119 @@
+import sys
+from .parser import Assign, VarDecl
+from .runtime import ExecutionError, OPERATIONS, format_value
+from .walker import NodeVisitor
+
+# Líneas de salida que se acumulan antes de escribirlas juntas
+BUFFER_LINES = 4096
+
+class Interpreter(NodeVisitor):
+    """
+    Evaluador que recorre el AST y ejecuta el programa.
+
+    Necesita un AST ya analizado por SemanticAnalyzer: las variables se
+    leen y escriben por el slot anotado en cada Var y Assign, en la lista
+    `values`, sin buscar nombres. El despacho por tipo de nodo usa las
+    tablas precalculadas de NodeVisitor.
+
+    La salida de print se acumula y se escribe en `output` (por defecto
+    sys.stdout) cada BUFFER_LINES líneas y al terminar. Las operaciones
+    siguen la semántica entera de src/runtime.py; los errores de ejecución
+    se lanzan como ExecutionError con la posición del nodo.
+    """
+
+    # Las asignaciones no evalúan su variable destino; las declaraciones no evalúan nada
+    child_fields = {Assign: ('right',), VarDecl: ()}
+
+    def __init__(self, output=None, buffer_lines=BUFFER_LINES):
+        self.output = output if output is not None else sys.stdout
+        self.buffer_lines = buffer_lines
+        self.buffer = []    # Líneas impresas que todavía no se escribieron
+        self.values = []    # Valor de cada slot (None: variable sin inicializar)
+        self.statements = 0 # Sentencias ejecutadas
+        self.format = format_value  # Conversión a texto de lo impreso
+
+    def flush(self):
+        """Escribe la salida acumulada."""
+        if self.buffer:
+            self.buffer.append('')
+            self.output.write('\n'.join(self.buffer))
+            self.buffer = []
+
+    def visit_Num(self, node):
+        return node.value
+
+    def visit_Var(self, node):
+        value = self.values[node.slot]
+        if value is None:
+            raise ExecutionError(f'Variable no inicializada: {node.value}', node.token)
+        return value
+
+    def visit_BinOp(self, node, left, right):
+        op = node.op
+        try:
+            return OPERATIONS[op.type](left, right)
+        except ExecutionError as error:
+            raise ExecutionError(str(error), op) from None
+
+    def visit_Assign(self, node, value):
+        self.values[node.slot] = value
+        self.statements += 1
+
+    def visit_Print(self, node, value):
+        buffer = self.buffer
+        buffer.append(self.format(value))
+        if len(buffer) >= self.buffer_lines:
+            self.flush()
+        self.statements += 1
+
+    def visit_VarDecl(self, node):
+        slot = node.var_node.slot
+        values = self.values
+        if slot >= len(values):
+            values.extend([None] * (slot + 1 - len(values)))
+        values[slot] = None
+        self.statements += 1
+
+    def visit_Block(self, node, *results):
+        return None
+
+    def run(self, ast):
+        """Ejecuta un programa (una lista de sentencias o una sola) y escribe toda su salida."""
+        statements = ast if isinstance(ast, list) else [ast]
+        try:
+            for node in statements:
+                self.visit(node)
+        finally:
+            # Lo impreso antes de un error de ejecución también se muestra
+            self.flush()
+
+class LimitedInterpreter(Interpreter):
+    """
+    Interpreter que respeta los límites de un runtime.Limits: cuenta cada
+    sentencia como un paso y controla el tamaño de cada operación antes de
+    hacerla. Pensado para ejecutar programas no confiables.
+    """
+
+    def __init__(self, limits, output=None, buffer_lines=BUFFER_LINES):
+        super().__init__(output, buffer_lines)
+        self.limits = limits
+        self.format = limits.format
+
+    def visit_BinOp(self, node, left, right):
+        return self.limits.apply(node.op.type, left, right, node.op)
+
+    def visit_Assign(self, node, value):
+        self.limits.step(node.op)
+        super().visit_Assign(node, value)
+
+    def visit_Print(self, node, value):
+        self.limits.step()
+        super().visit_Print(node, value)
+
+    def visit_VarDecl(self, node):
+        self.limits.step(node.var_node.token)
+        super().visit_VarDecl(node)
+
+    def run(self, ast):
+        self.limits.start()
+        super().run(ast)
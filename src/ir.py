@@ -0,0 +1,360 @@
+import time
+from .lexer import Token, TokenType
+from .parser import Num, Var, BinOp, Assign, Print, VarDecl
+from .walker import NodeVisitor
+
+# Códigos de instrucción
+CONST = 'const'      # value: constante
+LOAD = 'load'        # value: slot (falla si la variable no está inicializada)
+BINARY = 'binary'    # value: TokenType del operador, operands: (izquierdo, derecho)
+STORE = 'store'      # value: slot, operands: (valor,)
+DECLARE = 'declare'  # value: slot
+PRINT = 'print'      # operands: (valor,)
+
+class Instruction:
+    """
+    Instrucción de tres direcciones en forma SSA.
+
+    Cada instrucción define a lo sumo un valor, y sus operandos son las
+    instrucciones que definen los valores que usa (no nombres), así que
+    reemplazar un valor es cambiar a qué instrucción apuntan sus usos.
+    """
+    __slots__ = ('op', 'value', 'operands', 'token')
+
+    def __init__(self, op, value=None, operands=(), token=None):
+        self.op = op
+        self.value = value
+        self.operands = operands
+        self.token = token  # Token VLS del que proviene (posición de los errores)
+
+    def is_pure(self):
+        """Indica si la instrucción puede eliminarse cuando su valor no se usa (no falla ni tiene efectos)."""
+        if self.op == CONST:
+            return True
+        if self.op != BINARY:
+            return False
+        if self.value == TokenType.DIVIDIR:
+            divisor = self.operands[1]
+            return divisor.op == CONST and divisor.value != 0
+        if self.value == TokenType.POTENCIA:
+            exponent = self.operands[1]
+            return exponent.op == CONST and exponent.value >= 0
+        return True
+
+class Program:
+    """Programa en IR: lista de instrucciones y nombre de cada slot."""
+
+    def __init__(self, instructions=None, names=None):
+        self.instructions = instructions if instructions is not None else []
+        self.names = names if names is not None else []
+
+    def __len__(self):
+        return len(self.instructions)
+
+    def dump(self):
+        """Listado legible del programa (un valor %n por instrucción que lo define)."""
+        numbers = {}
+        lines = []
+
+        def slot_name(slot):
+            return f'{self.names[slot]}#{slot}'
+
+        for instruction in self.instructions:
+            operands = ', '.join(f'%{numbers[operand]}' for operand in instruction.operands)
+            op = instruction.op
+            if op == CONST:
+                text = f'const {instruction.value}'
+            elif op == LOAD:
+                text = f'load {slot_name(instruction.value)}'
+            elif op == BINARY:
+                text = f'{instruction.value.name.lower()} {operands}'
+            elif op == STORE:
+                text = f'store {slot_name(instruction.value)}, {operands}'
+            elif op == DECLARE:
+                text = f'declare {slot_name(instruction.value)}'
+            else:
+                text = f'print {operands}'
+            if op in (CONST, LOAD, BINARY):
+                numbers[instruction] = len(numbers)
+                text = f'%{numbers[instruction]} = {text}'
+            token = instruction.token
+            position = f'  ; {token.line}:{token.column}' if token is not None and token.line else ''
+            lines.append(f'    {text}{position}')
+        return '\n'.join(lines)
+
+class IRBuilder(NodeVisitor):
+    """Traduce un AST ya analizado por SemanticAnalyzer a IR, sin optimizar."""
+
+    child_fields = {Assign: ('right',), VarDecl: ()}
+
+    def __init__(self):
+        self.program = Program()
+
+    def emit(self, op, value=None, operands=(), token=None):
+        instruction = Instruction(op, value, operands, token)
+        self.program.instructions.append(instruction)
+        return instruction
+
+    def visit_Num(self, node):
+        return self.emit(CONST, node.value, token=node.token)
+
+    def visit_Var(self, node):
+        return self.emit(LOAD, node.slot, token=node.token)
+
+    def visit_BinOp(self, node, left, right):
+        return self.emit(BINARY, node.op.type, (left, right), node.op)
+
+    def visit_Assign(self, node, value):
+        self.emit(STORE, node.slot, (value,), node.op)
+
+    def visit_Print(self, node, value):
+        self.emit(PRINT, operands=(value,))
+
+    def visit_VarDecl(self, node):
+        var_node = node.var_node
+        names = self.program.names
+        if var_node.slot >= len(names):
+            names.extend([None] * (var_node.slot + 1 - len(names)))
+        names[var_node.slot] = var_node.value
+        self.emit(DECLARE, var_node.slot, token=var_node.token)
+
+    def visit_Block(self, node, *statements):
+        pass
+
+    def build(self, ast):
+        """Construye el Program de un nodo o una lista de sentencias."""
+        for node in (ast if isinstance(ast, list) else [ast]):
+            self.visit(node)
+        return self.program
+
+def build_ir(ast):
+    """Traduce un AST analizado a IR."""
+    return IRBuilder().build(ast)
+
+# Pasadas. Cada una modifica el programa y devuelve cuántos cambios hizo.
+
+def replace_operands(program, replacements):
+    """Hace que los usos de cada instrucción reemplazada apunten a su reemplazo."""
+    def resolve(instruction):
+        while instruction in replacements:
+            instruction = replacements[instruction]
+        return instruction
+
+    for instruction in program.instructions:
+        if instruction.operands:
+            instruction.operands = tuple(resolve(operand) for operand in instruction.operands)
+
+def propagate_copies(program):
+    """
+    Propagación de copias: cada lectura de una variable se reemplaza por el
+    último valor guardado en ella. VLS no tiene saltos, así que ese valor
+    siempre se conoce; sólo quedan las lecturas de variables sin inicializar.
+    """
+    current = {}        # Slot -> instrucción cuyo valor tiene la variable
+    replacements = {}
+    kept = []
+    for instruction in program.instructions:
+        op = instruction.op
+        if op == LOAD and instruction.value in current:
+            replacements[instruction] = current[instruction.value]
+            continue
+        if op == STORE:
+            value = instruction.operands[0]
+            current[instruction.value] = replacements.get(value, value)
+        elif op == DECLARE:
+            current.pop(instruction.value, None)
+        kept.append(instruction)
+    replace_operands(program, replacements)
+    program.instructions = kept
+    return len(replacements)
+
+def reduce_strength(program):
+    """
+    Reducción de fuerza con operandos constantes:
+    x potencia 2 -> x multiplicar x, x multiplicar 2 -> x sumar x, y las
+    identidades x potencia 1, x potencia 0, x multiplicar 1, x multiplicar 0,
+    x sumar 0, x restar 0 y x dividir 1.
+    """
+    replacements = {}
+    changes = 0
+    for instruction in program.instructions:
+        if instruction.op != BINARY:
+            continue
+        left, right = instruction.operands
+        if replacements:
+            left, right = replacements.get(left, left), replacements.get(right, right)
+            instruction.operands = (left, right)
+        if left.op != CONST and right.op != CONST:
+            continue
+        op = instruction.value
+        constant = right.value if right.op == CONST else None
+        left_constant = left.value if left.op == CONST else None
+
+        if op == TokenType.POTENCIA and constant == 2:
+            instruction.value, instruction.operands = TokenType.MULTIPLICAR, (left, left)
+        elif op == TokenType.MULTIPLICAR and (constant == 2 or left_constant == 2):
+            other = left if constant == 2 else right
+            instruction.value, instruction.operands = TokenType.SUMAR, (other, other)
+        elif op == TokenType.POTENCIA and constant == 0:
+            instruction.op, instruction.value, instruction.operands = CONST, 1, ()
+        elif op == TokenType.MULTIPLICAR and (constant == 0 or left_constant == 0):
+            instruction.op, instruction.value, instruction.operands = CONST, 0, ()
+        elif ((op in (TokenType.POTENCIA, TokenType.MULTIPLICAR, TokenType.DIVIDIR) and constant == 1)
+                or (op in (TokenType.SUMAR, TokenType.RESTAR) and constant == 0)):
+            replacements[instruction] = left
+        elif op in (TokenType.MULTIPLICAR, TokenType.SUMAR) and left_constant == (op == TokenType.MULTIPLICAR):
+            # 1 multiplicar x, 0 sumar x
+            replacements[instruction] = right
+        else:
+            continue
+        changes += 1
+    if replacements:
+        replace_operands(program, replacements)
+        program.instructions = [instruction for instruction in program.instructions
+                                if instruction not in replacements]
+    return changes
+
+def eliminate_dead_stores(program):
+    """Elimina las asignaciones cuyo valor nunca se lee antes de la siguiente asignación o del final."""
+    live = set()    # Slots que se leen más adelante sin otra asignación en el medio
+    kept = []
+    removed = 0
+    for instruction in reversed(program.instructions):
+        op = instruction.op
+        if op == LOAD:
+            live.add(instruction.value)
+        elif op == STORE:
+            if instruction.value not in live:
+                removed += 1
+                continue
+            live.discard(instruction.value)
+        elif op == DECLARE:
+            live.discard(instruction.value)
+        kept.append(instruction)
+    kept.reverse()
+    program.instructions = kept
+    return removed
+
+def eliminate_dead_code(program):
+    """Elimina los cálculos cuyo valor no se usa y que no pueden fallar."""
+    uses = {}
+    for instruction in program.instructions:
+        for operand in instruction.operands:
+            uses[operand] = uses.get(operand, 0) + 1
+    kept = []
+    removed = 0
+    for instruction in reversed(program.instructions):
+        if not uses.get(instruction) and instruction.is_pure():
+            removed += 1
+            for operand in instruction.operands:
+                uses[operand] -= 1
+            continue
+        kept.append(instruction)
+    kept.reverse()
+    program.instructions = kept
+    return removed
+
+def remove_unused_variables(program):
+    """Elimina las declaraciones de variables que ya no se leen ni se asignan."""
+    used = {instruction.value for instruction in program.instructions if instruction.op in (LOAD, STORE)}
+    before = len(program.instructions)
+    program.instructions = [instruction for instruction in program.instructions
+                            if instruction.op != DECLARE or instruction.value in used]
+    return before - len(program.instructions)
+
+# Pasadas en orden de ejecución, con la descripción de lo que cuentan
+PASSES = (
+    ('propagación de copias', propagate_copies, 'lecturas reemplazadas'),
+    ('reducción de fuerza', reduce_strength, 'operaciones simplificadas'),
+    ('asignaciones muertas', eliminate_dead_stores, 'asignaciones eliminadas'),
+    ('código muerto', eliminate_dead_code, 'instrucciones eliminadas'),
+    ('variables sin uso', remove_unused_variables, 'declaraciones eliminadas'),
+)
+
+class PassStats:
+    """Resultado de una pasada: cambios hechos, instrucciones antes y después, y duración."""
+    __slots__ = ('name', 'description', 'changes', 'before', 'after', 'seconds')
+
+    def __init__(self, name, description, changes, before, after, seconds):
+        self.name = name
+        self.description = description
+        self.changes = changes
+        self.before = before
+        self.after = after
+        self.seconds = seconds
+
+    def __str__(self):
+        return (f'{self.name}: {self.changes} {self.description} '
+                f'({self.before} -> {self.after} instrucciones, {self.seconds * 1e3:.1f} ms)')
+
+def optimize(program):
+    """Aplica todas las pasadas y devuelve la lista de PassStats."""
+    stats = []
+    for name, function, description in PASSES:
+        before = len(program)
+        start = time.perf_counter()
+        changes = function(program)
+        stats.append(PassStats(name, description, changes, before, len(program),
+                               time.perf_counter() - start))
+    return stats
+
+def lower(program):
+    """
+    Convierte el programa en IR de vuelta a sentencias del AST, con los
+    slots ya anotados, para ejecutarlo con cualquiera de los motores.
+
+    Los valores que pueden fallar (lecturas, divisiones y potencias no
+    garantizadas) y los que se usan más de una vez se guardan en variables
+    temporales en su posición original, así los errores ocurren en el
+    mismo orden. Los demás se escriben directamente donde se usan.
+    """
+    names = list(program.names)
+    uses = {}
+    for instruction in program.instructions:
+        for operand in instruction.operands:
+            uses[operand] = uses.get(operand, 0) + 1
+
+    statements = []
+    expressions = {}    # Instrucción -> nodo del AST que la calcula (o lee su temporal)
+
+    def variable(slot, token):
+        node = Var(Token(TokenType.IDENTIFIER, names[slot], token.line, token.column))
+        node.slot = slot
+        return node
+
+    def assign(slot, value, token):
+        node = Assign(variable(slot, token), Token(TokenType.ASSIGN, '=', token.line, token.column), value)
+        node.slot = slot
+        return node
+
+    for instruction in program.instructions:
+        op = instruction.op
+        token = instruction.token or Token(None, None)
+        if op == CONST:
+            expressions[instruction] = Num(Token(TokenType.NUMBER, instruction.value, token.line, token.column))
+            continue
+        if op == LOAD:
+            node = variable(instruction.value, token)
+        elif op == BINARY:
+            left, right = (expressions[operand] for operand in instruction.operands)
+            # El operador puede haber cambiado en la reducción de fuerza
+            operator = Token(instruction.value, instruction.value.name.lower(), token.line, token.column)
+            node = BinOp(left, operator, right)
+        elif op == STORE:
+            statements.append(assign(instruction.value, expressions[instruction.operands[0]], token))
+            continue
+        elif op == DECLARE:
+            statements.append(VarDecl(variable(instruction.value, token)))
+            continue
+        else:
+            statements.append(Print(expressions[instruction.operands[0]]))
+            continue
+
+        if uses.get(instruction, 0) > 1 or not instruction.is_pure():
+            slot = len(names)
+            names.append(f'_t{slot}')
+            statements.append(VarDecl(variable(slot, token)))
+            statements.append(assign(slot, node, token))
+            node = variable(slot, token)
+        expressions[instruction] = node
+    return statements
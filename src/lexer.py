@@ -1,3 +1,5 @@
+import re
+from array import array
 from enum import Enum, auto
 
 class TokenType(Enum):
@@ -19,97 +21,469 @@ class TokenType(Enum):
     LPAREN = auto()
     RPAREN = auto()
     SEMICOLON = auto()
+    LBRACE = auto()
+    RBRACE = auto()
     EOF = auto()
 
+class LexerError(Exception):
+    """Error léxico con la posición del carácter inválido."""
+    def __init__(self, char, line, column):
+        super().__init__(f'Carácter inválido {char!r} (línea {line}, columna {column})')
+        self.line = line
+        self.column = column
+
 class Token:
-    def __init__(self, type, value):
+    __slots__ = ('type', 'value', 'line', 'column')
+
+    def __init__(self, type, value, line=None, column=None):
         self.type = type
         self.value = value
+        self.line = line        # Línea (desde 1) donde empieza el token
+        self.column = column    # Columna (desde 1) donde empieza el token
 
     def __str__(self):
         return f'Token({self.type}, {self.value})'
 
+# Palabras reservadas y operadores escritos como palabras
+KEYWORDS = {
+    'var': TokenType.VAR,
+    'print': TokenType.PRINT,
+    'sumar': TokenType.SUMAR,
+    'restar': TokenType.RESTAR,
+    'multiplicar': TokenType.MULTIPLICAR,
+    'dividir': TokenType.DIVIDIR,
+    'potencia': TokenType.POTENCIA,
+}
+
+# Símbolos de un solo carácter
+SYMBOLS = {
+    '=': TokenType.ASSIGN,
+    '(': TokenType.LPAREN,
+    ')': TokenType.RPAREN,
+    ';': TokenType.SEMICOLON,
+    '{': TokenType.LBRACE,
+    '}': TokenType.RBRACE,
+}
+
+# Expresión regular maestra: cada grupo con nombre es una clase de token.
+# WS agrupa espacios y comentarios de línea (desde '#' hasta el fin de línea).
+# El grupo ERROR captura cualquier carácter que no pertenezca al lenguaje.
+TOKEN_REGEX = re.compile(r"""
+    (?P<WS>(?:\s+|\#[^\n]*)+)
+  | (?P<NUMBER>\d+)
+  | (?P<NAME>[^\W\d_]\w*)
+  | (?P<SYMBOL>[=();{}])
+  | (?P<ERROR>.)
+""", re.VERBOSE)
+
 class Lexer:
     def __init__(self, text):
         self.text = text
         self.pos = 0
-        self.current_char = self.text[0] if text else None
+        self.line = 1           # Línea actual
+        self.line_start = 0     # Posición donde empieza la línea actual
+
+    def error(self, pos):
+        raise LexerError(self.text[pos], self.line, pos - self.line_start + 1)
+
+    def skip_newlines(self, lexeme, start):
+        """Actualiza el número de línea tras un bloque de espacios o comentarios."""
+        newlines = lexeme.count('\n')
+        if newlines:
+            self.line += newlines
+            self.line_start = start + lexeme.rindex('\n') + 1
+
+    def make_token(self, kind, lexeme, start):
+        """Construye el token correspondiente a un lexema reconocido."""
+        column = start - self.line_start + 1
+        if kind == 'NAME':
+            return Token(KEYWORDS.get(lexeme, TokenType.IDENTIFIER), lexeme, self.line, column)
+        if kind == 'NUMBER':
+            return Token(TokenType.NUMBER, int(lexeme), self.line, column)
+        if kind == 'SYMBOL':
+            return Token(SYMBOLS[lexeme], lexeme, self.line, column)
+        self.error(start)
+
+    def get_next_token(self):
+        """Devuelve el siguiente token del texto (EOF al terminar)."""
+        text = self.text
+        while self.pos < len(text):
+            match = TOKEN_REGEX.match(text, self.pos)
+            start = self.pos
+            self.pos = match.end()
+            kind = match.lastgroup
+            if kind == 'WS':
+                self.skip_newlines(match.group(), start)
+            else:
+                return self.make_token(kind, match.group(), start)
+
+        return Token(TokenType.EOF, None, self.line, self.pos - self.line_start + 1)
+
+    def tokenize(self):
+        """Devuelve la lista completa de tokens, terminada en EOF, en una sola llamada."""
+        tokens = []
+        append = tokens.append
+        keywords = KEYWORDS
+        symbols = SYMBOLS
+        identifier = TokenType.IDENTIFIER
+        number = TokenType.NUMBER
+        line, line_start = self.line, self.line_start
+
+        for match in TOKEN_REGEX.finditer(self.text, self.pos):
+            kind = match.lastgroup
+            lexeme = match.group()
+            if kind == 'WS':
+                if '\n' in lexeme:
+                    line += lexeme.count('\n')
+                    line_start = match.start() + lexeme.rindex('\n') + 1
+                continue
+            column = match.start() - line_start + 1
+            if kind == 'NAME':
+                append(Token(keywords.get(lexeme, identifier), lexeme, line, column))
+            elif kind == 'NUMBER':
+                append(Token(number, int(lexeme), line, column))
+            elif kind == 'SYMBOL':
+                append(Token(symbols[lexeme], lexeme, line, column))
+            else:
+                self.line, self.line_start = line, line_start
+                self.error(match.start())
+
+        self.pos = len(self.text)
+        self.line, self.line_start = line, line_start
+        append(Token(TokenType.EOF, None, line, self.pos - line_start + 1))
+        return tokens
+
+# Tipos de token indexados por su código numérico (TokenType.value)
+TOKEN_TYPES = (None,) + tuple(TokenType)
+
+# Códigos numéricos de palabras clave y símbolos, usados por TokenStream
+KEYWORD_CODES = {name: token_type.value for name, token_type in KEYWORDS.items()}
+SYMBOL_CODES = {symbol: token_type.value for symbol, token_type in SYMBOLS.items()}
+
+class TokenStream:
+    """
+    Secuencia de tokens almacenada en columnas paralelas.
+
+    En lugar de un objeto Token por lexema se guardan el código del tipo,
+    las posiciones de inicio y fin y la línea en arrays compactos. Los
+    identificadores se internan en `names` y cada token NAME guarda su
+    índice en la columna `name_ids`. Los objetos Token sólo se construyen
+    cuando se piden (indexando o con get_next_token()).
+
+    El flujo admite ediciones incrementales (ver edit()). El desplazamiento
+    de los tokens posteriores a una edición se aplica de forma diferida: los
+    tokens con índice >= `shift_index` tienen guardadas posiciones y líneas
+    a las que falta sumar `shift_offset` y `shift_lines`.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.kinds = array('B')     # Código de TokenType
+        self.starts = array('q')    # Posición de inicio en el texto
+        self.ends = array('q')      # Posición de fin (exclusiva)
+        self.lines = array('i')     # Línea (desde 1)
+        self.name_ids = array('i')  # Índice en `names` (-1 si no es un nombre)
+        self.names = []             # Identificadores y palabras clave internados
+        self.name_index = {}        # Nombre -> índice en `names`
+        self.pos = 0                # Cursor usado por get_next_token()
+        self.shift_index = 0        # Primer token con desplazamiento pendiente
+        self.shift_offset = 0       # Desplazamiento pendiente de posiciones
+        self.shift_lines = 0        # Desplazamiento pendiente de líneas
+        self.column_cache = (0, 0)  # Última posición consultada y su inicio de línea
+        self.scan()
+
+    def intern(self, name):
+        """Devuelve el índice del nombre, agregándolo si es nuevo."""
+        index = self.name_index.get(name)
+        if index is None:
+            index = self.name_index[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def scan(self):
+        """Analiza el texto completo y llena las columnas."""
+        text = self.text
+        kinds, starts, ends = self.kinds, self.starts, self.ends
+        lines, name_ids = self.lines, self.name_ids
+        intern = self.intern
+        identifier = TokenType.IDENTIFIER.value
+        number = TokenType.NUMBER.value
+        keyword_codes = KEYWORD_CODES
+        symbol_codes = SYMBOL_CODES
+        line = 1
+
+        for match in TOKEN_REGEX.finditer(text):
+            kind = match.lastgroup
+            if kind == 'WS':
+                line += match.group().count('\n')
+                continue
+            lexeme = match.group()
+            if kind == 'NAME':
+                kinds.append(keyword_codes.get(lexeme, identifier))
+                name_ids.append(intern(lexeme))
+            elif kind == 'NUMBER':
+                kinds.append(number)
+                name_ids.append(-1)
+            elif kind == 'SYMBOL':
+                kinds.append(symbol_codes[lexeme])
+                name_ids.append(-1)
+            else:
+                raise LexerError(lexeme, line, self.column_at(match.start()))
+            starts.append(match.start())
+            ends.append(match.end())
+            lines.append(line)
+
+        kinds.append(TokenType.EOF.value)
+        starts.append(len(text))
+        ends.append(len(text))
+        lines.append(line)
+        name_ids.append(-1)
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def type(self, index):
+        """Devuelve el TokenType del token en `index` sin construir el Token."""
+        return TOKEN_TYPES[self.kinds[index]]
 
-    def error(self):
-        raise Exception('Carácter inválido')
+    def start(self, index):
+        """Posición de inicio del token en `index`."""
+        if index >= self.shift_index:
+            return self.starts[index] + self.shift_offset
+        return self.starts[index]
 
-    def advance(self):
-        self.pos += 1
-        if self.pos > len(self.text) - 1:
-            self.current_char = None
+    def end(self, index):
+        """Posición de fin (exclusiva) del token en `index`."""
+        if index >= self.shift_index:
+            return self.ends[index] + self.shift_offset
+        return self.ends[index]
+
+    def line(self, index):
+        """Línea (desde 1) del token en `index`."""
+        if index >= self.shift_index:
+            return self.lines[index] + self.shift_lines
+        return self.lines[index]
+
+    def column_at(self, pos):
+        """Calcula la columna (desde 1) de una posición del texto."""
+        # Las consultas suelen ser crecientes: sólo se busca desde la anterior
+        cached_pos, line_start = self.column_cache
+        if cached_pos <= pos:
+            newline = self.text.rfind('\n', cached_pos, pos)
+            if newline >= 0:
+                line_start = newline + 1
         else:
-            self.current_char = self.text[self.pos]
-
-    def skip_whitespace(self):
-        while self.current_char is not None and self.current_char.isspace():
-            self.advance()
-
-    def number(self):
-        result = ''
-        while self.current_char is not None and self.current_char.isdigit():
-            result += self.current_char
-            self.advance()
-        return int(result)
-
-    def identifier(self):
-        result = ''
-        while self.current_char is not None and (self.current_char.isalnum() or self.current_char == '_'):
-            result += self.current_char
-            self.advance()
-        return result
+            line_start = self.text.rfind('\n', 0, pos) + 1
+        self.column_cache = (pos, line_start)
+        return pos - line_start + 1
+
+    def column(self, index):
+        """Calcula la columna (desde 1) del token en `index`."""
+        return self.column_at(self.start(index))
+
+    def value(self, index):
+        """Devuelve el valor del token en `index` tal como lo guardaría un Token."""
+        name_id = self.name_ids[index]
+        if name_id >= 0:
+            return self.names[name_id]
+        kind = self.kinds[index]
+        if kind == TokenType.EOF.value:
+            return None
+        lexeme = self.text[self.start(index):self.end(index)]
+        return int(lexeme) if kind == TokenType.NUMBER.value else lexeme
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self.kinds)
+        if not 0 <= index < len(self.kinds):
+            raise IndexError('índice de token fuera de rango')
+        return Token(TOKEN_TYPES[self.kinds[index]], self.value(index),
+                     self.line(index), self.column(index))
+
+    def __iter__(self):
+        for index in range(len(self.kinds)):
+            yield self[index]
 
     def get_next_token(self):
-        while self.current_char is not None:
-            if self.current_char.isspace():
-                self.skip_whitespace()
+        """Devuelve el token bajo el cursor y avanza (EOF se repite al final)."""
+        token = self[self.pos]
+        if self.pos < len(self.kinds) - 1:
+            self.pos += 1
+        return token
+
+    def find_token(self, offset):
+        """Devuelve el índice del primer token que termina en `offset` o después."""
+        low, high = 0, len(self.kinds) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if self.end(middle) < offset:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def move_shift(self, index):
+        """Mueve el inicio del desplazamiento pendiente a `index`."""
+        offset, lines = self.shift_offset, self.shift_lines
+        if offset or lines:
+            starts, ends, token_lines = self.starts, self.ends, self.lines
+            # Los tokens que cambian de lado reciben (o devuelven) el desplazamiento
+            if index > self.shift_index:
+                for i in range(self.shift_index, index):
+                    starts[i] += offset
+                    ends[i] += offset
+                    token_lines[i] += lines
+            else:
+                for i in range(index, self.shift_index):
+                    starts[i] -= offset
+                    ends[i] -= offset
+                    token_lines[i] -= lines
+        self.shift_index = index
+
+    def edit(self, offset, deleted, inserted):
+        """
+        Reemplaza `deleted` caracteres desde `offset` por `inserted` y vuelve
+        a analizar sólo los tokens afectados.
+
+        El análisis empieza en el token que toca la edición y se detiene en
+        cuanto un token nuevo, ya en la parte no editada del texto, ocupa
+        las mismas posiciones (inicio y fin tras el desplazamiento) que uno
+        anterior; a partir de ahí el resto del flujo se conserva. No hace
+        falta comparar la clase: el texto de ese tramo no cambió, así que el
+        token es el mismo. Si aparece un carácter inválido se lanza LexerError y el
+        flujo queda sin cambios.
+
+        Devuelve (primero, fin anterior, fin nuevo): los tokens viejos en
+        [primero, fin anterior) se reemplazaron por los nuevos en
+        [primero, fin nuevo); los siguientes son los mismos de antes,
+        desplazados en índice y posición.
+        """
+        old_text = self.text
+        text = old_text[:offset] + inserted + old_text[offset + deleted:]
+        delta = len(inserted) - deleted
+        edit_end = offset + len(inserted)
+
+        # Primer token afectado y línea en la que empieza el nuevo análisis
+        first = self.find_token(offset)
+        first_start = self.start(first)
+        if first_start <= offset and first < len(self.kinds) - 1:
+            begin, line = first_start, self.line(first)
+        elif first > 0:
+            # La edición cae en espacios o en un comentario (o al final, donde el
+            # EOF puede seguir a un comentario): se analiza desde el fin del token
+            # anterior, así el comentario completo vuelve a ser WS
+            begin, line = self.end(first - 1), self.line(first - 1)
+        else:
+            begin, line = 0, 1
+
+        kinds, starts, ends = array('B'), array('q'), array('q')
+        lines, name_ids = array('i'), array('i')
+        identifier = TokenType.IDENTIFIER.value
+        number = TokenType.NUMBER.value
+        old = first
+        last = len(self.kinds) - 1
+        resync = None
+
+        for match in TOKEN_REGEX.finditer(text, begin):
+            kind = match.lastgroup
+            if kind == 'WS':
+                line += match.group().count('\n')
                 continue
+            start, end = match.span()
+            # En la parte no editada se busca el token anterior equivalente
+            if start >= edit_end:
+                old_start = start - delta
+                while old < last and self.start(old) < old_start:
+                    old += 1
+                if old < last and self.start(old) == old_start and self.end(old) == end - delta:
+                    resync = old
+                    break
+            lexeme = match.group()
+            if kind == 'NAME':
+                kinds.append(KEYWORD_CODES.get(lexeme, identifier))
+                name_ids.append(self.intern(lexeme))
+            elif kind == 'NUMBER':
+                kinds.append(number)
+                name_ids.append(-1)
+            elif kind == 'SYMBOL':
+                kinds.append(SYMBOL_CODES[lexeme])
+                name_ids.append(-1)
+            else:
+                raise LexerError(lexeme, line, start - text.rfind('\n', 0, start))
+            starts.append(start)
+            ends.append(end)
+            lines.append(line)
+
+        if resync is None:
+            # Se llegó al final del texto: sólo queda por conservar el EOF
+            resync = last
+        line_delta = line - self.line(resync)
+
+        # Los tokens desde `resync` se desplazan; los nuevos ocupan [first, resync)
+        self.move_shift(resync)
+        self.shift_offset += delta
+        self.shift_lines += line_delta
+        self.kinds[first:resync] = kinds
+        self.starts[first:resync] = starts
+        self.ends[first:resync] = ends
+        self.lines[first:resync] = lines
+        self.name_ids[first:resync] = name_ids
+        self.shift_index = first + len(kinds)
+        self.text = text
+        self.pos = 0
+        self.column_cache = (0, 0)
+        return first, resync, self.shift_index
+
+# Tamaño del bloque leído por StreamLexer (en caracteres)
+CHUNK_SIZE = 1 << 16
+
+class StreamLexer(Lexer):
+    """
+    Lexer que lee el código fuente por bloques desde un archivo abierto.
+
+    Sólo mantiene en memoria el bloque actual más el lexema incompleto
+    que haya quedado al final del bloque anterior, por lo que el consumo
+    de memoria no depende del tamaño del archivo.
+    """
+
+    def __init__(self, file, chunk_size=CHUNK_SIZE):
+        super().__init__('')
+        self.file = file
+        self.chunk_size = chunk_size
+        self.eof = False
+
+    def read_chunk(self):
+        """Descarta el texto ya analizado y agrega el siguiente bloque del archivo."""
+        chunk = self.file.read(self.chunk_size)
+        self.text = self.text[self.pos:] + chunk
+        self.line_start -= self.pos
+        self.pos = 0
+        self.eof = not chunk
+
+    def get_next_token(self):
+        """Devuelve el siguiente token, leyendo más bloques cuando hace falta."""
+        while True:
+            match = TOKEN_REGEX.match(self.text, self.pos)
+            # Un lexema que termina justo al final del bloque podría continuar en el siguiente
+            if not self.eof and (match is None or match.end() == len(self.text)):
+                self.read_chunk()
+                continue
+            if match is None:
+                return Token(TokenType.EOF, None, self.line, self.pos - self.line_start + 1)
+
+            start = self.pos
+            self.pos = match.end()
+            kind = match.lastgroup
+            if kind == 'WS':
+                self.skip_newlines(match.group(), start)
+            else:
+                return self.make_token(kind, match.group(), start)
 
-            if self.current_char.isdigit():
-                return Token(TokenType.NUMBER, self.number())
-
-            if self.current_char.isalpha():
-                identifier = self.identifier()
-                
-                # Palabras clave
-                if identifier == 'var':
-                    return Token(TokenType.VAR, identifier)
-                elif identifier == 'print':
-                    return Token(TokenType.PRINT, identifier)
-                # Operadores como palabras
-                elif identifier == 'sumar':
-                    return Token(TokenType.SUMAR, identifier)
-                elif identifier == 'restar':
-                    return Token(TokenType.RESTAR, identifier)
-                elif identifier == 'multiplicar':
-                    return Token(TokenType.MULTIPLICAR, identifier)
-                elif identifier == 'dividir':
-                    return Token(TokenType.DIVIDIR, identifier)
-                elif identifier == 'potencia':
-                    return Token(TokenType.POTENCIA, identifier)
-                else:
-                    return Token(TokenType.IDENTIFIER, identifier)
-
-            if self.current_char == '=':
-                self.advance()
-                return Token(TokenType.ASSIGN, '=')
-
-            if self.current_char == '(':
-                self.advance()
-                return Token(TokenType.LPAREN, '(')
-
-            if self.current_char == ')':
-                self.advance()
-                return Token(TokenType.RPAREN, ')')
-
-            if self.current_char == ';':
-                self.advance()
-                return Token(TokenType.SEMICOLON, ';')
-
-            self.error()
-
-        return Token(TokenType.EOF, None) 
\ No newline at end of file
+    def tokenize(self):
+        """Devuelve la lista completa de tokens leyendo todo el archivo."""
+        tokens = []
+        while True:
+            token = self.get_next_token()
+            tokens.append(token)
+            if token.type == TokenType.EOF:
+                return tokens
@@ -1,42 +1,308 @@
+import glob
+import os
 import sys
-from .lexer import Lexer
-from .parser import Parser
+import time
+from .lexer import Lexer, StreamLexer
+from .parser import IterativeParser
+from .optimizer import Optimizer, MAX_FOLD_BITS
 from .semantic import SemanticAnalyzer
-from .tools import DevelopmentTools
+from .runtime import ExecutionError, Limits
+from .cache import CompilationCache, CheckedProgram, Diagnostic
+from .flat_ast import FlatAST
+from .profiling import Profiler, RecordedTokens, phase, count_nodes
 
-def compile_file(file_path, debug=False, visualize=False):
-    """Compila un archivo VLS."""
+# Motores de ejecución disponibles para --run
+BACKENDS = ('ast', 'vm', 'python')
+
+# Los motores de ejecución, la representación intermedia, la ejecución por
+# lotes (NumPy) y las herramientas de desarrollo (graphviz) se importan
+# recién cuando se usan: una compilación simple no paga su carga.
+
+def sorted_errors(*error_lists):
+    """Une las listas de errores y las ordena por posición en el código fuente."""
+    errors = [error for errors in error_lists for error in errors]
+    return sorted(errors, key=lambda error: (error.line or 0, error.column or 0))
+
+def report_errors(errors):
+    """Imprime cada error en una línea."""
+    for error in errors:
+        print(f"Error: {error}")
+
+def compile_stream(file, on_error=None, on_statement=None):
+    """
+    Compila sentencia por sentencia leyendo el archivo por bloques.
+
+    Cada sentencia se optimiza y se analiza semánticamente apenas se
+    reconoce y luego se descarta, de modo que sólo las tablas de símbolos
+    crecen con el programa. `on_error` recibe cada error en cuanto se
+    detecta y `on_statement` cada sentencia (ya optimizada) que pasó el
+    análisis sin errores. Devuelve la lista de errores.
+    """
+    parser = IterativeParser(StreamLexer(file), recover=True)
+    optimizer = Optimizer(recover=True)
+    semantic_analyzer = SemanticAnalyzer(recover=True)
+    errors = []
+    reported = {'parser': 0, 'optimizer': 0, 'semantic': 0}
+
+    def flush(phase, phase_errors):
+        """Emite los errores de una fase agregados desde la última llamada."""
+        new_errors = phase_errors[reported[phase]:]
+        reported[phase] = len(phase_errors)
+        for error in new_errors:
+            errors.append(error)
+            if on_error is not None:
+                on_error(error)
+        return bool(new_errors)
+
+    for node in parser.iter_statements():
+        # Los errores léxicos y sintácticos previos a la sentencia se emiten primero
+        flush('parser', parser.errors)
+        node = optimizer.visit(node)
+        failed = flush('optimizer', optimizer.errors)
+        semantic_analyzer.visit(node)
+        failed = flush('semantic', semantic_analyzer.errors) or failed
+        if not failed and on_statement is not None:
+            on_statement(node)
+    flush('parser', parser.errors)
+    return errors
+
+def run_program(ast, backend='ast', source=None, output=None, limits=None, cache=None, cache_key=None):
+    """
+    Ejecuta un AST ya analizado con el motor indicado.
+
+    - 'ast':    Interpreter, recorriendo el árbol
+    - 'vm':     compila a bytecode y lo ejecuta en la VM
+    - 'python': compila a un objeto código de Python (en caché por `source`)
+
+    `limits` (un runtime.Limits) acota pasos, bits y tiempo; sólo lo
+    admiten los motores 'ast' y 'vm'. Con `cache` (una CompilationCache)
+    el objeto código del motor python se guarda en disco con `cache_key`.
+    """
+    if limits is not None and backend == 'python':
+        raise ValueError("El motor python no admite límites de ejecución (usar 'ast' o 'vm')")
+    if backend == 'ast':
+        from .interpreter import Interpreter, LimitedInterpreter
+        if limits is not None:
+            LimitedInterpreter(limits, output).run(ast)
+        else:
+            Interpreter(output).run(ast)
+    elif backend == 'vm':
+        from .bytecode import VM, compile_ast
+        VM(output, limits=limits).run(compile_ast(ast))
+    elif backend == 'python':
+        from .pybackend import compile_program
+        program = cache.get(cache_key) if cache is not None else None
+        if program is None:
+            program = compile_program(ast, key=source)
+            if cache is not None:
+                cache.put(cache_key, program)
+        program.run(output)
+    else:
+        raise ValueError(f"Motor desconocido: {backend} (opciones: {', '.join(BACKENDS)})")
+
+class CompilationResult:
+    """
+    Resultado de compile_source.
+
+    - ast:         sentencias analizadas (objetos, o vistas de FlatAST si vienen de la caché)
+    - diagnostics: un cache.Diagnostic por error, ordenados por posición
+    - stats:       (operaciones plegadas, constantes propagadas, nodos eliminados)
+    - timings:     segundos de cada fase ('parser' incluye el análisis léxico)
+    - cached:      True si el resultado salió de la caché
+    """
+
+    def __init__(self, ast, diagnostics, stats, timings, cached=False):
+        self.ast = ast
+        self.diagnostics = diagnostics
+        self.stats = stats
+        self.timings = timings
+        self.cached = cached
+
+    @property
+    def ok(self):
+        return not self.diagnostics
+
+def compile_source(source, fold_bits=MAX_FOLD_BITS, cache=None, visualize=None, profiler=None):
+    """
+    Análisis léxico, sintáctico, optimización y análisis semántico de un
+    código fuente; devuelve un CompilationResult sin imprimir nada.
+
+    Con `cache` (una CompilationCache), un código fuente ya compilado con
+    el mismo compilador se toma de la caché sin repetir ninguna fase.
+    `visualize`, si se indica, recibe el AST recién parseado (y entonces
+    no se usa la caché, que sólo guarda el AST analizado).
+    Con `profiler` (un profiling.Profiler) se miden las fases léxica,
+    sintáctica, de optimización y semántica por separado; tampoco se usa
+    la caché, para medir la compilación completa.
+    """
+    timings = {}
+    if visualize is not None or profiler is not None:
+        cache = None
+    if cache is not None:
+        start = time.perf_counter()
+        key = cache.key(source, f'fold_bits={fold_bits}')
+        checked = cache.get(key)
+        timings['cache'] = time.perf_counter() - start
+        if checked is not None:
+            return CompilationResult(checked.ast(), checked.errors, checked.stats, timings, cached=True)
+    
+    # Al perfilar, el análisis léxico se hace entero antes, para medirlo aparte
+    lexer = Lexer(source)
+    if profiler is not None:
+        with profiler.phase('lexer', tokens=lambda: len(lexer), errors=lambda: lexer.errors):
+            lexer = RecordedTokens(lexer)
+    
+    # Análisis sintáctico, con el léxico a demanda (con recuperación: se reportan todos los errores)
+    start = time.perf_counter()
+    # (los errores léxicos también quedan en parser.errors: se cuentan en su fase)
+    with phase(profiler, 'parser', nodes=lambda: count_nodes(ast), errors=lambda: len(parser.errors) - lexer.errors):
+        parser = IterativeParser(lexer, recover=True)
+        ast = parser.program()
+    timings['parser'] = time.perf_counter() - start
+    if visualize is not None:
+        visualize(ast)
+    
+    # Optimización: plegado y propagación de constantes
+    start = time.perf_counter()
+    with phase(profiler, 'optimizer', nodes=lambda: count_nodes(ast), folded=lambda: optimizer.folded,
+               errors=lambda: len(optimizer.errors)):
+        optimizer = Optimizer(recover=True, max_bits=fold_bits)
+        ast = optimizer.optimize(ast)
+    timings['optimizer'] = time.perf_counter() - start
+    
+    # Análisis semántico
+    start = time.perf_counter()
+    with phase(profiler, 'semantic', symbols=lambda: len(semantic_analyzer.symbol_table.slots),
+               errors=lambda: len(semantic_analyzer.errors)):
+        semantic_analyzer = SemanticAnalyzer(recover=True)
+        semantic_analyzer.analyze(ast)
+    timings['semantic'] = time.perf_counter() - start
+    
+    errors = sorted_errors(parser.errors, optimizer.errors, semantic_analyzer.errors)
+    diagnostics = [Diagnostic.from_error(error) for error in errors]
+    stats = (optimizer.folded, optimizer.propagated, optimizer.eliminated)
+    if cache is not None:
+        # Se guarda en forma plana, así serializar no es recursivo
+        start = time.perf_counter()
+        tree, statements = FlatAST.from_nodes(ast) if not errors else (FlatAST(), [])
+        cache.put(key, CheckedProgram(tree, [statement.index for statement in statements], diagnostics, stats))
+        timings['cache'] += time.perf_counter() - start
+    return CompilationResult(ast, diagnostics, stats, timings)
+
+def compile_file(file_path, debug=False, visualize=False, stream=False, run=False, backend='ast',
+                 emit_ir=False, use_ir=False, inputs=None, overflow='python', output_path=None,
+                 limits=None, cache=None, profiler=None):
+    """
+    Compila un archivo VLS y, si `run` es True, lo ejecuta con el motor `backend`.
+
+    `emit_ir` imprime la representación intermedia optimizada y las
+    estadísticas de cada pasada; `use_ir` ejecuta el programa obtenido de
+    esa representación en lugar del AST. Con `inputs` (un CSV o .npy) el
+    programa se ejecuta por lotes, una vez por fila, y lo impreso se escribe
+    como tabla en `output_path` (o en la salida estándar). `limits` (un
+    runtime.Limits) acota los recursos de la ejecución. Con `cache` (una
+    CompilationCache) un código fuente ya compilado no vuelve a analizarse.
+    Con `profiler` (un profiling.Profiler) se miden las fases de la
+    compilación y, si las hay, la representación intermedia y la ejecución.
+    """
     try:
-        # Inicializar herramientas de desarrollo
-        tools = DevelopmentTools()
+        # Inicializar herramientas de desarrollo (sólo si se pidieron)
+        tools = None
+        if debug or visualize:
+            from .tools import DevelopmentTools
+            tools = DevelopmentTools()
         if debug:
             tools.start_debug()
         
+        # Modo streaming: el archivo se lee por bloques y no se construye el AST completo
+        if stream:
+            if visualize:
+                print("Aviso: --visualize no está disponible con --stream")
+            if run:
+                print("Aviso: --run no está disponible con --stream")
+            if emit_ir or use_ir:
+                print("Aviso: --emit-ir y --ir no están disponibles con --stream")
+            if inputs:
+                print("Aviso: --inputs no está disponible con --stream")
+            if profiler is not None:
+                print("Aviso: --profile no está disponible con --stream")
+            with open(file_path, 'r') as file:
+                errors = compile_stream(file, on_error=lambda error: report_errors([error]))
+            if debug:
+                tools.stop_debug()
+            if errors:
+                return False
+            print("Compilación exitosa!")
+            return True
+
         # Leer el archivo fuente
         with open(file_path, 'r') as file:
             source = file.read()
         
-        # Análisis léxico
-        lexer = Lexer(source)
-        
-        # Análisis sintáctico
-        parser = Parser(lexer)
-        ast = parser.program()
+        # Con límites de ejecución, tampoco se pliegan constantes más grandes que max_bits
+        fold_bits = MAX_FOLD_BITS
+        if limits is not None and limits.max_bits is not None:
+            fold_bits = min(fold_bits, limits.max_bits)
         
-        # Visualizar AST si se solicita
-        if visualize:
-            tools.visualize_ast(ast)
-        
-        # Análisis semántico
-        semantic_analyzer = SemanticAnalyzer()
-        semantic_analyzer.analyze(ast)
+        options = f'fold_bits={fold_bits}'
+        result = compile_source(source, fold_bits, cache, tools.visualize_ast if visualize else None, profiler)
+        ast, errors, stats = result.ast, result.diagnostics, result.stats
         
         # Si estamos en modo debug, exportar el gráfico de ejecución
         if debug:
+            print(f"Optimización: {stats[0]} operaciones plegadas, "
+                  f"{stats[1]} constantes propagadas, "
+                  f"{stats[2]} nodos eliminados")
+            if 'cache' in result.timings:
+                print(f"Caché: {'acierto' if result.cached else 'fallo'}")
             tools.export_execution_graph()
             tools.stop_debug()
         
-        print("Compilación exitosa!")
+        if errors:
+            report_errors(errors)
+            return False
+        
+        # Representación intermedia: propagación de copias, reducción de fuerza
+        # y eliminación de asignaciones, código y variables muertas
+        if emit_ir or use_ir:
+            from . import ir
+            with phase(profiler, 'ir', instructions=lambda: len(program)):
+                program = ir.build_ir(ast)
+                stats = ir.optimize(program)
+            if emit_ir:
+                print(program.dump())
+                for pass_stats in stats:
+                    print(f"; {pass_stats}")
+            if use_ir:
+                ast = ir.lower(program)
+                options += ';ir'  # Otra entrada en las cachés del motor python
+        
+        # Ejecución por lotes: una columna por variable de entrada
+        if inputs:
+            if limits is not None:
+                print("Aviso: los límites de ejecución no se aplican con --inputs")
+            from .batch import run_batch
+            try:
+                with phase(profiler, 'run'):
+                    run_batch(ast, inputs, overflow, output_path)
+            except ExecutionError as e:
+                print(f"Error: {e}")
+                return False
+            return True
+        
+        # Ejecución: la salida del programa reemplaza al mensaje de éxito
+        if run:
+            try:
+                python_key = cache.key(source, options + ';python') if cache is not None and backend == 'python' else None
+                with phase(profiler, 'run'):
+                    run_program(ast, backend, (options, source), limits=limits, cache=cache, cache_key=python_key)
+            except ExecutionError as e:
+                print(f"Error: {e}")
+                return False
+            return True
+        
+        if not emit_ir:
+            print("Compilación exitosa!")
         return True
         
     except FileNotFoundError:
@@ -48,18 +314,92 @@ def compile_file(file_path, debug=False, visualize=False):
 
 def generate_example(concept):
     """Genera un ejemplo de código para un concepto específico."""
+    from .tools import DevelopmentTools
     tools = DevelopmentTools()
     example = tools.generate_example(concept)
     print(f"\nEjemplo de {concept}:")
     print(example)
     return example
 
+def compile_batch(arguments):
+    """
+    Compila en paralelo los archivos de `arguments` (archivos, directorios
+    o patrones glob) y escribe el resumen en JSON. Devuelve el código de
+    salida: 1 si algún archivo tiene errores o no se encontró ninguno.
+    """
+    # Sólo este modo necesita el pool de procesos
+    from .parallel import available_cores, expand_paths, compile_many, write_summary
+    jobs = None
+    summary = None
+    cache_dir = None
+    for arg in sys.argv[1:]:
+        if arg.startswith('--jobs='):
+            try:
+                jobs = int(arg[len('--jobs='):])
+            except ValueError:
+                jobs = 0
+            if jobs < 1:
+                print(f"Error: Valor inválido en {arg}")
+                return 1
+        elif arg.startswith('--summary='):
+            summary = arg[len('--summary='):]
+        elif arg.startswith('--cache-dir='):
+            cache_dir = arg[len('--cache-dir='):]
+    jobs = jobs or available_cores()
+    paths = expand_paths(arguments)
+    if not paths:
+        print("Error: No se encontraron archivos .vls")
+        return 1
+    start = time.perf_counter()
+    results = compile_many(paths, jobs, cache_dir, use_cache='--no-cache' not in sys.argv)
+    seconds = time.perf_counter() - start
+    write_summary(results, summary, seconds, jobs)
+    failed = sum(result['status'] != 'ok' for result in results)
+    if summary is not None:
+        print(f"{len(results)} archivos compilados en {seconds:.2f} s, {failed} con errores")
+    return 1 if failed else 0
+
+def print_usage():
+    print("Uso: python main.py <archivo.vls> [--debug] [--visualize] [--stream] [--run] [--backend=ast|vm|python]")
+    print("                                [--emit-ir] [--ir]")
+    print("                                [--inputs=datos.csv|datos.npy] [--overflow=python|error] [--output=archivo]")
+    print("                                [--max-steps=N] [--max-bits=N] [--timeout=segundos]")
+    print("                                [--cache-dir=directorio] [--no-cache]")
+    print("                                [--profile[=métricas.json]] [--profile-dir=directorio]")
+    print("     python main.py <archivos, directorios o patrones>... [--jobs=N] [--summary=resumen.json|resumen.jsonl]")
+    print("                                [--cache-dir=directorio] [--no-cache]")
+    print("     python main.py --daemon [--socket=ruta] [--jobs=N]")
+    print("     python main.py --example <concepto>")
+
 def main():
     if len(sys.argv) < 2:
-        print("Uso: python main.py <archivo.vls> [--debug] [--visualize]")
-        print("     python main.py --example <concepto>")
+        print_usage()
         sys.exit(1)
     
+    if sys.argv[1] == '--daemon':
+        # Demonio de compilación en un socket Unix (cliente: python -m src.client)
+        from .daemon import serve
+        from .client import DEFAULT_SOCKET
+        path = DEFAULT_SOCKET
+        jobs = None
+        for arg in sys.argv[2:]:
+            if arg.startswith('--socket='):
+                path = arg[len('--socket='):]
+            elif arg.startswith('--jobs='):
+                try:
+                    jobs = int(arg[len('--jobs='):])
+                except ValueError:
+                    jobs = 0
+                if jobs < 1:
+                    print(f"Error: Valor inválido en {arg}")
+                    sys.exit(1)
+        try:
+            serve(path, jobs)
+        except (RuntimeError, OSError) as error:
+            print(f"Error: {error}")
+            sys.exit(1)
+        sys.exit(0)
+    
     if sys.argv[1] == '--example':
         if len(sys.argv) != 3:
             print("Uso: python main.py --example <concepto>")
@@ -68,7 +408,16 @@ def main():
         generate_example(sys.argv[2])
         sys.exit(0)
     
-    file_path = sys.argv[1]
+    # Varios archivos, un directorio o un patrón: compilación en paralelo
+    paths = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    if not paths:
+        print_usage()
+        sys.exit(1)
+    if (len(paths) > 1 or os.path.isdir(paths[0]) or glob.has_magic(paths[0])
+            or any(arg.startswith(('--jobs=', '--summary=')) for arg in sys.argv[1:])):
+        sys.exit(compile_batch(paths))
+    
+    file_path = paths[0]
     if not file_path.endswith('.vls'):
         print("Error: El archivo debe tener extensión .vls")
         sys.exit(1)
@@ -76,9 +425,72 @@ def main():
     # Procesar opciones
     debug = '--debug' in sys.argv
     visualize = '--visualize' in sys.argv
+    stream = '--stream' in sys.argv
+    run = '--run' in sys.argv
+    emit_ir = '--emit-ir' in sys.argv
+    use_ir = '--ir' in sys.argv
+    backend = 'ast'
+    inputs = None
+    overflow = 'python'
+    output_path = None
+    cache_dir = None
+    profile = '--profile' in sys.argv
+    profile_path = None
+    profile_dir = None
+    limit_options = {'--max-steps=': int, '--max-bits=': int, '--timeout=': float}
+    limit_values = {}
+    for arg in sys.argv[1:]:
+        for prefix, convert in limit_options.items():
+            if arg.startswith(prefix):
+                try:
+                    limit_values[prefix.strip('-=').replace('-', '_')] = convert(arg[len(prefix):])
+                except ValueError:
+                    print(f"Error: Valor inválido en {arg}")
+                    sys.exit(1)
+        if arg.startswith('--cache-dir='):
+            cache_dir = arg[len('--cache-dir='):]
+        elif arg.startswith('--profile='):
+            profile_path = arg[len('--profile='):]
+            profile = True
+        elif arg.startswith('--profile-dir='):
+            profile_dir = arg[len('--profile-dir='):]
+            profile = True  # Los archivos de cProfile implican las métricas
+        elif arg.startswith('--inputs='):
+            inputs = arg[len('--inputs='):]
+        elif arg.startswith('--output='):
+            output_path = arg[len('--output='):]
+        elif arg.startswith('--overflow='):
+            from .batch import OVERFLOW_POLICIES
+            overflow = arg[len('--overflow='):]
+            if overflow not in OVERFLOW_POLICIES:
+                print(f"Error: Política de desbordamiento desconocida {overflow!r} "
+                      f"(opciones: {', '.join(OVERFLOW_POLICIES)})")
+                sys.exit(1)
+        elif arg.startswith('--backend='):
+            backend = arg[len('--backend='):]
+            if backend not in BACKENDS:
+                print(f"Error: Motor desconocido {backend!r} (opciones: {', '.join(BACKENDS)})")
+                sys.exit(1)
+            run = True  # Elegir un motor implica ejecutar
+    
+    limits = None
+    if limit_values:
+        limits = Limits(**limit_values)
+        run = True  # Los límites sólo tienen sentido al ejecutar
+        if backend == 'python':
+            print("Aviso: el motor python no admite límites de ejecución; se usa vm")
+            backend = 'vm'
+    
+    cache = None if '--no-cache' in sys.argv else CompilationCache(cache_dir)
+    
+    # Métricas de cada fase: un registro JSON en stderr o en el archivo de --profile=
+    profiler = Profiler(profile_dir=profile_dir) if profile else None
     
-    success = compile_file(file_path, debug, visualize)
+    success = compile_file(file_path, debug, visualize, stream, run, backend, emit_ir, use_ir,
+                           inputs, overflow, output_path, limits, cache, profiler)
+    if profiler is not None:
+        profiler.write(profile_path, file=file_path, ok=success)
     sys.exit(0 if success else 1)
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
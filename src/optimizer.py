@@ -0,0 +1,129 @@
+from .lexer import Token, TokenType
+from .parser import NodeFactory, Num, Assign, VarDecl
+from .semantic import SemanticError, Symbol, SymbolTable
+from .runtime import ExecutionError, apply, minimum_bits
+from .walker import NodeVisitor
+
+# Tamaño máximo (en bits) estimado de una potencia que se calcula en compilación.
+# Las más grandes se dejan para la ejecución en lugar de inflar el AST.
+MAX_FOLD_BITS = 4096
+
+class Optimizer(NodeVisitor):
+    """
+    Plegado y propagación de constantes, entre el análisis sintáctico y el semántico.
+
+    - Cada BinOp cuyos operandos son números se reemplaza por un Num con
+      su resultado, calculado con la semántica de src/runtime.py.
+    - VLS no tiene saltos: todas las sentencias se ejecutan en orden, así
+      que el valor constante asignado a una variable declarada se propaga
+      a los usos siguientes hasta la próxima asignación. Los ámbitos de
+      los bloques se respetan con la misma SymbolTable que el análisis
+      semántico. Las variables no declaradas no se tocan: ese error lo
+      reporta SemanticAnalyzer.
+    - Una división cuyo divisor es 0 seguro (o una potencia con exponente
+      negativo) se reporta como SemanticError.
+
+    Los nodos originales no se modifican (pueden estar compartidos); los
+    nuevos se crean con `factory`, que debe ser el FlatAST del árbol si el
+    AST es plano. `folded`, `propagated` y `eliminated` cuentan las
+    operaciones plegadas, las variables reemplazadas por su valor y los
+    nodos que el AST resultante tiene de menos.
+    """
+
+    # Los destinos de asignaciones y declaraciones no se reemplazan por su valor
+    child_fields = {VarDecl: (), Assign: ('right',)}
+
+    def __init__(self, factory=None, recover=False, max_bits=MAX_FOLD_BITS):
+        self.factory = factory if factory is not None else NodeFactory()
+        self.max_bits = max_bits  # Tamaño máximo de una constante plegada
+        self.symbol_table = SymbolTable()
+        self.recover = recover  # Si es True, los errores se registran en vez de lanzarse
+        self.errors = []        # Errores semánticos registrados
+        self.folded = 0
+        self.propagated = 0
+        self.eliminated = 0
+
+    def error(self, message, token=None):
+        """Lanza un SemanticError o, en modo recuperación, lo registra y continúa."""
+        error = SemanticError(message, token)
+        if not self.recover:
+            raise error
+        self.errors.append(error)
+
+    def number(self, value, token):
+        """Crea un Num con `value` en la posición de `token`."""
+        return self.factory.num(Token(TokenType.NUMBER, value, token.line, token.column))
+
+    def too_large(self, op_type, left, right):
+        """Indica si el resultado de la operación sería demasiado grande para plegarla."""
+        return minimum_bits(op_type, left, right) > self.max_bits
+
+    def visit_Num(self, node):
+        return node
+
+    def visit_Var(self, node):
+        symbol = self.symbol_table.lookup(node.value)
+        if symbol is None or symbol.value is None:
+            return node
+        self.propagated += 1
+        return self.number(symbol.value, node.token)
+
+    def visit_BinOp(self, node, left, right):
+        op = node.op
+        left_value = left.value if isinstance(left, Num) else None
+        right_value = right.value if isinstance(right, Num) else None
+
+        if op.type == TokenType.DIVIDIR and right_value == 0:
+            # El error ocurre siempre, se conozca o no el dividendo
+            self.error('División por cero', op)
+        elif (left_value is not None and right_value is not None
+                and not self.too_large(op.type, left_value, right_value)):
+            try:
+                value = apply(op.type, left_value, right_value)
+            except ExecutionError as error:
+                self.error(str(error), op)
+            else:
+                # La cota puede subestimar el tamaño: lo que no entra queda para la ejecución
+                if value.bit_length() <= self.max_bits:
+                    self.folded += 1
+                    self.eliminated += 2  # BinOp(Num, Num) -> Num
+                    return self.number(value, op)
+
+        if left is node.left and right is node.right:
+            return node
+        return self.factory.bin_op(left, op, right)
+
+    def visit_Assign(self, node, value):
+        symbol = self.symbol_table.lookup(node.left.value)
+        if symbol is not None:
+            symbol.value = value.value if isinstance(value, Num) else None
+        if value is node.right:
+            return node
+        return self.factory.assign(node.left, node.op, value)
+
+    def visit_Print(self, node, expr):
+        if expr is node.expr:
+            return node
+        return self.factory.print(expr)
+
+    def visit_VarDecl(self, node):
+        name = node.var_node.value
+        # Una redeclaración en el mismo ámbito es un error semántico y no declara nada
+        if self.symbol_table.lookup_current_scope(name) is None:
+            self.symbol_table.define(Symbol(name, int))
+        return node
+
+    def enter_Block(self, node):
+        self.symbol_table.enter_scope()
+
+    def visit_Block(self, node, *statements):
+        self.symbol_table.exit_scope()
+        if all(new is old for new, old in zip(statements, node.statements)):
+            return node
+        return self.factory.block(node.token, list(statements))
+
+    def optimize(self, ast):
+        """Optimiza un nodo o una lista de sentencias y devuelve el resultado."""
+        if isinstance(ast, list):
+            return [self.visit(node) for node in ast]
+        return self.visit(ast)
@@ -0,0 +1,98 @@
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from .main import compile_source
+from .optimizer import MAX_FOLD_BITS
+from .cache import CompilationCache
+
+# Tareas por proceso que recibe cada envío al pool (menos viajes entre procesos)
+TASKS_PER_CHUNK = 16
+
+def available_cores():
+    """Núcleos que este proceso puede usar."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def expand_paths(arguments):
+    """
+    Archivos .vls a compilar: cada argumento puede ser un archivo, un
+    directorio (se recorre recursivamente) o un patrón glob. El orden es
+    el de los argumentos y, dentro de cada uno, alfabético; sin repetidos.
+    """
+    paths = []
+    for argument in arguments:
+        if os.path.isdir(argument):
+            found = glob.glob(os.path.join(argument, '**', '*.vls'), recursive=True)
+        elif glob.has_magic(argument):
+            found = glob.glob(argument, recursive=True)
+        else:
+            found = [argument]
+        paths.extend(sorted(found))
+    return list(dict.fromkeys(paths))
+
+def compile_path(path, cache_dir=None, use_cache=True, fold_bits=MAX_FOLD_BITS):
+    """Compila un archivo y devuelve su resumen (un dict serializable a JSON)."""
+    start = time.perf_counter()
+    timings = {}
+    try:
+        with open(path, 'r') as file:
+            source = file.read()
+        timings['read'] = time.perf_counter() - start
+        cache = CompilationCache(cache_dir) if use_cache else None
+        result = compile_source(source, fold_bits, cache)
+        timings.update(result.timings)
+        status = 'ok' if result.ok else 'error'
+        diagnostics = [diagnostic.to_dict() for diagnostic in result.diagnostics]
+        cached = result.cached
+    except Exception as error:
+        # Archivo ilegible o error interno: se informa como diagnóstico del archivo
+        status = 'error'
+        diagnostics = [{'kind': type(error).__name__, 'message': str(error), 'line': None, 'column': None}]
+        cached = False
+    timings['total'] = time.perf_counter() - start
+    return {'file': path, 'status': status, 'diagnostics': diagnostics, 'cached': cached,
+            'timings': {phase: round(seconds, 6) for phase, seconds in timings.items()}}
+
+def _compile_task(task):
+    return compile_path(*task)
+
+def compile_many(paths, jobs=None, cache_dir=None, use_cache=True, fold_bits=MAX_FOLD_BITS):
+    """
+    Compila muchos archivos en un ProcessPoolExecutor de `jobs` procesos
+    (por defecto, uno por núcleo disponible). Devuelve los resúmenes en el
+    mismo orden que `paths`. Con un solo proceso se compila sin pool.
+    """
+    jobs = jobs or available_cores()
+    tasks = [(path, cache_dir, use_cache, fold_bits) for path in paths]
+    if jobs == 1 or len(tasks) <= 1:
+        return [_compile_task(task) for task in tasks]
+    # Envíos de varias tareas: con decenas de miles de archivos el costo de
+    # comunicación por tarea sería comparable al de compilar uno chico.
+    chunksize = max(1, min(TASKS_PER_CHUNK, len(tasks) // (jobs * 4)))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(_compile_task, tasks, chunksize=chunksize))
+
+def write_summary(results, path=None, seconds=None, jobs=None):
+    """
+    Escribe el resumen: un objeto JSON si `path` termina en .json, o JSON
+    Lines (un archivo por línea) en `path` o, si no se indica, en la salida
+    estándar.
+    """
+    if path is not None and path.endswith('.json'):
+        failed = sum(result['status'] != 'ok' for result in results)
+        summary = {'files': len(results), 'failed': failed, 'jobs': jobs,
+                   'seconds': round(seconds, 6) if seconds is not None else None, 'results': results}
+        with open(path, 'w') as file:
+            json.dump(summary, file, ensure_ascii=False, indent=2)
+            file.write('\n')
+        return
+    lines = ''.join(json.dumps(result, ensure_ascii=False) + '\n' for result in results)
+    if path is None:
+        print(lines, end='')
+    else:
+        with open(path, 'w') as file:
+            file.write(lines)
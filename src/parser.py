@@ -1,4 +1,15 @@
-from .lexer import TokenType, Token
+import bisect
+
+from .lexer import TokenType, Token, TokenStream, LexerError
+
+class ParserError(Exception):
+    """Error de sintaxis con la posición del token donde se detectó."""
+    def __init__(self, message, token=None):
+        self.line = token.line if token is not None else None
+        self.column = token.column if token is not None else None
+        if self.line is not None:
+            message = f'{message} (línea {self.line}, columna {self.column})'
+        super().__init__(f'Error de sintaxis: {message}')
 
 # Clase base para todos los nodos del Árbol de Sintaxis Abstracta (AST)
 class AST:
@@ -23,6 +34,8 @@ class Num(AST):
 # Nodo para representar variables
 class Var(AST):
     """Nodo para variables."""
+    slot = None  # Slot de la variable; lo asigna el análisis semántico
+
     def __init__(self, token):
         self.token = token    # Token que contiene el nombre de la variable
         self.value = token.value  # Nombre de la variable
@@ -30,6 +43,8 @@ class Var(AST):
 # Nodo para representar asignaciones de variables
 class Assign(AST):
     """Nodo para asignaciones."""
+    slot = None  # Slot de la variable asignada; lo asigna el análisis semántico
+
     def __init__(self, left, op, right):
         self.left = left      # Nodo de la variable a asignar
         self.token = self.op = op  # Token del operador de asignación (=)
@@ -47,14 +62,214 @@ class VarDecl(AST):
     def __init__(self, var_node):
         self.var_node = var_node  # Nodo de la variable declarada
 
+# Nodo para representar bloques de sentencias
+class Block(AST):
+    """Nodo para bloques { ... }: las variables declaradas adentro sólo existen en el bloque."""
+    def __init__(self, token, statements):
+        self.token = token            # Token '{' que abre el bloque
+        self.statements = statements  # Lista de sentencias del bloque
+
+# Campos que contienen los hijos de cada clase de nodo, en orden de recorrido.
+# Un campo puede contener un nodo o una lista de nodos.
+CHILD_FIELDS = {
+    BinOp: ('left', 'right'),
+    Num: (),
+    Var: (),
+    Assign: ('left', 'right'),
+    Print: ('expr',),
+    VarDecl: ('var_node',),
+    Block: ('statements',),
+}
+
+def lookup_class(table, cls, default=None):
+    """Busca `cls` en `table` recorriendo su jerarquía (acepta subclases como las vistas de FlatAST)."""
+    for base in cls.__mro__:
+        if base in table:
+            return table[base]
+    return default
+
+def child_nodes(node):
+    """Devuelve los hijos directos de un nodo del AST."""
+    children = []
+    for field in lookup_class(CHILD_FIELDS, type(node), ()):
+        child = getattr(node, field)
+        if isinstance(child, list):
+            children.extend(child)
+        else:
+            children.append(child)
+    return children
+
+def node_tokens(node):
+    """Devuelve todos los tokens que guarda un subárbol."""
+    tokens = []
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        token = getattr(node, 'token', None)
+        if token is not None:
+            tokens.append(token)
+        stack.extend(child_nodes(node))
+    return tokens
+
+class NodeFactory:
+    """
+    Fábrica de nodos usada por Parser.
+
+    Parser nunca instancia los nodos directamente: llama a estos métodos,
+    de modo que otras representaciones del AST (por ejemplo FlatAST)
+    pueden construirse durante el análisis sintáctico.
+    """
+
+    def bin_op(self, left, op, right):
+        return BinOp(left, op, right)
+
+    def num(self, token):
+        return Num(token)
+
+    def var(self, token):
+        return Var(token)
+
+    def assign(self, left, op, right):
+        return Assign(left, op, right)
+
+    def print(self, expr):
+        return Print(expr)
+
+    def var_decl(self, var_node):
+        return VarDecl(var_node)
+
+    def block(self, token, statements):
+        return Block(token, statements)
+
+class HashConsingFactory(NodeFactory):
+    """
+    Fábrica que comparte los subárboles de expresión estructuralmente iguales.
+
+    Las expresiones de VLS no tienen efectos secundarios, así que dos
+    apariciones de `(x sumar y)` pueden ser el mismo nodo. Los números se
+    internan por valor, las variables por nombre y cada BinOp por su
+    operador y la identidad de sus hijos (ya compartidos). Los destinos de
+    asignaciones y declaraciones no se comparten.
+
+    Los nodos compartidos conservan el token de su primera aparición en el
+    código fuente, por lo que los errores que se reporten sobre ellos
+    indican esa posición. El orden en que se internan no es ese: una
+    variable se interna al reducir la operación que la usa, y en
+    `x sumar (y multiplicar x)` la segunda `x` se reduce antes; por eso al
+    reutilizar un nodo se le pasa el token de la aparición si está antes.
+
+    Un mismo nombre puede referirse a variables distintas (una declaración
+    dentro de un bloque oculta a la de afuera), y el análisis semántico
+    anota cada Var con su slot. Por eso la clave de una variable incluye
+    una generación que cambia con cada declaración y al cerrar cada
+    bloque: dos apariciones sólo comparten nodo si entre ellas no cambió
+    qué variable designa el nombre.
+    """
+
+    def __init__(self):
+        self.table = {}     # Clave estructural -> nodo compartido
+        self.shared = 0     # Nodos reutilizados en lugar de crearse
+        self.generation = 0 # Cambia cada vez que un nombre puede pasar a otra variable
+
+    def intern(self, key, create, token):
+        """
+        Devuelve el nodo de `key`, creándolo con `create()` si no existe.
+        `token` es el de esta aparición: si está antes que el del nodo
+        compartido, pasa a ser el del nodo.
+        """
+        node = self.table.get(key)
+        if node is None:
+            node = self.table[key] = create()
+        else:
+            self.shared += 1
+            if (token.line, token.column) < (node.token.line, node.token.column):
+                node.token = token
+                if type(node) is BinOp:
+                    node.op = token
+        return node
+
+    def expression(self, node):
+        """Devuelve la versión compartida de una expresión (las variables se crean sin compartir)."""
+        if type(node) is Var:
+            return self.intern(('Var', node.value, self.generation), lambda: node, node.token)
+        return node
+
+    def bin_op(self, left, op, right):
+        left, right = self.expression(left), self.expression(right)
+        # Los hijos ya son compartidos: su identidad basta para identificar el subárbol
+        return self.intern((op.type, id(left), id(right)), lambda: BinOp(left, op, right), op)
+
+    def num(self, token):
+        return self.intern(('Num', int(token.value)), lambda: Num(token), token)
+
+    def assign(self, left, op, right):
+        return Assign(left, op, self.expression(right))
+
+    def print(self, expr):
+        return Print(self.expression(expr))
+
+    def var_decl(self, var_node):
+        self.generation += 1
+        return VarDecl(var_node)
+
+    def block(self, token, statements):
+        # Las declaraciones del bloque dejan de estar visibles
+        self.generation += 1
+        return Block(token, statements)
+
 class Parser:
-    def __init__(self, lexer):
-        self.lexer = lexer    # Instancia del analizador léxico
-        self.current_token = self.lexer.get_next_token()  # Obtener el primer token
+    def __init__(self, lexer, factory=None, recover=False):
+        self.lexer = lexer    # Analizador léxico o TokenStream (ambos ofrecen get_next_token)
+        self.factory = factory if factory is not None else NodeFactory()  # Fábrica de nodos del AST
+        self.recover = recover  # Si es True, los errores se registran en vez de lanzarse
+        self.errors = []        # Errores léxicos y sintácticos registrados
+        self.error_mark = 0     # Cantidad de errores al empezar la sentencia actual
+        self.blocks = []        # Bloques abiertos: (token '{', sentencias ya reconocidas)
+        self.current_token = self.next_token()  # Obtener el primer token
 
     def error(self, message):
         """Lanza una excepción con un mensaje de error de sintaxis."""
-        raise Exception(f'Error de sintaxis: {message}')
+        raise ParserError(message, self.current_token)
+
+    def next_token(self):
+        """
+        Pide el siguiente token al analizador léxico.
+        En modo recuperación registra los errores léxicos y salta el carácter inválido.
+        """
+        while True:
+            try:
+                return self.lexer.get_next_token()
+            except LexerError as error:
+                if not self.recover:
+                    raise
+                self.errors.append(error)
+
+    def synchronize(self):
+        """
+        Descarta tokens hasta el próximo punto y coma (recuperación en modo pánico).
+
+        Los bloques que se abren dentro de la zona descartada se saltan
+        completos. Una '}' que cierra un bloque abierto detiene la búsqueda
+        sin consumirse; una '}' sin bloque abierto se descarta.
+        """
+        depth = 0
+        while True:
+            token_type = self.current_token.type
+            if token_type == TokenType.EOF or (token_type == TokenType.SEMICOLON and not depth):
+                break
+            if token_type == TokenType.RBRACE and not depth:
+                if not self.blocks:
+                    self.current_token = self.next_token()
+                break
+            if token_type == TokenType.LBRACE:
+                depth += 1
+            elif token_type == TokenType.RBRACE:
+                depth -= 1
+            self.current_token = self.next_token()
+        # Los errores que aparezcan después del ';' pertenecen a la sentencia siguiente
+        self.error_mark = len(self.errors)
+        if self.current_token.type == TokenType.SEMICOLON:
+            self.eat(TokenType.SEMICOLON)
 
     def eat(self, token_type):
         """
@@ -62,7 +277,7 @@ class Parser:
         Si no coincide, lanza un error de sintaxis.
         """
         if self.current_token.type == token_type:
-            self.current_token = self.lexer.get_next_token()
+            self.current_token = self.next_token()
         else:
             self.error(f'Token inesperado: {self.current_token.type}')
 
@@ -79,11 +294,11 @@ class Parser:
         
         if token.type == TokenType.NUMBER:
             self.eat(TokenType.NUMBER)
-            return Num(token)
+            return self.factory.num(token)
         
         elif token.type == TokenType.IDENTIFIER:
             self.eat(TokenType.IDENTIFIER)
-            return Var(token)
+            return self.factory.var(token)
         
         elif token.type == TokenType.LPAREN:
             self.eat(TokenType.LPAREN)
@@ -110,7 +325,7 @@ class Parser:
             elif token.type == TokenType.DIVIDIR:
                 self.eat(TokenType.DIVIDIR)
 
-            node = BinOp(left=node, op=token, right=self.factor())
+            node = self.factory.bin_op(node, token, self.factor())
 
         return node
 
@@ -126,7 +341,7 @@ class Parser:
         while self.current_token.type == TokenType.POTENCIA:
             token = self.current_token
             self.eat(TokenType.POTENCIA)
-            node = BinOp(left=node, op=token, right=self.term())
+            node = self.factory.bin_op(node, token, self.term())
 
         return node
 
@@ -147,7 +362,7 @@ class Parser:
             elif token.type == TokenType.RESTAR:
                 self.eat(TokenType.RESTAR)
 
-            node = BinOp(left=node, op=token, right=self.power())
+            node = self.factory.bin_op(node, token, self.power())
 
         return node
 
@@ -158,14 +373,14 @@ class Parser:
         Procesa asignaciones de variables:
         - Variable = Expresión
         """
-        left = Var(self.current_token)
+        left = self.factory.var(self.current_token)
         self.eat(TokenType.IDENTIFIER)
         
         token = self.current_token
         self.eat(TokenType.ASSIGN)
         
         right = self.expr()
-        return Assign(left, token, right)
+        return self.factory.assign(left, token, right)
 
     def print_statement(self):
         """
@@ -178,7 +393,7 @@ class Parser:
         self.eat(TokenType.LPAREN)
         expr = self.expr()
         self.eat(TokenType.RPAREN)
-        return Print(expr)
+        return self.factory.print(expr)
 
     def var_declaration(self):
         """
@@ -188,20 +403,35 @@ class Parser:
         - var Variable
         """
         self.eat(TokenType.VAR)
-        var_node = Var(self.current_token)
+        var_node = self.factory.var(self.current_token)
         self.eat(TokenType.IDENTIFIER)
-        return VarDecl(var_node)
+        return self.factory.var_decl(var_node)
+
+    def block(self):
+        """
+        block : LBRACE (statement SEMICOLON | block)* RBRACE
+
+        Procesa un bloque completo. Los bloques anidados se analizan con la
+        pila `blocks` de next_statement, sin recursión, así que la
+        profundidad de anidamiento no está limitada.
+        """
+        if self.current_token.type != TokenType.LBRACE:
+            self.error(f'Token inesperado: {self.current_token.type}')
+        return self.next_statement()
 
     def statement(self):
         """
-        statement : var_declaration | assignment | print_statement
+        statement : var_declaration | assignment | print_statement | block
         
         Procesa sentencias:
         - Declaraciones de variables
         - Asignaciones
         - Instrucciones de impresión
+        - Bloques (sin punto y coma final)
         """
-        if self.current_token.type == TokenType.VAR:
+        if self.current_token.type == TokenType.LBRACE:
+            return self.block()
+        elif self.current_token.type == TokenType.VAR:
             return self.var_declaration()
         elif self.current_token.type == TokenType.PRINT:
             return self.print_statement()
@@ -210,6 +440,60 @@ class Parser:
         else:
             self.error('Declaración inválida')
 
+    def next_statement(self):
+        """
+        Procesa la siguiente sentencia y su punto y coma (o un bloque completo).
+
+        Devuelve None al llegar a EOF o a la '}' del bloque que contiene la
+        sentencia. Los bloques se arman con la pila `blocks`: cada sentencia
+        reconocida se agrega al bloque abierto más interno y sólo se
+        devuelve al cerrarse el bloque en el que empezó la llamada.
+
+        En modo recuperación, las sentencias con errores se registran en
+        `errors`, se descartan y el análisis continúa tras el siguiente
+        punto y coma; un bloque conserva sus sentencias válidas.
+        """
+        blocks = self.blocks
+        base = len(blocks)  # Bloques abiertos por quien llamó
+        while True:
+            token = self.current_token
+            if token.type == TokenType.EOF and len(blocks) == base:
+                return None
+            if token.type == TokenType.RBRACE and base and len(blocks) == base:
+                return None
+            try:
+                if token.type == TokenType.LBRACE:
+                    self.error_mark = len(self.errors)
+                    self.eat(TokenType.LBRACE)
+                    blocks.append((token, []))
+                    continue
+                if token.type == TokenType.EOF:
+                    # Los bloques sin cerrar se descartan
+                    del blocks[base:]
+                    self.error("Falta '}' para cerrar el bloque")
+                if token.type == TokenType.RBRACE and len(blocks) > base:
+                    self.error_mark = len(self.errors)
+                    self.eat(TokenType.RBRACE)
+                    block_token, statements = blocks.pop()
+                    node = self.factory.block(block_token, statements)
+                else:
+                    node = self.statement()
+                    valid = len(self.errors) == self.error_mark
+                    self.error_mark = len(self.errors)
+                    self.eat(TokenType.SEMICOLON)
+                    if not valid:
+                        continue
+                if len(blocks) == base:
+                    return node
+                blocks[-1][1].append(node)
+            except ParserError as error:
+                if not self.recover:
+                    raise
+                # Si la sentencia ya tenía un error léxico, este es una consecuencia de aquel
+                if len(self.errors) == self.error_mark:
+                    self.errors.append(error)
+                self.synchronize()
+
     def program(self):
         """
         program : statement*
@@ -217,8 +501,343 @@ class Parser:
         Procesa un programa completo:
         - Secuencia de sentencias separadas por punto y coma
         """
-        statements = []
-        while self.current_token.type != TokenType.EOF:
-            statements.append(self.statement())
-            self.eat(TokenType.SEMICOLON)
-        return statements 
\ No newline at end of file
+        return list(self.iter_statements())
+
+    def iter_statements(self):
+        """
+        Genera las sentencias a medida que se reconocen.
+
+        Permite procesar cada sentencia y descartarla antes de analizar la
+        siguiente, sin construir la lista completa del programa.
+        """
+        node = self.next_statement()
+        while node is not None:
+            yield node
+            node = self.next_statement()
+
+# Precedencia de los operadores binarios (mayor número = se agrupa antes).
+# Coincide con la gramática de Parser: expr > power > term.
+PRECEDENCE = {
+    TokenType.SUMAR: 1,
+    TokenType.RESTAR: 1,
+    TokenType.POTENCIA: 2,
+    TokenType.MULTIPLICAR: 3,
+    TokenType.DIVIDIR: 3,
+}
+
+class IterativeParser(Parser):
+    """
+    Parser que analiza las expresiones con el algoritmo shunting-yard.
+
+    Construye los mismos árboles que Parser (todas las operaciones son
+    asociativas a izquierda y respetan PRECEDENCE), pero usa pilas
+    explícitas en lugar de recursión, por lo que la profundidad de los
+    paréntesis no está limitada por el límite de recursión de Python.
+    """
+
+    def reduce(self, operands, operators):
+        """Combina los dos últimos operandos con el último operador."""
+        right = operands.pop()
+        left = operands.pop()
+        operands.append(self.factory.bin_op(left, operators.pop(), right))
+
+    def expr(self):
+        """
+        expr : operand (operator operand)*
+        operand : NUMBER | IDENTIFIER | LPAREN expr RPAREN
+
+        Procesa una expresión completa sin recursión.
+        """
+        operands = []
+        operators = []    # Tokens de operador; None marca un paréntesis abierto
+        open_parens = 0
+
+        while True:
+            # Se espera un operando, posiblemente precedido por paréntesis
+            while self.current_token.type == TokenType.LPAREN:
+                self.eat(TokenType.LPAREN)
+                operators.append(None)
+                open_parens += 1
+
+            token = self.current_token
+            if token.type == TokenType.NUMBER:
+                self.eat(TokenType.NUMBER)
+                operands.append(self.factory.num(token))
+            elif token.type == TokenType.IDENTIFIER:
+                self.eat(TokenType.IDENTIFIER)
+                operands.append(self.factory.var(token))
+            else:
+                self.error('Factor inválido')
+
+            # Tras un operando: cierres de paréntesis y luego un operador o el fin
+            while self.current_token.type == TokenType.RPAREN and open_parens:
+                while operators[-1] is not None:
+                    self.reduce(operands, operators)
+                operators.pop()
+                open_parens -= 1
+                self.eat(TokenType.RPAREN)
+
+            token = self.current_token
+            precedence = PRECEDENCE.get(token.type)
+            if precedence is None:
+                break
+            while operators and operators[-1] is not None and PRECEDENCE[operators[-1].type] >= precedence:
+                self.reduce(operands, operators)
+            operators.append(token)
+            self.eat(token.type)
+
+        if open_parens:
+            self.eat(TokenType.RPAREN)
+        while operators:
+            self.reduce(operands, operators)
+        return operands[0]
+
+
+class CachedStatement:
+    """Sentencia analizada junto con la posición de su primer token."""
+    __slots__ = ('node', 'tokens', 'line', 'column')
+
+    def __init__(self, node, line, column):
+        self.node = node
+        self.tokens = node_tokens(node)
+        self.line = line
+        self.column = column
+
+    def relocate(self, line, column):
+        """Actualiza las posiciones de los tokens si la sentencia se desplazó."""
+        line_delta, column_delta = line - self.line, column - self.column
+        if line_delta or column_delta:
+            for token in self.tokens:
+                # Sólo los tokens de la primera línea cambian de columna
+                if token.line == self.line:
+                    token.column += column_delta
+                token.line += line_delta
+            self.line, self.column = line, column
+
+def changed_range(old, new):
+    """
+    Tramo que cambió entre dos textos, como (offset, borrados, insertados):
+    el texto nuevo es el viejo con `borrados` caracteres desde `offset`
+    reemplazados por `insertados`. El prefijo y el sufijo comunes se buscan
+    por bisección comparando porciones, así la comparación se hace en C.
+    """
+    limit = min(len(old), len(new))
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[:middle] == new[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    prefix = low
+    low, high = 0, limit - prefix
+    while low < high:
+        middle = (low + high + 1) // 2
+        if old[len(old) - middle:] == new[len(new) - middle:]:
+            low = middle
+        else:
+            high = middle - 1
+    suffix = low
+    return prefix, len(old) - prefix - suffix, new[prefix:len(new) - suffix]
+
+# Códigos (TokenStream.kinds) de los tokens que delimitan las sentencias de nivel superior
+SEMICOLON_CODE = TokenType.SEMICOLON.value
+LBRACE_CODE = TokenType.LBRACE.value
+RBRACE_CODE = TokenType.RBRACE.value
+
+class IncrementalParser:
+    """
+    Parser que reutiliza el AST de las sentencias que no cambiaron.
+
+    El TokenStream se conserva entre llamadas: cada análisis le aplica sólo
+    el tramo editado (TokenStream.edit), así el análisis léxico cuesta según
+    el tamaño de la edición y no del texto.
+
+    El flujo de tokens se divide en las sentencias de nivel superior: cada
+    una termina en su SEMICOLON o, si es un bloque, en la RBRACE que lo
+    cierra. Las sentencias que terminan antes del tramo editado se conservan
+    tal cual, y las que empiezan después se conservan en bloque (sólo
+    cambia su índice, y se corrigen las posiciones de las que se
+    desplazaron). Las del medio se identifican por su texto fuente exacto
+    (desde su primer token hasta el último, cuyo hash calcula el
+    diccionario de la caché): si ya existían se reutiliza su nodo; sólo se
+    analizan las sentencias nuevas o modificadas.
+    """
+
+    def __init__(self, parser_class=IterativeParser):
+        self.parser_class = parser_class
+        self.cache = {}         # Texto de la sentencia -> lista de CachedStatement sin usar
+        self.reused = 0         # Sentencias reutilizadas en el último análisis
+        self.parsed = 0         # Sentencias analizadas en el último análisis
+        self.stream = None      # TokenStream del último texto analizado
+        # Sentencias del último análisis, en listas paralelas: primer y último
+        # token, texto, CachedStatement y nodo
+        self.starts, self.ends, self.keys, self.entries, self.statements = [], [], [], [], []
+        self.changed = 0        # Primer token que cambió desde el último análisis
+        self.moved = None       # (fin anterior, fin nuevo) del tramo re-analizado por la edición
+        self.edited = False     # Si hubo ediciones (o un error) desde el último análisis completo
+
+    def update(self, source):
+        """
+        Lleva el TokenStream guardado a `source`, re-analizando sólo el tramo
+        que cambió, y lo devuelve. Si el texto nuevo tiene un carácter
+        inválido se lanza LexerError y el flujo queda como estaba.
+        """
+        if self.stream is None:
+            self.stream = TokenStream(source)
+        elif self.stream.text != source:
+            self.apply(*changed_range(self.stream.text, source))
+        return self.stream
+
+    def edit(self, offset, deleted, inserted):
+        """Como parse(), pero con el tramo editado ya conocido (por ejemplo, desde un editor)."""
+        if self.stream is None:
+            raise ValueError('edit() necesita un análisis previo con parse()')
+        self.apply(offset, deleted, inserted)
+        return self.parse(self.stream.text)
+
+    def apply(self, offset, deleted, inserted):
+        first, old_stop, new_stop = self.stream.edit(offset, deleted, inserted)
+        if self.edited:
+            # Varias ediciones seguidas: sólo se sabe dónde empiezan los cambios
+            self.changed, self.moved = min(self.changed, first), None
+        else:
+            self.changed, self.moved = first, (old_stop, new_stop)
+        self.edited = True
+
+    def release(self, begin, end):
+        """Deja libres, para reutilizarlas por su texto, las sentencias viejas en [begin, end)."""
+        for index in range(begin, end):
+            self.cache.setdefault(self.keys[index], []).append(self.entries[index])
+
+    @staticmethod
+    def statement_end(kinds, start, eof):
+        """
+        Índice del último token de la sentencia de nivel superior que empieza en `start`.
+
+        `kinds` son los tipos de token como bytes (TokenStream.kinds.tobytes()).
+        """
+        if kinds[start] != LBRACE_CODE:
+            end = kinds.find(SEMICOLON_CODE, start, eof)
+            return eof if end < 0 else end
+
+        # Bloque: se busca la llave que lo cierra
+        depth = 0
+        pos = start
+        while True:
+            close = kinds.find(RBRACE_CODE, pos, eof)
+            if close < 0:
+                return eof
+            opening = kinds.find(LBRACE_CODE, pos, close)
+            if opening >= 0:
+                depth += 1
+                pos = opening + 1
+            else:
+                depth -= 1
+                pos = close + 1
+                if not depth:
+                    return close
+
+    def parse(self, source):
+        """Analiza `source` y devuelve la lista de sentencias, como Parser.program()."""
+        stream = self.update(source)
+        parser = self.parser_class(stream)
+        kinds = stream.kinds.tobytes()
+        eof = len(kinds) - 1
+        cache = self.cache
+        old_starts, old_ends, old_keys = self.starts, self.ends, self.keys
+        old_entries, old_statements = self.entries, self.statements
+        total = len(old_starts)
+
+        # Las sentencias que terminan antes del primer token editado siguen
+        # iguales y en el mismo lugar; las que empiezan después del tramo
+        # re-analizado (desde `later`) son candidatas a conservarse en bloque
+        keep = bisect.bisect_left(old_ends, self.changed)
+        if self.moved is None:
+            later, old_stop, new_stop = total, 0, 0
+        else:
+            old_stop, new_stop = self.moved
+            later = bisect.bisect_left(old_starts, old_stop, keep)
+        self.release(keep, later)
+        shift = new_stop - old_stop
+
+        starts, ends, keys = old_starts[:keep], old_ends[:keep], old_keys[:keep]
+        entries, statements = old_entries[:keep], old_statements[:keep]
+        reused, parsed = keep, 0
+
+        start = ends[-1] + 1 if ends else 0
+        try:
+            while start < eof:
+                if later < total and start >= new_stop:
+                    # Después del tramo re-analizado los tokens son los de antes con
+                    # otro índice: si una sentencia empieza donde empezaba una vieja,
+                    # ésa y todas las siguientes son las mismas
+                    while later < total and old_starts[later] + shift < start:
+                        self.release(later, later + 1)
+                        later += 1
+                    if later < total and old_starts[later] + shift == start:
+                        self.relocate(later, shift)
+                        if shift:
+                            starts += [index + shift for index in old_starts[later:]]
+                            ends += [index + shift for index in old_ends[later:]]
+                        else:
+                            starts += old_starts[later:]
+                            ends += old_ends[later:]
+                        keys += old_keys[later:]
+                        entries += old_entries[later:]
+                        statements += old_statements[later:]
+                        reused += total - later
+                        later = total
+                        break
+
+                end = self.statement_end(kinds, start, eof)
+
+                line, column = stream.line(start), stream.column(start)
+                key = source[stream.start(start):stream.end(end)]
+                free = cache.get(key)
+                if free:
+                    # Las sentencias repetidas consumen entradas distintas: nunca comparten nodos
+                    entry = free.pop()
+                    entry.relocate(line, column)
+                    reused += 1
+                else:
+                    stream.pos = start
+                    parser.current_token = stream.get_next_token()
+                    node = parser.next_statement()
+                    entry = CachedStatement(node, line, column)
+                    parsed += 1
+
+                starts.append(start)
+                ends.append(end)
+                keys.append(key)
+                entries.append(entry)
+                statements.append(entry.node)
+                start = end + 1
+        except Exception:
+            # Se conservan las sentencias ya analizadas y las demás quedan libres
+            # en la caché: la próxima vez se recorre desde el error
+            self.release(later, total)
+            self.starts, self.ends, self.keys, self.entries, self.statements = starts, ends, keys, entries, statements
+            self.changed, self.moved, self.edited = start, None, True
+            raise
+
+        self.starts, self.ends, self.keys, self.entries, self.statements = starts, ends, keys, entries, statements
+        self.cache = {}
+        self.changed, self.moved, self.edited = len(kinds), None, False
+        self.reused, self.parsed = reused, parsed
+        return list(statements)
+
+    def relocate(self, begin, shift):
+        """
+        Corrige las posiciones de las sentencias viejas desde `begin`, que
+        ahora empiezan `shift` tokens más adelante. Se detiene en la primera
+        que no se desplazó: las siguientes tampoco.
+        """
+        stream = self.stream
+        for index in range(begin, len(self.starts)):
+            entry = self.entries[index]
+            start = self.starts[index] + shift
+            line, column = stream.line(start), stream.column(start)
+            if line == entry.line and column == entry.column:
+                break
+            entry.relocate(line, column)
@@ -0,0 +1,150 @@
+import contextlib
+import json
+import os
+import sys
+import time
+from .lexer import LexerError, TokenType
+from .walker import walk
+
+class PhaseMetrics:
+    """Mediciones de una fase: tiempo, pico de memoria y conteos propios de la fase."""
+    __slots__ = ('name', 'seconds', 'peak_bytes', 'counts', 'profile_path')
+
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.peak_bytes = None      # Pico de memoria reservada durante la fase (tracemalloc)
+        self.counts = {}            # tokens, nodes, symbols, errors, ... según la fase
+        self.profile_path = None    # Archivo de cProfile, si se pidió
+
+    def to_dict(self):
+        metrics = {'phase': self.name, 'seconds': round(self.seconds, 6), 'peak_bytes': self.peak_bytes}
+        metrics.update(self.counts)
+        if self.profile_path is not None:
+            metrics['profile'] = self.profile_path
+        return metrics
+
+class Profiler:
+    """
+    Mide cada fase de la compilación (ver compile_source y compile_file en
+    src/main.py): tiempo, pico de memoria reservada (con tracemalloc, que
+    sólo está activo dentro de las fases) y los conteos que indica cada
+    fase (tokens, nodos del AST, símbolos, errores).
+
+    `on_phase`, si se indica, recibe el PhaseMetrics de cada fase apenas
+    termina; así un programa que usa el compilador como biblioteca obtiene
+    las mismas métricas que --profile. Con `profile_dir` cada fase también
+    se perfila con cProfile y se guarda en `<profile_dir>/<fase>.prof`
+    (se lee con `python -m pstats`). Con tracemalloc y cProfile activos
+    los tiempos crecen, pero la proporción entre fases se mantiene.
+    """
+
+    def __init__(self, on_phase=None, profile_dir=None, memory=True):
+        self.on_phase = on_phase
+        self.profile_dir = profile_dir
+        self.memory = memory
+        self.phases = []
+
+    @contextlib.contextmanager
+    def phase(self, name, **counts):
+        """
+        Mide el bloque como la fase `name`. Cada valor de `counts` es una
+        función sin argumentos que se evalúa al terminar la fase, fuera de
+        la medición (por ejemplo, nodes=lambda: count_nodes(ast)).
+        """
+        metrics = PhaseMetrics(name)
+        if self.memory:
+            import tracemalloc
+            started = not tracemalloc.is_tracing()
+            if started:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        profile = None
+        if self.profile_dir is not None:
+            import cProfile
+            profile = cProfile.Profile()
+        start = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield metrics
+        finally:
+            if profile is not None:
+                profile.disable()
+            metrics.seconds = time.perf_counter() - start
+            if self.memory:
+                metrics.peak_bytes = tracemalloc.get_traced_memory()[1] - baseline
+                if started:
+                    tracemalloc.stop()
+        if profile is not None:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            metrics.profile_path = os.path.join(self.profile_dir, f'{name}.prof')
+            profile.dump_stats(metrics.profile_path)
+        for count, function in counts.items():
+            metrics.counts[count] = function()
+        self.phases.append(metrics)
+        if self.on_phase is not None:
+            self.on_phase(metrics)
+
+    def to_dict(self):
+        return {'seconds': round(sum(metrics.seconds for metrics in self.phases), 6),
+                'phases': [metrics.to_dict() for metrics in self.phases]}
+
+    def write(self, path=None, **fields):
+        """Escribe un registro JSON con `fields` y las fases en `path` o, si no se indica, en stderr."""
+        record = dict(fields, **self.to_dict())
+        if path is None:
+            print(json.dumps(record, ensure_ascii=False), file=sys.stderr)
+        else:
+            with open(path, 'w') as file:
+                json.dump(record, file, ensure_ascii=False, indent=2)
+                file.write('\n')
+
+def phase(profiler, name, **counts):
+    """profiler.phase(name, **counts), o un contexto que no mide nada si `profiler` es None."""
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.phase(name, **counts)
+
+def count_nodes(ast):
+    """Cantidad de nodos de un AST (un nodo o una lista de sentencias)."""
+    return sum(1 for _ in walk(ast))
+
+class RecordedTokens:
+    """
+    Todos los tokens de un analizador léxico, leídos de una vez.
+
+    Normalmente el parser pide los tokens a demanda y el análisis léxico
+    queda mezclado con el sintáctico; al perfilar, el léxico se ejecuta
+    entero antes para medirlo por separado. get_next_token devuelve los
+    mismos tokens y relanza los mismos LexerError en el mismo orden que el
+    analizador original, así el parser se comporta igual.
+    """
+
+    def __init__(self, lexer):
+        self.items = []     # Token o LexerError, en orden, hasta EOF inclusive
+        self.errors = 0
+        while True:
+            try:
+                token = lexer.get_next_token()
+            except LexerError as error:
+                self.items.append(error)
+                self.errors += 1
+                continue
+            self.items.append(token)
+            if token.type == TokenType.EOF:
+                break
+        self.pos = 0
+
+    def __len__(self):
+        """Cantidad de tokens, sin contar EOF."""
+        return len(self.items) - self.errors - 1
+
+    def get_next_token(self):
+        item = self.items[self.pos]
+        if self.pos < len(self.items) - 1:
+            self.pos += 1
+        if isinstance(item, LexerError):
+            raise item
+        return item
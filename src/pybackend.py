@@ -0,0 +1,260 @@
+import ast
+import gc
+import marshal
+import re
+import sys
+from collections import OrderedDict
+from .lexer import TokenType
+from .parser import Assign, VarDecl
+from .runtime import ExecutionError, dividir, potencia, format_value
+from .walker import NodeVisitor
+from .interpreter import BUFFER_LINES
+
+# Profundidad máxima de una expresión de Python generada. Las subexpresiones
+# más profundas se guardan en variables temporales, porque el compilador de
+# CPython es recursivo.
+MAX_EXPRESSION_DEPTH = 100
+
+# Nombre del código generado en los tracebacks
+FILENAME = '<vls>'
+
+# Programas compilados que se conservan en memoria
+CACHE_SIZE = 32
+
+# Operadores que Python evalúa igual que VLS
+NATIVE_OPERATORS = {
+    TokenType.SUMAR: ast.Add(),
+    TokenType.RESTAR: ast.Sub(),
+    TokenType.MULTIPLICAR: ast.Mult(),
+}
+
+# Operadores que se delegan a src/runtime.py (parámetro de la función generada)
+RUNTIME_OPERATORS = {
+    TokenType.DIVIDIR: '__dividir',
+    TokenType.POTENCIA: '__potencia',
+}
+
+# Función que envuelve el programa: los slots son variables locales (v0, v1, ...)
+# y los auxiliares llegan como parámetros, así todos los accesos son locales.
+TEMPLATE = '''
+def __vls_main(__append, __format, __flush, __buffer, __len, __limit, __dividir, __potencia):
+    pass
+'''
+
+# Contextos compartidos por todos los nodos (como hace ast.parse)
+LOAD = ast.Load()
+STORE = ast.Store()
+
+# Posición de los nodos sin token (línea 0: desconocida)
+NO_POSITION = {'lineno': 0, 'col_offset': 0, 'end_lineno': 0, 'end_col_offset': 0}
+
+def position(token):
+    """Atributos de posición de ast para un nodo generado a partir de `token`."""
+    if token is None or token.line is None:
+        return NO_POSITION
+    return {'lineno': token.line, 'col_offset': token.column - 1,
+            'end_lineno': token.line, 'end_col_offset': token.column}
+
+def position_of(node):
+    """Atributos de posición de un nodo de Python ya generado."""
+    return {'lineno': node.lineno, 'col_offset': node.col_offset,
+            'end_lineno': node.end_lineno, 'end_col_offset': node.end_col_offset}
+
+class Expression:
+    """Expresión de Python generada, con su profundidad y la cantidad de sentencias emitidas al terminarla."""
+    __slots__ = ('node', 'depth', 'mark')
+
+    def __init__(self, node, depth, mark):
+        self.node = node
+        self.depth = depth
+        self.mark = mark
+
+class PythonCodeGenerator(NodeVisitor):
+    """
+    Traduce un AST ya analizado por SemanticAnalyzer a un ast.Module de Python.
+
+    Cada slot es una variable local `v<slot>` de la función __vls_main.
+    sumar, restar y multiplicar usan los operadores de Python (iguales en
+    enteros); dividir y potencia llaman a las funciones de src/runtime.py.
+    Cada nodo lleva la línea y columna del token VLS, así los errores de
+    ejecución pueden ubicarse en el código fuente original.
+    """
+
+    child_fields = {Assign: ('right',), VarDecl: ()}
+
+    def __init__(self):
+        self.body = []      # Sentencias de Python generadas
+        self.names = []     # Nombre de la variable de cada slot
+        self.temporaries = 0
+
+    def hoist(self, expression, index=None):
+        """Guarda una expresión en una variable temporal y devuelve la expresión que la lee."""
+        name = f't{self.temporaries}'
+        self.temporaries += 1
+        where = position_of(expression.node)
+        statement = ast.Assign([ast.Name(name, STORE, **where)], expression.node, **where)
+        if index is None:
+            self.body.append(statement)
+        else:
+            # Evaluado en el mismo orden que en el árbol original
+            self.body.insert(index, statement)
+        return Expression(ast.Name(name, LOAD, **where), 1, len(self.body))
+
+    def visit_Num(self, node):
+        return Expression(ast.Constant(node.value, **position(node.token)), 1, len(self.body))
+
+    def visit_Var(self, node):
+        return Expression(ast.Name(f'v{node.slot}', LOAD, **position(node.token)), 1, len(self.body))
+
+    def visit_BinOp(self, node, left, right):
+        op = node.op
+        if len(self.body) > left.mark and not isinstance(left.node, ast.Constant):
+            # El operando derecho emitió temporales: el izquierdo debe evaluarse antes que ellas
+            left = self.hoist(left, left.mark)
+        where = position(op)
+        if op.type in NATIVE_OPERATORS:
+            expression = ast.BinOp(left.node, NATIVE_OPERATORS[op.type], right.node, **where)
+        else:
+            function = ast.Name(RUNTIME_OPERATORS[op.type], LOAD, **where)
+            expression = ast.Call(function, [left.node, right.node], [], **where)
+        result = Expression(expression, max(left.depth, right.depth) + 1, len(self.body))
+        if result.depth >= MAX_EXPRESSION_DEPTH:
+            result = self.hoist(result)
+        return result
+
+    def visit_Assign(self, node, value):
+        target = ast.Name(f'v{node.slot}', STORE, **position(node.left.token))
+        self.body.append(ast.Assign([target], value.node, **position(node.op)))
+
+    def visit_Print(self, node, value):
+        # __append(__format(valor)); if __len(__buffer) >= __limit: __flush()
+        where = position_of(value.node)
+        call = ast.Call(ast.Name('__append', LOAD, **where),
+                        [ast.Call(ast.Name('__format', LOAD, **where), [value.node], [], **where)], [], **where)
+        self.body.append(ast.Expr(call, **where))
+        length = ast.Call(ast.Name('__len', LOAD, **where), [ast.Name('__buffer', LOAD, **where)], [], **where)
+        full = ast.Compare(length, [ast.GtE()], [ast.Name('__limit', LOAD, **where)], **where)
+        flush = ast.Expr(ast.Call(ast.Name('__flush', LOAD, **where), [], [], **where), **where)
+        self.body.append(ast.If(full, [flush], [], **where))
+
+    def visit_VarDecl(self, node):
+        # Una declaración no genera código: leer el slot antes de asignarlo
+        # produce NameError, que se informa como variable no inicializada.
+        var_node = node.var_node
+        names = self.names
+        if var_node.slot >= len(names):
+            names.extend([None] * (var_node.slot + 1 - len(names)))
+        names[var_node.slot] = var_node.value
+
+    def visit_Block(self, node, *statements):
+        pass
+
+    def generate(self, tree):
+        """Genera el ast.Module de un nodo o una lista de sentencias (todos los nodos llevan posición)."""
+        for node in (tree if isinstance(tree, list) else [tree]):
+            self.visit(node)
+        module = ast.parse(TEMPLATE)
+        function = module.body[0]
+        if self.body:
+            function.body = self.body
+        return module
+
+class PythonProgram:
+    """Programa VLS compilado a un objeto código de Python."""
+
+    def __init__(self, code, names):
+        self.code = code    # Objeto código del módulo que define __vls_main
+        self.names = names  # Nombre de la variable de cada slot
+
+    def __reduce__(self):
+        # pickle no serializa objetos código: se guardan con marshal
+        return (load_program, (marshal.dumps(self.code), self.names))
+
+    def error_position(self, traceback):
+        """Posición (línea, columna) del código VLS donde ocurrió un error, si se conoce."""
+        position = None
+        while traceback is not None:
+            frame_code = traceback.tb_frame.f_code
+            if frame_code.co_filename == FILENAME:
+                positions = list(frame_code.co_positions())
+                line, _, column, _ = positions[traceback.tb_lasti // 2]
+                if line and column is not None:
+                    position = (line, column + 1)
+            traceback = traceback.tb_next
+        return position
+
+    def translate(self, error):
+        """Convierte un error de Python en ExecutionError con la posición VLS."""
+        position = self.error_position(error.__traceback__)
+        if isinstance(error, NameError):
+            # UnboundLocalError, o NameError si el slot no se asigna en ningún lugar
+            match = re.search(r"'v(\d+)'", str(error))
+            name = self.names[int(match.group(1))] if match else '?'
+            message = f'Variable no inicializada: {name}'
+        elif isinstance(error, ExecutionError):
+            # Las funciones de runtime lanzan el error sin posición
+            message = str(error)
+        else:
+            message = f'{type(error).__name__}: {error}'
+        translated = ExecutionError(message)
+        if position is not None:
+            translated = ExecutionError(f'{message} (línea {position[0]}, columna {position[1]})')
+            translated.line, translated.column = position
+        return translated
+
+    def run(self, output=None, buffer_lines=BUFFER_LINES):
+        """Ejecuta el programa; lo impreso se escribe por bloques y al terminar."""
+        output = output if output is not None else sys.stdout
+        buffer = []
+
+        def flush():
+            if buffer:
+                buffer.append('')
+                output.write('\n'.join(buffer))
+                buffer.clear()
+
+        namespace = {}
+        exec(self.code, namespace)
+        try:
+            namespace['__vls_main'](buffer.append, format_value, flush, buffer, len, buffer_lines,
+                                    dividir, potencia)
+        except (ExecutionError, NameError, ArithmeticError) as error:
+            raise self.translate(error) from None
+        finally:
+            # Lo impreso antes de un error de ejecución también se muestra
+            flush()
+
+def load_program(data, names):
+    """Reconstruye un PythonProgram serializado (ver PythonProgram.__reduce__)."""
+    return PythonProgram(marshal.loads(data), names)
+
+# Caché en memoria: clave (normalmente el código fuente) -> PythonProgram
+_cache = OrderedDict()
+
+def compile_program(tree, key=None):
+    """
+    Compila un AST analizado a un PythonProgram.
+
+    Si se indica `key` (por ejemplo, el código fuente VLS), el resultado se
+    guarda en una caché LRU en memoria y las compilaciones siguientes con la
+    misma clave lo reutilizan sin regenerar ni recompilar.
+    """
+    if key is not None and key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+    # Se crean cientos de miles de nodos de ast que sobreviven hasta compile():
+    # el recolector de ciclos los recorrería una y otra vez sin liberar nada.
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        generator = PythonCodeGenerator()
+        module = generator.generate(tree)
+        program = PythonProgram(compile(module, FILENAME, 'exec'), generator.names)
+    finally:
+        if enabled:
+            gc.enable()
+    if key is not None:
+        _cache[key] = program
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return program
@@ -0,0 +1,154 @@
+import time
+from .lexer import TokenType
+
+class ExecutionError(Exception):
+    """Error al evaluar una operación, con la posición del token relacionado si se conoce."""
+    def __init__(self, message, token=None):
+        self.line = token.line if token is not None else None
+        self.column = token.column if token is not None else None
+        if self.line is not None:
+            message = f'{message} (línea {self.line}, columna {self.column})'
+        super().__init__(message)
+
+# Semántica de las operaciones de VLS sobre enteros (de tamaño arbitrario).
+# El optimizador y los motores de ejecución usan estas mismas funciones,
+# así que un valor calculado en compilación coincide con el de ejecución.
+
+def sumar(left, right):
+    return left + right
+
+def restar(left, right):
+    return left - right
+
+def multiplicar(left, right):
+    return left * right
+
+def dividir(left, right):
+    """División entera truncada hacia cero (7 dividir -2 = -3)."""
+    if right == 0:
+        raise ExecutionError('División por cero')
+    quotient = abs(left) // abs(right)
+    return quotient if (left < 0) == (right < 0) else -quotient
+
+def potencia(left, right):
+    """Potencia entera; el exponente no puede ser negativo."""
+    if right < 0:
+        raise ExecutionError('Exponente negativo en potencia')
+    return left ** right
+
+# Función de cada operador binario
+OPERATIONS = {
+    TokenType.SUMAR: sumar,
+    TokenType.RESTAR: restar,
+    TokenType.MULTIPLICAR: multiplicar,
+    TokenType.DIVIDIR: dividir,
+    TokenType.POTENCIA: potencia,
+}
+
+def apply(op_type, left, right):
+    """Aplica el operador `op_type` (un TokenType) a dos enteros."""
+    return OPERATIONS[op_type](left, right)
+
+def minimum_bits(op_type, left, right):
+    """
+    Cota inferior de los bits del resultado, calculada sin hacer la operación.
+
+    Permite rechazar una operación demasiado grande antes de ejecutarla:
+    el resultado real tiene como mucho el doble de bits que la cota.
+    """
+    if op_type == TokenType.MULTIPLICAR:
+        return left.bit_length() + right.bit_length() - 1 if left and right else 0
+    if op_type == TokenType.POTENCIA:
+        if right <= 0 or abs(left) <= 1:
+            return 1
+        return (left.bit_length() - 1) * right + 1
+    # Sumar y restar agregan a lo sumo un bit; dividir no agranda
+    return 0
+
+# Tamaño máximo de los enteros cuando se piden límites sin --max-bits: sin
+# él una sola operación (3 potencia 30000000) podría tardar sin control,
+# ya que los pasos y el tiempo se controlan entre sentencias
+DEFAULT_MAX_BITS = 1 << 20
+
+class Limits:
+    """
+    Límites de recursos para ejecutar programas no confiables.
+
+    - max_steps: sentencias ejecutadas
+    - max_bits:  tamaño de cualquier entero calculado; las operaciones se
+      rechazan antes de hacerlas si la estimación ya lo supera (por
+      defecto DEFAULT_MAX_BITS, así cada operación tarda poco)
+    - timeout:   segundos de ejecución, controlados entre sentencias y
+      durante la conversión a texto de los enteros enormes (format)
+
+    Un límite en None no se controla. Superar un límite lanza ExecutionError.
+    """
+
+    def __init__(self, max_steps=None, max_bits=DEFAULT_MAX_BITS, timeout=None):
+        self.max_steps = max_steps
+        self.max_bits = max_bits
+        self.timeout = timeout
+        self.start()
+
+    def start(self):
+        """Reinicia los contadores para una nueva ejecución."""
+        self.steps = 0
+        self.deadline = time.monotonic() + self.timeout if self.timeout is not None else None
+
+    def step(self, token=None):
+        """Cuenta una sentencia ejecutada."""
+        self.steps += 1
+        if self.max_steps is not None and self.steps > self.max_steps:
+            raise ExecutionError(f'Límite de pasos excedido ({self.max_steps})', token)
+        self.check_time(token)
+
+    def check_time(self, token=None):
+        """Lanza ExecutionError si ya se superó el tiempo de ejecución."""
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise ExecutionError(f'Tiempo de ejecución excedido ({self.timeout:g} s)', token)
+
+    def format(self, value):
+        """
+        Como format_value(), pero respetando el tiempo de ejecución: convertir
+        un entero de DEFAULT_MAX_BITS bits lleva cerca de un segundo, así que
+        el tiempo se controla entre los bloques de dígitos.
+        """
+        return format_value(value, self)
+
+    def apply(self, op_type, left, right, token=None):
+        """Como apply(), pero respetando max_bits antes y después de operar."""
+        max_bits = self.max_bits
+        if max_bits is not None and minimum_bits(op_type, left, right) > max_bits:
+            raise ExecutionError(f'El resultado supera el límite de {max_bits} bits', token)
+        try:
+            result = OPERATIONS[op_type](left, right)
+        except ExecutionError as error:
+            raise ExecutionError(str(error), token) from None
+        if max_bits is not None and result.bit_length() > max_bits:
+            raise ExecutionError(f'El resultado supera el límite de {max_bits} bits', token)
+        return result
+
+# Dígitos por bloque al convertir enteros enormes (menos que el límite de Python, 4300)
+DIGITS_PER_CHUNK = 4000
+
+def format_value(value, limits=None):
+    """
+    Convierte un entero a texto decimal, como lo muestra print. Con `limits`
+    (un Limits) se controla el tiempo de ejecución entre bloques de dígitos.
+    """
+    try:
+        return str(value)
+    except ValueError:
+        # Python limita la conversión directa de enteros muy grandes
+        # (sys.set_int_max_str_digits); se convierte por bloques de dígitos.
+        sign = '-' if value < 0 else ''
+        value = abs(value)
+        base = 10 ** DIGITS_PER_CHUNK
+        chunks = []
+        while value:
+            if limits is not None:
+                limits.check_time()
+            value, chunk = divmod(value, base)
+            chunks.append(chunk)
+        head = str(chunks.pop())
+        return sign + head + ''.join(f'{chunk:0{DIGITS_PER_CHUNK}d}' for chunk in reversed(chunks))
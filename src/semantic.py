@@ -1,38 +1,123 @@
-from .parser import AST, BinOp, Num, Var, Assign, Print, VarDecl
+from .parser import AST, BinOp, Num, Var, Assign, Print, VarDecl, Block
+from .walker import NodeVisitor
 
 class SemanticError(Exception):
-    pass
+    """Error semántico con la posición del token relacionado, si se conoce."""
+    def __init__(self, message, token=None):
+        self.line = token.line if token is not None else None
+        self.column = token.column if token is not None else None
+        if self.line is not None:
+            message = f'{message} (línea {self.line}, columna {self.column})'
+        super().__init__(message)
 
 class Symbol:
     def __init__(self, name, type=None):
         self.name = name
         self.type = type
+        self.slot = None         # Índice de la variable en el arreglo de valores
+        self.scope_level = None  # Nivel del ámbito donde se declaró
+        self.shadowed = None     # Símbolo del mismo nombre que este oculta
+        self.value = None        # Valor constante conocido en compilación (lo usa el optimizador)
 
 class SymbolTable:
+    """
+    Tabla de símbolos con ámbitos anidados.
+
+    `symbols` guarda, para cada nombre, el símbolo visible en este momento;
+    los símbolos que éste oculta quedan encadenados en `shadowed`, formando
+    una pila de declaraciones por nombre. Cada ámbito abierto tiene un
+    registro de deshacer con los nombres que declaró, así que buscar un
+    nombre, entrar a un ámbito y salir de él son O(1) (salir cuesta una
+    operación por declaración del ámbito) sin recorrer cadenas de ámbitos.
+    """
+
     def __init__(self):
         self.symbols = {}
+        self.slots = []  # Símbolos en orden de slot
         self.scope_level = 0
+        self.undo_log = [[]]  # Nombres declarados en cada ámbito abierto
+
+    def enter_scope(self):
+        """Abre un ámbito anidado."""
+        self.scope_level += 1
+        self.undo_log.append([])
+
+    def exit_scope(self):
+        """Cierra el ámbito actual y vuelve a hacer visibles los símbolos que ocultaba."""
+        symbols = self.symbols
+        for name in reversed(self.undo_log.pop()):
+            shadowed = symbols[name].shadowed
+            if shadowed is None:
+                del symbols[name]
+            else:
+                symbols[name] = shadowed
+        self.scope_level -= 1
 
     def define(self, symbol):
-        """Define un nuevo símbolo en la tabla."""
+        """Define un nuevo símbolo en el ámbito actual y le asigna el siguiente slot libre."""
+        symbol.slot = len(self.slots)
+        symbol.scope_level = self.scope_level
+        symbol.shadowed = self.symbols.get(symbol.name)
+        self.slots.append(symbol)
         self.symbols[symbol.name] = symbol
+        self.undo_log[-1].append(symbol.name)
 
     def lookup(self, name):
-        """Busca un símbolo por su nombre."""
+        """Busca el símbolo visible con ese nombre."""
         return self.symbols.get(name)
 
-class SemanticAnalyzer:
-    def __init__(self):
+    def lookup_current_scope(self, name):
+        """Busca un símbolo declarado en el ámbito actual."""
+        symbol = self.symbols.get(name)
+        if symbol is not None and symbol.scope_level == self.scope_level:
+            return symbol
+        return None
+
+    def slot_count(self):
+        """Cantidad de slots asignados (tamaño del arreglo de valores)."""
+        return len(self.slots)
+
+    def slot_names(self):
+        """Nombre de la variable de cada slot, en orden."""
+        return [symbol.name for symbol in self.slots]
+
+    def export_slots(self):
+        """Metadatos de los slots, para herramientas que leen los valores por índice."""
+        return [{'slot': symbol.slot, 'name': symbol.name, 'type': symbol.type.__name__,
+                 'scope_level': symbol.scope_level}
+                for symbol in self.slots]
+
+class SemanticAnalyzer(NodeVisitor):
+    """
+    Verifica declaraciones y tipos y resuelve los nombres a slots.
+
+    Cada variable declarada recibe un slot entero denso (ver SymbolTable) y
+    cada nodo Var y Assign queda anotado con el slot de su variable en el
+    atributo `slot`, así la ejecución puede leer los valores de una lista.
+    Las declaraciones dentro de un bloque reciben slots propios, aunque
+    oculten a una variable del mismo nombre.
+    """
+
+    # Las declaraciones no visitan su variable: todavía no existe en la tabla
+    child_fields = {VarDecl: ()}
+
+    def __init__(self, recover=False):
         self.symbol_table = SymbolTable()
+        self.recover = recover  # Si es True, los errores se registran en vez de lanzarse
+        self.errors = []        # Errores semánticos registrados
+
+    def error(self, message, token=None):
+        """Lanza un SemanticError o, en modo recuperación, lo registra y continúa."""
+        error = SemanticError(message, token)
+        if not self.recover:
+            raise error
+        self.errors.append(error)
 
-    def visit_BinOp(self, node):
+    def visit_BinOp(self, node, left_type, right_type):
         """Visita un nodo de operación binaria."""
-        left_type = self.visit(node.left)
-        right_type = self.visit(node.right)
-        
         # Verifica que ambos operandos sean números
         if not (isinstance(left_type, type) and isinstance(right_type, type)):
-            raise SemanticError(f"Operación inválida: {node.op.type} entre {left_type} y {right_type}")
+            self.error(f"Operación inválida: {node.op.type} entre {left_type} y {right_type}", node.op)
         
         return int  # El resultado de una operación binaria es siempre un número
 
@@ -46,47 +131,48 @@ class SemanticAnalyzer:
         symbol = self.symbol_table.lookup(var_name)
         
         if symbol is None:
-            raise SemanticError(f"Variable no declarada: {var_name}")
+            self.error(f"Variable no declarada: {var_name}", node.token)
+            return int  # Se asume numérica para no repetir errores en la misma expresión
         
+        node.slot = symbol.slot
         return symbol.type
 
-    def visit_Assign(self, node):
-        """Visita un nodo de asignación."""
-        var_name = node.left.value
-        symbol = self.symbol_table.lookup(var_name)
-        
-        if symbol is None:
-            raise SemanticError(f"Variable no declarada: {var_name}")
-        
-        value_type = self.visit(node.right)
-        
+    def visit_Assign(self, node, target_type, value_type):
+        """Visita un nodo de asignación (la variable destino ya se verificó en visit_Var)."""
+        node.slot = node.left.slot
         # Verificamos que el tipo del valor sea int
         if value_type != int:
-            raise SemanticError(f"No se puede asignar {value_type} a una variable numérica")
+            self.error(f"No se puede asignar {value_type} a una variable numérica", node.op)
         
         return value_type
 
-    def visit_Print(self, node):
+    def visit_Print(self, node, expr_type):
         """Visita un nodo de impresión."""
-        return self.visit(node.expr)
+        return expr_type
 
     def visit_VarDecl(self, node):
         """Visita un nodo de declaración de variable."""
         var_name = node.var_node.value
         
-        if self.symbol_table.lookup(var_name) is not None:
-            raise SemanticError(f"Variable ya declarada: {var_name}")
+        if self.symbol_table.lookup_current_scope(var_name) is not None:
+            self.error(f"Variable ya declarada: {var_name}", node.var_node.token)
+            return None
         
-        self.symbol_table.define(Symbol(var_name, int))
+        symbol = Symbol(var_name, int)
+        self.symbol_table.define(symbol)
+        node.var_node.slot = symbol.slot
         return None
 
-    def visit(self, node):
-        """Método principal para visitar nodos del AST."""
-        method_name = f'visit_{type(node).__name__}'
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
+    def enter_Block(self, node):
+        """Abre el ámbito del bloque antes de visitar sus sentencias."""
+        self.symbol_table.enter_scope()
+
+    def visit_Block(self, node, *statement_types):
+        """Cierra el ámbito del bloque."""
+        self.symbol_table.exit_scope()
+        return None
 
-    def generic_visit(self, node):
+    def generic_visit(self, node, *results):
         """Método genérico para visitar nodos no manejados específicamente."""
         raise SemanticError(f"No hay visitante para {type(node).__name__}")
 
@@ -96,4 +182,4 @@ class SemanticAnalyzer:
             for node in ast:
                 self.visit(node)
         else:
-            self.visit(ast) 
\ No newline at end of file
+            self.visit(ast)
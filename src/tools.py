@@ -2,7 +2,8 @@ import sys
 import os
 from typing import List, Dict, Any
 from .parser import AST, BinOp, Num, Var, Assign, Print, VarDecl
-import graphviz
+from .walker import NodeVisitor, walk
+from .runtime import ExecutionError, OPERATIONS
 
 class DevelopmentTools:
     def __init__(self):
@@ -13,17 +14,12 @@ class DevelopmentTools:
 
     def visualize_ast(self, ast: AST, output_file: str = "ast"):
         """Genera una visualización del AST usando graphviz."""
+        import graphviz  # Sólo se carga al visualizar
         dot = graphviz.Digraph(comment='AST Visualization')
         dot.attr(rankdir='TB')
         
-        def add_node(node, parent_id=None):
-            if isinstance(node, list):
-                for child in node:
-                    add_node(child, parent_id)
-                return
-            
-            node_id = str(id(node))
-            
+        # walk() numera los nodos, así que no depende de id() (las vistas de FlatAST son temporales)
+        for index, node, parent, _ in walk(ast):
             # Determinar el label del nodo
             if isinstance(node, BinOp):
                 label = f"BinOp: {node.op.type}"
@@ -40,24 +36,11 @@ class DevelopmentTools:
             else:
                 label = str(type(node).__name__)
             
-            dot.node(node_id, label)
-            
-            if parent_id:
-                dot.edge(parent_id, node_id)
+            dot.node(str(index), label)
             
-            # Agregar nodos hijos
-            if isinstance(node, BinOp):
-                add_node(node.left, node_id)
-                add_node(node.right, node_id)
-            elif isinstance(node, Assign):
-                add_node(node.left, node_id)
-                add_node(node.right, node_id)
-            elif isinstance(node, Print):
-                add_node(node.expr, node_id)
-            elif isinstance(node, VarDecl):
-                add_node(node.var_node, node_id)
+            if parent is not None:
+                dot.edge(str(parent), str(index))
         
-        add_node(ast)
         dot.render(output_file, view=True, format='png')
 
     def debug_step(self, node: AST, line_number: int):
@@ -87,24 +70,7 @@ class DevelopmentTools:
 
     def _get_node_value(self, node: AST) -> Any:
         """Obtiene el valor de un nodo para depuración."""
-        if isinstance(node, Num):
-            return node.value
-        elif isinstance(node, Var):
-            return self.variables_state.get(node.value, "undefined")
-        elif isinstance(node, BinOp):
-            left = self._get_node_value(node.left)
-            right = self._get_node_value(node.right)
-            if node.op.type == 'PLUS':
-                return left + right
-            elif node.op.type == 'MINUS':
-                return left - right
-            elif node.op.type == 'MULTIPLY':
-                return left * right
-            elif node.op.type == 'DIVIDE':
-                return left / right
-            elif node.op.type == 'POWER':
-                return left ** right
-        return None
+        return NodeValue(self.variables_state).visit(node)
 
     def _print_debug_info(self, state: Dict):
         """Imprime información de depuración."""
@@ -158,6 +124,7 @@ print(b);
         if not self.execution_history:
             return
         
+        import graphviz
         dot = graphviz.Digraph(comment='Execution Flow')
         dot.attr(rankdir='TB')
         
@@ -186,4 +153,31 @@ print(b);
     def stop_debug(self):
         """Desactiva el modo de depuración."""
         self.debug_mode = False
-        print("Modo de depuración desactivado") 
\ No newline at end of file
+        print("Modo de depuración desactivado") 
+
+class NodeValue(NodeVisitor):
+    """Calcula el valor de una expresión a partir del estado de las variables."""
+
+    def __init__(self, variables_state: Dict):
+        self.variables_state = variables_state
+
+    def visit_Num(self, node):
+        return node.value
+
+    def visit_Var(self, node):
+        return self.variables_state.get(node.value, "undefined")
+
+    def visit_BinOp(self, node, left, right):
+        # Si algún operando no tiene valor conocido, la operación tampoco
+        if not (isinstance(left, int) and isinstance(right, int)):
+            return None
+        operation = OPERATIONS.get(node.op.type)
+        if operation is None:
+            return None
+        try:
+            return operation(left, right)
+        except ExecutionError:
+            return None
+
+    def generic_visit(self, node, *results):
+        return None
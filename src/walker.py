@@ -0,0 +1,167 @@
+from .parser import CHILD_FIELDS, lookup_class, child_nodes
+
+def walk(root):
+    """
+    Recorre el AST en preorden con una pila explícita.
+
+    `root` puede ser un nodo o una lista de sentencias. Genera tuplas
+    (index, node, parent, depth): `index` numera los nodos en el orden del
+    recorrido y `parent` es el índice del padre (None para las raíces).
+    """
+    roots = root if isinstance(root, list) else [root]
+    stack = [(node, None, 0) for node in reversed(roots)]
+    index = 0
+    while stack:
+        node, parent, depth = stack.pop()
+        yield index, node, parent, depth
+        for child in reversed(child_nodes(node)):
+            stack.append((child, index, depth + 1))
+        index += 1
+
+# Profundidad a partir de la cual NodeVisitor continúa con una pila explícita
+MAX_RECURSION_DEPTH = 200
+
+class NodeVisitor:
+    """
+    Recorrido del AST con despacho precalculado por clase de nodo.
+
+    Para cada clase de nodo se resuelven una sola vez (y se guardan en una
+    caché propia de cada subclase de NodeVisitor):
+    - `enter_<Clase>(node)`: hook opcional en preorden, antes de los hijos.
+    - `visit_<Clase>(node, *resultados_hijos)`: hook en postorden que recibe
+      los resultados de los hijos y devuelve el resultado del nodo.
+    - los campos hijos, tomados de CHILD_FIELDS salvo que la subclase los
+      redefina en `child_fields` (por ejemplo, `()` para no descender).
+
+    Los nombres se buscan también en las clases base del nodo, así que las
+    vistas de FlatAST usan los mismos hooks que los nodos normales.
+
+    Con esos datos se arma una función de paso especializada por clase.
+    Los subárboles poco profundos se recorren encadenando esas funciones;
+    a partir de MAX_RECURSION_DEPTH niveles el recorrido sigue con una
+    pila explícita (visit_iterative), de modo que la profundidad del árbol
+    no está limitada por el límite de recursión de Python.
+    """
+
+    child_fields = {}
+    handlers = {}   # Clase de nodo -> (enter, visit, campos)
+    steps = {}      # Clase de nodo -> función de paso especializada
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.handlers = {}
+        cls.steps = {}
+
+    @classmethod
+    def resolve(cls, node_class):
+        """Calcula y guarda (enter, visit, campos) para una clase de nodo."""
+        enter = visit = None
+        for base in node_class.__mro__:
+            if enter is None:
+                enter = getattr(cls, f'enter_{base.__name__}', None)
+            if visit is None:
+                visit = getattr(cls, f'visit_{base.__name__}', None)
+        fields = lookup_class(cls.child_fields, node_class)
+        if fields is None:
+            fields = lookup_class(CHILD_FIELDS, node_class, ())
+        entry = cls.handlers[node_class] = (enter, visit or cls.generic_visit, fields)
+        return entry
+
+    @classmethod
+    def resolve_step(cls, node_class):
+        """Arma y guarda la función de paso de una clase de nodo."""
+        enter, visit, fields = cls.handlers.get(node_class) or cls.resolve(node_class)
+        steps = cls.steps
+        resolve_step = cls.resolve_step
+
+        def run(visitor, child, depth):
+            # Resultados de un hijo: una lista de campo produce un resultado por elemento
+            if type(child) is list:
+                return [(steps.get(type(c)) or resolve_step(type(c)))(visitor, c, depth) for c in child]
+            return [(steps.get(type(child)) or resolve_step(type(child)))(visitor, child, depth)]
+
+        if not fields:
+            def step(visitor, node, depth):
+                if enter is not None:
+                    enter(visitor, node)
+                return visit(visitor, node)
+        elif len(fields) == 2:
+            # Caso más frecuente (BinOp, Assign), sin listas intermedias
+            first, second = fields
+
+            def step(visitor, node, depth):
+                if depth > MAX_RECURSION_DEPTH:
+                    return visitor.visit_iterative(node)
+                if enter is not None:
+                    enter(visitor, node)
+                depth += 1
+                left = getattr(node, first)
+                right = getattr(node, second)
+                if type(left) is list or type(right) is list:
+                    return visit(visitor, node, *run(visitor, left, depth), *run(visitor, right, depth))
+                left = (steps.get(type(left)) or resolve_step(type(left)))(visitor, left, depth)
+                right = (steps.get(type(right)) or resolve_step(type(right)))(visitor, right, depth)
+                return visit(visitor, node, left, right)
+        else:
+            def step(visitor, node, depth):
+                if depth > MAX_RECURSION_DEPTH:
+                    return visitor.visit_iterative(node)
+                if enter is not None:
+                    enter(visitor, node)
+                depth += 1
+                results = []
+                for field in fields:
+                    results.extend(run(visitor, getattr(node, field), depth))
+                return visit(visitor, node, *results)
+
+        steps[node_class] = step
+        return step
+
+    def visit(self, node):
+        """Visita un nodo (o una lista de sentencias) y devuelve el resultado de visit_<Clase>."""
+        if isinstance(node, list):
+            return [self.visit(child) for child in node]
+        return (self.steps.get(type(node)) or self.resolve_step(type(node)))(self, node, 0)
+
+    def visit_iterative(self, node):
+        """Igual que visit(), pero recorre todo el subárbol con una pila explícita."""
+        handlers = self.handlers
+        resolve = self.resolve
+        results = []
+        # Cada entrada es (nodo, handlers, cantidad de hijos); handlers es None
+        # mientras el nodo todavía no se expandió.
+        stack = [(node, None, 0)]
+        while stack:
+            node, entry, count = stack.pop()
+            if entry is not None:
+                # Todos los hijos ya dejaron su resultado en `results`
+                start = len(results) - count
+                value = entry[1](self, node, *results[start:])
+                del results[start:]
+                results.append(value)
+                continue
+
+            entry = handlers.get(type(node)) or resolve(type(node))
+            enter, visit, fields = entry
+            if enter is not None:
+                enter(self, node)
+            if not fields:
+                results.append(visit(self, node))
+                continue
+
+            children = []
+            for field in fields:
+                child = getattr(node, field)
+                if isinstance(child, list):
+                    children.extend(child)
+                else:
+                    children.append(child)
+            stack.append((node, entry, len(children)))
+            for child in reversed(children):
+                stack.append((child, None, 0))
+
+        return results[0]
+
+    def generic_visit(self, node, *results):
+        """Hook por defecto para clases sin visit_<Clase>."""
+        raise NotImplementedError(f'No hay visitante para {type(node).__name__}')